@@ -0,0 +1,443 @@
+"""
+Benchmark suite of the game: times the engines, the state grid, the visual grid and the loading of patterns and saved
+states over a matrix of board sizes and densities, checks that every engine computes the same boards and writes all the
+results in a JSON file, which can be compared with the one of another version to spot regressions.
+
+    python3 benchmark.py -o results.json
+    python3 benchmark.py -o new.json --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from gamecore import ENGINES, BatchEngine, Board, Catalog, GenerationDiff, HashLife, History, Pattern, Statistics, \
+    load_pattern, load_patterns, load_state, read_board, save_pattern, save_state
+from gamecore.patterns import PATTERNS_DIR, arrays_to_state
+
+SIZES = (50, 256, 1024, 4096)
+DENSITIES = (0.05, 0.3)
+BUDGET = 0.5  # Seconds spent repeating each measurement, once its first run has been timed
+MAX_REPEATS = 1000
+BATCH_BOARDS = (100, 1000, 10000)  # Numbers of boards stepped together by the batch engine
+BATCH_SIDE = 50  # Side of the boards of the batches
+REGRESSION = 1.1  # Ratio between the new and the old time above which a benchmark is reported as slower
+PATTERN_SIDE = 50  # Side of the board on which the bundled patterns are centered
+
+
+def measure(function, budget=BUDGET):
+    """
+    Times a function, repeating it as many times as fit in the budget (but at least once after a warm-up run, which
+    pays for the lazy initializations such as the start of the worker processes)
+    :param function: function without arguments to time
+    :param budget: number of seconds to spend repeating the function
+    :returns: a dictionary with the best and median time of a call, in seconds, and the number of timed calls
+    """
+
+    function()  # Warm-up run
+    start = time.perf_counter()
+    function()  # Calibration run, used to choose the number of repeats
+    first = time.perf_counter() - start
+    repeats = int(min(max(budget / max(first, 1e-9), 1), MAX_REPEATS))
+    times = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return {'best': min(times), 'median': statistics.median(times), 'repeats': repeats}
+
+
+def random_board(size, density, seed=0):
+    """
+    Creates a random square board
+    :param size: number of rows and columns of the board
+    :param density: probability of each cell to be alive
+    :param seed: seed of the random generator, so that every run uses the same boards
+    :returns: a size x size boolean array
+    """
+
+    return np.random.default_rng(seed).random((size, size)) < density
+
+
+def bench_engines(results, sizes, densities, engines):
+    """
+    Times a generation of every engine, both reporting the changes (step) and not (run)
+    """
+
+    for name in engines:
+        for size in sizes:
+            for density in densities:
+                engine = ENGINES[name](size, size)
+                engine.load(random_board(size, density))
+                results.append(dict(benchmark='engine.step', engine=name, size=size, density=density,
+                                    **measure(engine.step)))
+                results.append(dict(benchmark='engine.run', engine=name, size=size, density=density,
+                                    **measure(lambda: engine.run(1))))
+                engine.close()
+                print('engine', name, size, density, file=sys.stderr)
+
+
+def bench_batch(results, densities):
+    """
+    Times a generation of batches of small boards, against a generation of a single board with the same total area
+    """
+
+    for boards in BATCH_BOARDS:
+        for density in densities:
+            batch = BatchEngine(boards, BATCH_SIDE, BATCH_SIDE)
+            batch.load(np.random.default_rng(0).random((boards, BATCH_SIDE, BATCH_SIDE)) < density)
+            results.append(dict(benchmark='BatchEngine.step', engine='batch', size=BATCH_SIDE, boards=boards,
+                                density=density, **measure(batch.step)))
+            side = int(round((boards * BATCH_SIDE * BATCH_SIDE) ** 0.5))
+            engine = ENGINES['dense'](side, side)
+            engine.load(random_board(side, density))
+            results.append(dict(benchmark='BatchEngine.equal_area', engine='dense', size=side, boards=1,
+                                density=density, **measure(lambda: engine.run(1))))
+            print('batch', boards, density, file=sys.stderr)
+
+
+def bench_history(results, sizes, densities, generations):
+    """
+    Times the recording of the generations of a board in its history and the rebuilding of the oldest one, and reports
+    the bytes taken by the history against the ones of the full boards
+    """
+
+    for size in sizes:
+        for density in densities:
+            board = Board(size, size)
+            board.load(random_board(size, density))
+            engine = board.get_engine()
+            history = History(size, size, budget=2 ** 62)  # Nothing is evicted, so that all the bytes are counted
+            history.record(GenerationDiff(0, full=True), engine)
+            timings = []
+
+            for _ in range(generations):
+                changes, _ = board.step()
+                diff = GenerationDiff.from_changes(changes, board.get_generation())
+                start = time.perf_counter()
+                history.record(diff, engine)
+                timings.append(time.perf_counter() - start)
+
+            results.append(dict(benchmark='History.record', engine='dense', size=size, density=density,
+                                best=min(timings), median=statistics.median(timings), repeats=generations,
+                                bytes=history.get_size(), full_bytes=(generations + 1) * size * size * 3))
+            results.append(dict(benchmark='History.seek', engine='dense', size=size, density=density,
+                                **measure(lambda: history.seek(generations // 2))))
+            board.close()
+            print('history', size, density, file=sys.stderr)
+
+
+def bench_statistics(results, sizes, densities, generations):
+    """
+    Times the update of the statistics of a board from the changes of a generation, against counting the whole board
+    """
+
+    for size in sizes:
+        for density in densities:
+            board = Board(size, size)
+            board.load(random_board(size, density))
+            engine = board.get_engine()
+            population = Statistics(size, size)
+            population.count(engine.get_alive(), engine.get_ages(), 0)
+            timings = []
+
+            for _ in range(generations):
+                changes, _ = board.step()
+                diff = GenerationDiff.from_changes(changes, board.get_generation())
+                start = time.perf_counter()
+                population.update(diff, engine)
+                timings.append(time.perf_counter() - start)
+
+            results.append(dict(benchmark='Statistics.update', engine='dense', size=size, density=density,
+                                best=min(timings), median=statistics.median(timings), repeats=generations))
+            results.append(dict(benchmark='Statistics.count', engine='dense', size=size, density=density,
+                                **measure(lambda: population.count(engine.get_alive(), engine.get_ages(),
+                                                                   board.get_generation()))))
+            board.close()
+            print('statistics', size, density, file=sys.stderr)
+
+
+def bench_state_grid(results, sizes, densities, engines):
+    """
+    Times the construction and the update of the state grid, and the neighbor count of a single cell
+    """
+
+    from gamestate import Grid  # Imported here, so that the other benchmarks can run without PyQt5
+
+    for name in engines:
+        for size in sizes:
+            for density in densities:
+                if name != 'parallel':  # Which would start new worker processes at every construction
+                    results.append(dict(benchmark='Grid.__init__', engine=name, size=size, density=density,
+                                        **measure(lambda: Grid(size, size, name), budget=0)))
+
+                grid = Grid(size, size, name)
+                grid.load_pattern(Pattern.from_arrays(random_board(size, density)))  # Seen by the statistics too
+                results.append(dict(benchmark='Grid.update_grid', engine=name, size=size, density=density,
+                                    **measure(grid.update_grid)))
+                cells = np.random.default_rng(1).integers(0, size, (1000, 2))
+                timing = measure(lambda: [grid.alive_neighbors(row, col) for row, col in cells])
+                results.append(dict(benchmark='Grid.alive_neighbors', engine=name, size=size, density=density,
+                                    best=timing['best'] / len(cells), median=timing['median'] / len(cells),
+                                    repeats=timing['repeats'] * len(cells)))
+                grid.get_board().close()
+                print('state grid', name, size, density, file=sys.stderr)
+
+
+def bench_game_grid(results, sizes, densities):
+    """
+    Times the construction of the visual grid and its repaint, which recolors every cell and paints the grid
+    """
+
+    if not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')  # Widgets can be created and painted without a display
+
+    from PyQt5.QtWidgets import QApplication
+    from gamegrid import GameGrid
+
+    app = QApplication.instance() or QApplication(sys.argv)  # Kept alive while the widgets exist
+
+    for size in sizes:
+        for density in densities:
+            alive = random_board(size, density)
+            pattern = Pattern.from_arrays(alive, alive)
+            results.append(dict(benchmark='GameGrid.__init__', engine='dense', size=size, density=density,
+                                **measure(lambda: GameGrid(size, size, pattern), budget=0)))
+            game_grid = GameGrid(size, size, pattern)
+            game_grid.get_view().resize(1000, 1000)
+
+            def repaint():
+                game_grid.update_grid()
+                game_grid.get_view().grab()  # Paints the view, even though it is not shown
+
+            results.append(dict(benchmark='GameGrid.update_grid', engine='dense', size=size, density=density,
+                                **measure(repaint)))
+            print('game grid', size, density, file=sys.stderr)
+
+
+def bench_io(results, sizes, densities, patterns_dir):
+    """
+    Times the loading of the known patterns, the saving and loading of saved states, of RLE files and of board files,
+    and the loading of all of them into a board
+    """
+
+    results.append(dict(benchmark='load_patterns', engine=None, size=None, density=None,
+                        **measure(lambda: load_patterns(patterns_dir))))
+    results.append(dict(benchmark='Catalog.__init__', engine=None, size=None, density=None,
+                        **measure(lambda: Catalog(patterns_dir))))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for density in densities:
+                alive = random_board(size, density)
+                state = arrays_to_state(alive, alive)
+                path = os.path.join(directory, 'state.json')
+                results.append(dict(benchmark='save_state', engine=None, size=size, density=density,
+                                    **measure(lambda: save_state(path, state))))
+                results.append(dict(benchmark='load_state', engine=None, size=size, density=density,
+                                    **measure(lambda: load_state(path))))
+                board = Board(size, size)
+                results.append(dict(benchmark='Board.load_state', engine='dense', size=size, density=density,
+                                    **measure(lambda: board.load_state(state))))
+                pattern = Pattern.from_arrays(alive)
+                rle_path = os.path.join(directory, 'pattern.rle')
+                results.append(dict(benchmark='save_rle', engine=None, size=size, density=density,
+                                    **measure(lambda: save_pattern(rle_path, pattern))))
+                results.append(dict(benchmark='load_rle', engine=None, size=size, density=density,
+                                    **measure(lambda: load_pattern(rle_path))))
+                results.append(dict(benchmark='Board.load_pattern', engine='dense', size=size, density=density,
+                                    **measure(lambda: board.load_pattern(pattern))))
+                board.load_pattern(pattern)
+                board_path = os.path.join(directory, 'board.gol')
+                results.append(dict(benchmark='Board.save', engine='dense', size=size, density=density,
+                                    **measure(lambda: board.save(board_path))))
+                results.append(dict(benchmark='Board.load_board', engine='dense', size=size, density=density,
+                                    **measure(lambda: board.load_pattern(read_board(board_path)))))
+                print('io', size, density, file=sys.stderr)
+
+
+def bench_patterns(results, patterns, engines, generations):
+    """
+    Times the bundled patterns, centered on a board of PATTERN_SIDE cells and run for a number of generations
+    """
+
+    for pattern_name, pattern in patterns.items():
+        for name in engines:
+            board = Board(PATTERN_SIDE, PATTERN_SIDE, name)
+
+            def run():
+                board.load_pattern(pattern)
+                board.run(generations)
+
+            results.append(dict(benchmark='pattern.run', engine=name, pattern=pattern_name, generations=generations,
+                                size=PATTERN_SIDE, density=None, **measure(run)))
+            board.close()
+
+
+def differential(patterns, engines, generations, sizes, densities):
+    """
+    Checks that the engines compute the same boards: the bounded engines are compared with the dense one (alive state
+    and alive time), while the sparse engine, which runs on the unbounded plane, is compared with HashLife in the region
+    of the board (alive state only, since HashLife does not keep the alive time)
+    :returns: a list with a dictionary for each engine and fixture, telling whether the boards are identical
+    """
+
+    fixtures = [(name, pattern.to_arrays(PATTERN_SIDE, PATTERN_SIDE)[0]) for name, pattern in patterns.items()]
+    fixtures += [('random ' + str(size) + ' ' + str(density), random_board(size, density, seed=2))
+                 for size in sizes for density in densities]
+    checks = []
+
+    for fixture, alive in fixtures:
+        rows, cols = alive.shape
+        boards = {}
+
+        for name in engines:
+            engine = ENGINES[name](rows, cols)
+            engine.load(alive)
+            engine.run(generations)
+            boards[name] = engine.get_alive().astype(bool), np.array(engine.get_ages())
+            engine.close()
+
+        universe = HashLife()
+        universe.load(alive)
+        universe.advance(generations)
+        reference = {'dense': boards.get('dense'), 'hashlife': (universe.to_array(rows, cols).astype(bool), None)}
+
+        for name, (board, ages) in boards.items():
+            other = 'hashlife' if name == 'sparse' else 'dense'
+
+            if reference[other] is None or name == other:
+                continue
+
+            identical = bool((board == reference[other][0]).all())
+
+            if reference[other][1] is not None:
+                identical = identical and bool((ages == reference[other][1]).all())
+
+            checks.append({'fixture': fixture, 'engine': name, 'reference': other, 'generations': generations,
+                           'identical': identical})
+
+    return checks
+
+
+def metadata():
+    """
+    Collects the information needed to tell apart the runs of the benchmark
+    :returns: a dictionary describing the machine and the version of the code
+    """
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': commit, 'python': platform.python_version(),
+            'numpy': np.__version__, 'machine': platform.machine(), 'system': platform.system(),
+            'cpus': os.cpu_count()}
+
+
+def key(result):
+    """
+    Identifies a result, so that the results of two runs can be matched
+    :returns: a tuple of the parameters of the benchmark
+    """
+
+    return (result['benchmark'], result['engine'], result['size'], result['density'], result.get('pattern'),
+            result.get('generations'), result.get('boards'))
+
+
+def compare(results, path):
+    """
+    Prints the ratio between the times of this run and of a previous one, marking the regressions
+    :param results: results of this run
+    :param path: path of the JSON file written by the previous run
+    :returns: the number of regressions
+    """
+
+    with open(path) as old_file:
+        old = {key(result): result for result in json.load(old_file)['results']}
+
+    regressions = 0
+
+    for result in results:
+        previous = old.get(key(result))
+
+        if previous is None:
+            continue
+
+        ratio = result['best'] / max(previous['best'], 1e-12)
+        slower = ratio > REGRESSION
+        regressions += slower
+        print('{:<24} {:<12} {:>6} {:>6} {:<20} {:>7.2f}x{}'.format(
+            result['benchmark'], str(result['engine']), str(result['size']), str(result['density']),
+            str(result.get('pattern') or ''), ratio, '  SLOWER' if slower else ''))
+
+    return regressions
+
+
+def main(argv=None):
+    """
+    Entry point of the benchmark suite
+    :param argv: list of arguments, the ones of the process by default
+    :returns: the exit code, 1 if the engines disagree or a regression has been found
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmarks the engines, the grids and the pattern I/O of the game")
+    parser.add_argument('-o', '--output', default='benchmark.json', help="path of the JSON file of the results")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="sides of the square boards")
+    parser.add_argument('--densities', type=float, nargs='+', default=DENSITIES, help="fractions of alive cells")
+    parser.add_argument('--engines', nargs='+', choices=ENGINES.keys(), default=list(ENGINES.keys()))
+    parser.add_argument('--grid-max-size', type=int, default=1024, help="largest board used for the state grid")
+    parser.add_argument('--gui-max-size', type=int, default=1024, help="largest board used for the visual grid")
+    parser.add_argument('--no-gui', action='store_true', help="skips the benchmarks that need PyQt5")
+    parser.add_argument('--generations', type=int, default=100,
+                        help="generations of the pattern runs and of the differential check")
+    parser.add_argument('--patterns', default=PATTERNS_DIR, help="patterns directory used as fixtures")
+    parser.add_argument('--compare', help="JSON file of a previous run to compare the results with")
+    args = parser.parse_args(argv)
+
+    patterns = load_patterns(args.patterns)
+    results = []
+    bench_engines(results, args.sizes, args.densities, args.engines)
+    bench_io(results, args.sizes, args.densities, args.patterns)
+    bench_patterns(results, patterns, args.engines, args.generations)
+    bench_batch(results, args.densities)
+    bench_history(results, [size for size in args.sizes if size <= args.grid_max_size], args.densities,
+                  args.generations)
+    bench_statistics(results, [size for size in args.sizes if size <= args.grid_max_size], args.densities,
+                     args.generations)
+
+    if not args.no_gui:
+        bench_state_grid(results, [size for size in args.sizes if size <= args.grid_max_size], args.densities,
+                         args.engines)
+        bench_game_grid(results, [size for size in args.sizes if size <= args.gui_max_size], args.densities)
+
+    checks = differential(patterns, args.engines, args.generations,
+                          [size for size in args.sizes if size <= 256], args.densities)
+
+    with open(args.output, 'w') as output_file:
+        json.dump({'metadata': metadata(), 'results': results, 'differential': checks}, output_file, indent=1)
+
+    mismatches = [check for check in checks if not check['identical']]
+
+    for check in mismatches:
+        print('MISMATCH', check['engine'], 'differs from', check['reference'], 'on', check['fixture'])
+
+    regressions = compare(results, args.compare) if args.compare else 0
+
+    return 1 if mismatches or regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,25 @@
 import threading
 
-game_event = threading.Event()  # Shared event to signal whether the game is paused or currently running
-window_event = threading.Event()  # Shared event to signal if window is closed and the game loop must be terminated
+
+class LoopEvent(threading.Event):
+    """
+    Event that also notifies loop_changed whenever it is set or cleared, so that the game loop can block until any of
+    the events changes instead of polling them
+    """
+
+    def set(self):
+        super().set()
+
+        with loop_changed:
+            loop_changed.notify_all()
+
+    def clear(self):
+        super().clear()
+
+        with loop_changed:
+            loop_changed.notify_all()
+
+
+loop_changed = threading.Condition()  # Notified when the game is started, paused or its window is closed
+game_event = LoopEvent()  # Shared event to signal whether the game is paused or currently running
+window_event = LoopEvent()  # Shared event to signal if window is closed and the game loop must be terminated
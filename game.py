@@ -8,6 +8,8 @@ from windowmanager import WindowManager
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     wm = WindowManager()
-    wm.open_settings()
+
+    if not wm.recover():  # A game that did not end cleanly is restored, if the user wants to
+        wm.open_settings()
     app.exec_()
     window_event.clear()
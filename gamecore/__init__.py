@@ -0,0 +1,27 @@
+"""
+Core of the simulation, containing the stepping engines and the boards used by the state grid of the game. It only
+depends on NumPy, so it can be used without a display or a Qt installation, as done by the command line runner
+"""
+
+from gamecore.batch import STATUSES, BatchEngine
+from gamecore.bitpacked import BitEngine
+from gamecore.board import ENGINES, SKIP_GENERATIONS, Board
+from gamecore.boardfile import BOARD_EXTENSION, COMPRESSIONS, SavedBoard, read_board, write_board
+from gamecore.catalog import Catalog
+from gamecore.checkpoint import AUTOSAVE_PATH, CheckpointWriter, find_autosave, remove_autosave, write_checkpoint
+from gamecore.cycles import CYCLE_ACTIONS, CycleDetector
+from gamecore.dense import DenseEngine
+from gamecore.diff import GenerationDiff
+from gamecore.engine import Engine
+from gamecore.formats import Pattern
+from gamecore.hashlife import HashLife
+from gamecore.history import History
+from gamecore.incremental import IncrementalEngine
+from gamecore.parallel import ParallelEngine
+from gamecore.patterns import load_pattern, load_patterns, load_state, save_pattern, save_state
+from gamecore.rules import CONWAY, Rule, get_rule
+from gamecore.scheduler import FrameScheduler
+from gamecore.snapshot import Snapshot, SnapshotBuffer
+from gamecore.sparse import SparseEngine
+from gamecore.stats import AGE_BINS, Statistics, stream_statistics
+from gamecore.trace import Tracer
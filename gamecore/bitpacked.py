@@ -0,0 +1,296 @@
+import numpy as np
+
+from gamecore.engine import Engine, MAX_TIME
+
+WORD_BITS = 64
+ONE = np.uint64(1)
+LAST_BIT = np.uint64(WORD_BITS - 1)
+STRIPE_ROWS = 256  # Rows computed together, bounding the size of the temporary words of a generation
+TRACK_TIME_CELLS = 1 << 24  # Largest board whose alive time is kept by default, since it takes 2 bytes per cell
+
+
+def full_adder(a, b, c):
+    """
+    Adds three bit planes, computing the sum of 64 cells for each word at once
+    :returns: the bit plane of the sum and the bit plane of the carry
+    """
+
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+
+def half_adder(a, b):
+    """
+    Adds two bit planes, computing the sum of 64 cells for each word at once
+    :returns: the bit plane of the sum and the bit plane of the carry
+    """
+
+    return a ^ b, a & b
+
+
+class BitEngine(Engine):
+    """
+    Class that represents a bit-packed stepping engine, storing each row of the board in 64-bit words (bit i of word w
+    being the cell in column 64 * w + i) and counting the neighbors with bitwise adders, so that every operation
+    advances 64 cells. The alive time is kept in a separate array only if requested, by default for the boards of up to
+    TRACK_TIME_CELLS cells
+    """
+
+    def __init__(self, rows, cols, rule=None, track_time=None):
+        """
+        Constructor of the class that allocates the packed board and, if needed, the alive time array
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param rule: Rule or rulestring used to compute the generations, the rules of the Game of Life by default
+        :param track_time: whether the alive time of the cells must be kept, at the cost of 2 bytes per cell, by default
+        only if the board has at most TRACK_TIME_CELLS cells
+        """
+
+        super().__init__(rows, cols, rule)
+
+        if track_time is None:
+            track_time = rows * cols <= TRACK_TIME_CELLS
+
+        self._terms = self._compile(self._rule)
+        self._words = (cols + WORD_BITS - 1) // WORD_BITS
+        self._board = np.zeros((rows, self._words), dtype='<u8')
+        self._next = np.zeros_like(self._board)  # Buffer receiving the next generation, swapped with the board
+        self._ages = np.zeros((rows, cols), dtype=np.uint16) if track_time else None
+        self._alive = None  # Unpacked board, computed when first requested after each change
+
+        # Mask clearing the bits after the last column, which would otherwise come to life next to the right border
+        self._row_mask = np.full(self._words, np.iinfo(np.uint64).max, dtype='<u8')
+        if cols % WORD_BITS:
+            self._row_mask[-1] = (ONE << np.uint64(cols % WORD_BITS)) - ONE
+
+    def set_rule(self, rule):
+        """
+        Changes the rule used to compute the generations, starting from the next one
+        :param rule: Rule or rulestring
+        """
+
+        super().set_rule(rule)
+        self._terms = self._compile(self._rule)
+
+    def get_alive(self):
+        """
+        Getter of the alive state of the board, unpacked once after each change, so it must be treated as read only
+        :returns: a rows x cols uint8 array containing 1 for alive cells and 0 for dead ones
+        """
+
+        if self._alive is None:
+            self._alive = self._unpack(self._board)
+
+        return self._alive
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the board, the array is not copied so it must be treated as read only
+        :returns: a rows x cols uint16 array containing the alive time of every cell (all 0 if it is not tracked)
+        """
+
+        if self._ages is None:  # A single 0 repeated over the board, taking no memory
+            return np.broadcast_to(np.uint16(0), (self._rows, self._cols))
+
+        return self._ages
+
+    def get_value(self, row, col):
+        """
+        Getter of the value of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the value of the cell (1 or 0)
+        """
+
+        word = self._board[row, col // WORD_BITS]
+        return int(word >> np.uint64(col % WORD_BITS)) & 1
+
+    def set_value(self, row, col, value):
+        """
+        Sets the value of a single cell, resetting its alive time if the cell dies
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new value of the cell (1 or 0)
+        """
+
+        bit = ONE << np.uint64(col % WORD_BITS)
+        self._alive = None
+
+        if value:
+            self._board[row, col // WORD_BITS] |= bit
+        else:
+            self._board[row, col // WORD_BITS] &= ~bit
+
+            if self._ages is not None:
+                self._ages[row, col] = 0
+
+    def get_time(self, row, col):
+        """
+        Getter of the alive time of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the alive time of the cell (always 0 if it is not tracked)
+        """
+
+        return 0 if self._ages is None else int(self._ages[row, col])
+
+    def set_time(self, row, col, value):
+        """
+        Sets the alive time of a single cell, ignored if the alive time is not tracked
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new alive time of the cell
+        """
+
+        if self._ages is not None:
+            self._ages[row, col] = min(value, MAX_TIME)
+
+    def clear(self):
+        """
+        Resets the whole board to its initial empty state
+        """
+
+        self._board.fill(0)
+        self._alive = None
+
+        if self._ages is not None:
+            self._ages.fill(0)
+
+    def _load(self, alive, ages):
+        """
+        Replaces the state of the board, called by load once the arrays have been normalized
+        :param alive: rows x cols boolean array of the alive cells
+        :param ages: rows x cols uint16 array of the alive time of the cells
+        """
+
+        packed = np.packbits(alive, axis=1, bitorder='little')
+        self._board.view(np.uint8)[:, :packed.shape[1]] = packed
+        self._board.view(np.uint8)[:, packed.shape[1]:] = 0
+        self._alive = None
+
+        if self._ages is not None:
+            self._ages[...] = ages
+            self._ages[~alive] = 0
+
+    def step(self):
+        """
+        Computes the next generation given the rule of the engine: born cells start with an alive time of 0,
+        surviving cells increase it by 1 and dead cells reset it
+        :returns: a dictionary with the 'birth' and 'death' keys, each containing an (n, 2) array with the coordinates
+        of the cells in that category, the surviving cells being every other alive cell
+        """
+
+        old = self._board
+        self._advance()
+        new = self._board
+
+        return {'birth': np.argwhere(self._unpack(new & ~old)), 'death': np.argwhere(self._unpack(old & ~new))}
+
+    def run(self, generations):
+        """
+        Advances the board by a number of generations without reporting the changes, used when only the final state is
+        needed
+        :param generations: number of generations to compute
+        """
+
+        for _ in range(generations):
+            self._advance()
+
+    def _advance(self):
+        """
+        Computes the next generation into the spare buffer, one stripe of rows at a time, and swaps it with the board
+        """
+
+        for start in range(0, self._rows, STRIPE_ROWS):
+            stop = min(start + STRIPE_ROWS, self._rows)
+            self._next[start:stop] = self._next_rows(start, stop)
+
+            if self._ages is not None:
+                self._age(start, stop)
+
+        self._board, self._next = self._next, self._board
+        self._alive = None
+        self._generation += 1
+
+    def _next_rows(self, start, stop):
+        """
+        Applies the rule to a stripe of rows, counting the neighbors of 64 cells at a time with a tree of bitwise adders
+        :param start: first row of the stripe
+        :param stop: row after the last one of the stripe
+        :returns: the packed words of the stripe in the next generation
+        """
+
+        above = max(start - 1, 0)
+        below = min(stop + 1, self._rows)
+        block = np.zeros((stop - start + 2, self._words), dtype='<u8')  # Stripe with a row of dead cells around it
+        block[above - start + 1:below - start + 1] = self._board[above:below]
+
+        west = block << ONE  # Each cell receives the value of the cell to its left...
+        west[:, 1:] |= block[:, :-1] >> LAST_BIT  # ...carrying the last bit of the previous word
+        east = block >> ONE  # Each cell receives the value of the cell to its right...
+        east[:, :-1] |= block[:, 1:] << LAST_BIT  # ...carrying the first bit of the next word
+
+        row_sum, row_carry = full_adder(west, block, east)  # Alive cells in each horizontal triple (0 to 3)
+        side_sum, side_carry = half_adder(west[1:-1], east[1:-1])  # Alive cells to the sides of each cell (0 to 2)
+
+        # Adds the triples above and below to the sides, obtaining the count of neighbors as a 4 bit number
+        count_1, carry_2 = full_adder(row_sum[:-2], row_sum[2:], side_sum)
+        partial_2, carry_4 = full_adder(row_carry[:-2], row_carry[2:], side_carry)
+        count_2, carry_4_bis = half_adder(partial_2, carry_2)
+        count_4, count_8 = half_adder(carry_4, carry_4_bis)
+
+        alive = block[1:-1]
+        bits = (count_1, count_2, count_4, count_8)
+        negated = tuple(~bit for bit in bits)
+        result = np.zeros_like(alive)
+
+        for count, dead_cells, alive_cells in self._terms:
+            equal = bits[0] if count & 1 else negated[0]  # Cells having exactly count neighbors
+
+            for position in range(1, 4):
+                equal = equal & (bits[position] if count >> position & 1 else negated[position])
+
+            if dead_cells and alive_cells:
+                result |= equal
+            elif dead_cells:
+                result |= equal & ~alive
+            else:
+                result |= equal & alive
+
+        return result & self._row_mask
+
+    def _age(self, start, stop):
+        """
+        Updates the alive time of a stripe of rows, once its next generation has been computed in the spare buffer
+        :param start: first row of the stripe
+        :param stop: row after the last one of the stripe
+        """
+
+        survived = self._unpack(self._next[start:stop] & self._board[start:stop]).astype(bool)
+        ages = self._ages[start:stop]
+        np.add(ages, 1, out=ages, where=survived & (ages < MAX_TIME))
+        ages[~survived] = 0
+
+    @staticmethod
+    def _compile(rule):
+        """
+        Compiles the transition table of a rule into the terms of a bitwise expression, one for each number of neighbors
+        that leads to an alive cell
+        :param rule: compiled Rule
+        :returns: a list of (count, dead_cells, alive_cells) tuples, telling whether count neighbors make a dead cell
+        come to life and whether they keep an alive cell alive
+        """
+
+        table = rule.get_table()
+        return [(count, bool(table[0, count]), bool(table[1, count])) for count in range(table.shape[1])
+                if table[0, count] or table[1, count]]
+
+    def _unpack(self, words):
+        """
+        Converts packed words into an array with one byte per cell
+        :param words: array of packed rows
+        :returns: a uint8 array with as many rows as words and a column for each cell of the board
+        """
+
+        bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder='little')
+        return bits[:, :self._cols]
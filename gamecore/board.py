@@ -0,0 +1,212 @@
+from gamecore.bitpacked import BitEngine
+from gamecore.boardfile import write_board
+from gamecore.cycles import CycleDetector
+from gamecore.dense import DenseEngine
+from gamecore.hashlife import HashLife
+from gamecore.incremental import IncrementalEngine
+from gamecore.parallel import ParallelEngine
+from gamecore.patterns import state_to_arrays, arrays_to_state
+from gamecore.sparse import SparseEngine
+
+# Engines that can be selected when a board is created
+ENGINES = {'dense': DenseEngine, 'bitpacked': BitEngine, 'incremental': IncrementalEngine, 'parallel': ParallelEngine,
+           'sparse': SparseEngine}
+SKIP_GENERATIONS = 1024  # Generations skipped (in whole cycles) each time a periodic board is fast-forwarded
+
+
+class Board:
+    """
+    Class that represents a simulated board, independent of any user interface: it owns the engine holding the state of
+    the cells, the detector of periodic boards and the HashLife universe used to skip generations. Its methods return
+    the coordinates of the cells they change, so that a view can update only those
+    """
+
+    def __init__(self, rows, cols, engine='dense', rule=None):
+        """
+        Constructor of the class that creates the engine and the cycle detector
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param engine: name of the engine used to store and advance the state, one of the keys of ENGINES
+        :param rule: Rule or rulestring of the Life-like rule to simulate, the Game of Life by default
+        """
+
+        self._rows = rows
+        self._cols = cols
+        self._engine = ENGINES[engine](rows, cols, rule)
+        self._cycles = CycleDetector()  # Hashes of the recent generations, used to find periodic boards
+        self._hashlife = None  # HashLife universe used to skip generations, kept to reuse its memoised results
+
+    def get_engine(self):
+        """
+        Getter of the engine that stores the state of the board and computes its generations
+        :returns: the engine of the board
+        """
+
+        return self._engine
+
+    def get_dimensions(self):
+        """
+        Method used to retrieve the number of rows and columns of the board
+        :returns: the number of rows and columns of the board
+        """
+
+        return self._rows, self._cols
+
+    def get_generation(self):
+        """
+        Getter of the current generation of the board
+        :returns: the generation of the engine
+        """
+
+        return self._engine.get_generation()
+
+    def get_rule(self):
+        """
+        Getter of the rule simulated by the board
+        :returns: the compiled Rule used by the engine
+        """
+
+        return self._engine.get_rule()
+
+    def set_rule(self, rule):
+        """
+        Changes the rule simulated by the board, starting from the next generation
+        :param rule: Rule or rulestring of the new rule
+        """
+
+        self._engine.set_rule(rule)
+
+    def get_cycle(self):
+        """
+        Getter of the cycle the board is in, if one has been found since the cycle detection was last restarted
+        :returns: a (period, generation) tuple with the period and the generation in which it was detected, or None
+        """
+
+        return self._cycles.get_cycle()
+
+    def restart_cycles(self):
+        """
+        Restarts the cycle detection from the current board, to be called after the board has been edited without
+        going through step
+        """
+
+        self._cycles.reset(self._engine.get_cell_ids(), self._engine.get_generation())
+
+    def get_state(self):
+        """
+        Reads the whole board in the format of the saved states
+        :returns: a list of rows, each a list of [value, time] pairs
+        """
+
+        return arrays_to_state(self._engine.get_alive(), self._engine.get_ages())
+
+    def load_state(self, state):
+        """
+        Replaces the whole board with a saved state or a known pattern, cropped or filled with dead cells to fit it
+        :param state: list of rows, each a list of [value, time] pairs
+        """
+
+        self._engine.load(*state_to_arrays(state, self._rows, self._cols))
+        self.restart_cycles()
+
+    def clear(self):
+        """
+        Kills every cell of the board, keeping its generation
+        """
+
+        self._engine.clear()
+        self.restart_cycles()
+
+    def load(self, alive, ages=None, generation=None):
+        """
+        Replaces the whole board with the given arrays
+        :param alive: rows x cols array with 1 (or True) for alive cells
+        :param ages: optional rows x cols array with the alive time of the cells, 0 for every cell if not given
+        :param generation: optional generation of the loaded board, the current one is kept if not given
+        """
+
+        self._engine.load(alive, ages, generation)
+        self.restart_cycles()
+
+    def load_pattern(self, pattern, offset=None):
+        """
+        Replaces the whole board with a pattern placed at an offset, cropping the cells that fall outside of the board
+        :param pattern: Pattern (or SavedBoard) to load, with the alive time of its cells if it has been kept and with
+        its generation if it is known
+        :param offset: row and column of the board at which the top left corner of the pattern is placed, the pattern is
+        placed at its stored position (or centered) if not given
+        """
+
+        self._engine.load(*pattern.to_arrays(self._rows, self._cols, offset), pattern.get_generation())
+        self.restart_cycles()
+
+    def save(self, path, compression='none'):
+        """
+        Saves the whole board in a board file, which keeps its generation and rule
+        :param path: path of the file
+        :param compression: one of COMPRESSIONS
+        """
+
+        write_board(path, self._engine.get_alive(), self._engine.get_ages(), self._engine.get_generation(),
+                    self._engine.get_rule(), compression)
+
+    def step(self):
+        """
+        Computes the next generation and looks for a cycle
+        :returns: the dictionary of the changes returned by the engine and the period of the board if it has just been
+        found to repeat itself (None otherwise)
+        """
+
+        changes = self._engine.step()
+        period = self._cycles.update(*self._engine.get_changed_ids(changes), self._engine.get_generation())
+        return changes, period
+
+    def run(self, generations):
+        """
+        Advances the board by a number of generations as fast as the engine allows, without reporting the changes or
+        looking for cycles
+        :param generations: number of generations to compute
+        """
+
+        self._engine.run(generations)
+        self.restart_cycles()
+
+    def follow_population(self):
+        """
+        Moves the viewport of an engine on the unbounded plane back onto its population once every alive cell has left
+        it, so that the spaceships do not leave the board for good
+        :returns: True if the viewport has moved, in which case the whole board has changed
+        """
+
+        return self._engine.follow_population()  # The cycles are looked for on the whole plane, so they are not reset
+
+    def skip_cycles(self, period):
+        """
+        Fast-forwards a periodic board by as many whole cycles as fit in SKIP_GENERATIONS (at least one)
+        :param period: period of the board
+        """
+
+        self._engine.skip(max(SKIP_GENERATIONS // period, 1) * period, period)
+        self.restart_cycles()  # The cycle is found again one period later
+
+    def jump(self, power):
+        """
+        Advances the board by 2^power generations at once using HashLife. The pattern evolves on the unbounded plane, so
+        the cells that leave the board are lost at the end of the jump, and the alive time of every cell restarts from 0
+        :param power: base 2 logarithm of the number of generations to skip
+        """
+
+        if self._hashlife is None or self._hashlife.get_rule() != self._engine.get_rule():
+            self._hashlife = HashLife(self._engine.get_rule())
+
+        self._hashlife.load(self._engine.get_alive(), generation=self._engine.get_generation())
+        self._hashlife.advance_pow2(power)
+        self._engine.load(self._hashlife.to_array(self._rows, self._cols), generation=self._hashlife.get_generation())
+        self.restart_cycles()
+
+    def close(self):
+        """
+        Releases the resources held by the engine, after which the board can no longer be used
+        """
+
+        self._engine.close()
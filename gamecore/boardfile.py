@@ -0,0 +1,248 @@
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from gamecore.engine import MAX_TIME
+
+BOARD_EXTENSION = '.gol'  # Extension of the board files
+MAGIC = b'GOLB'  # First bytes of every board file
+VERSION = 1
+HEADER = struct.Struct('<4sBBxxIIHH')  # Magic, version, compression, rows, cols, lengths of the rule and generation
+ALIGNMENT = 64  # The planes start at a multiple of this, so that they can be memory-mapped as arrays
+COMPRESSIONS = ('none', 'zlib')  # Compressions of the planes, only uncompressed files are memory-mapped
+ZLIB_LEVEL = 1  # The ages plane is mostly zeros, so the fastest level already shrinks it by far
+
+
+class SavedBoard:
+    """
+    Class that represents a board read from a board file: the alive cells packed 8 per byte and the alive time of every
+    cell, with the generation and the rule of the board. The planes of an uncompressed file are memory-mapped, so they
+    are only read from the disk when the board is placed. A saved board can be used wherever a Pattern is, its bounding
+    box being the whole board
+    """
+
+    def __init__(self, packed, ages, generation=0, rule=None, name=None):
+        """
+        Constructor of the class
+        :param packed: rows x ceil(cols / 8) uint8 array of the alive cells, packed along the rows
+        :param ages: rows x cols uint16 array with the alive time of the cells
+        :param generation: generation of the board
+        :param rule: rulestring of the rule of the board
+        :param name: name of the board
+        """
+
+        self._packed = packed
+        self._ages = ages
+        self._generation = generation
+        self._rule = rule
+        self._name = name
+
+    def get_name(self):
+        """
+        Getter of the name of the board
+        :returns: the name, None if unknown
+        """
+
+        return self._name
+
+    def set_name(self, name):
+        """
+        Setter of the name of the board
+        :param name: new name of the board
+        """
+
+        self._name = name
+
+    def get_rule(self):
+        """
+        Getter of the rule of the board
+        :returns: the rulestring, None if unknown
+        """
+
+        return self._rule
+
+    def get_generation(self):
+        """
+        Getter of the generation at which the board has been saved
+        :returns: the generation number
+        """
+
+        return self._generation
+
+    def get_dimensions(self):
+        """
+        Getter of the size of the board
+        :returns: the number of rows and columns of the board
+        """
+
+        return self._ages.shape
+
+    def get_alive(self):
+        """
+        Unpacks the alive cells of the board
+        :returns: a rows x cols boolean array of the alive cells
+        """
+
+        return np.unpackbits(self._packed, axis=1, count=self._ages.shape[1]).view(bool)
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the cells of the board
+        :returns: a read only rows x cols uint16 array with the alive time of every cell
+        """
+
+        return self._ages
+
+    def get_population(self):
+        """
+        Getter of the number of alive cells of the board, counted on the packed cells
+        :returns: the number of alive cells
+        """
+
+        return int(np.unpackbits(self._packed).sum(dtype=np.int64))  # The padding bits of the rows are 0
+
+    def get_position(self):
+        """
+        Getter of the position stored with the board, as done by the patterns
+        :returns: None, since a saved board is centered on another board
+        """
+
+        return None
+
+    def center(self, rows, cols):
+        """
+        Computes the offset that centers the board on another board
+        :param rows: number of rows of the other board
+        :param cols: number of columns of the other board
+        :returns: the row and column of the other board at which the top left corner of the board is placed
+        """
+
+        return (rows - self._ages.shape[0]) // 2, (cols - self._ages.shape[1]) // 2
+
+    def to_arrays(self, rows, cols, offset=None):
+        """
+        Places the board on an empty board, cropping the cells that fall outside of it. When the boards have the same
+        size and no offset is given the planes are returned as they are, without any copy besides the unpacking
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param offset: row and column of the board at which the top left corner of the saved board is placed, the saved
+        board is centered if not given
+        :returns: a rows x cols boolean array of the alive cells and a rows x cols array of their alive time
+        """
+
+        if offset is None:
+            offset = self.center(rows, cols)
+
+        if (rows, cols) == self.get_dimensions() and tuple(offset) == (0, 0):
+            return self.get_alive(), self._ages
+
+        alive = np.zeros((rows, cols), dtype=bool)
+        ages = np.zeros((rows, cols), dtype=np.uint16)
+        saved_rows, saved_cols = self.get_dimensions()
+        top, left = max(offset[0], 0), max(offset[1], 0)  # Region of the board covered by the saved board
+        bottom, right = min(offset[0] + saved_rows, rows), min(offset[1] + saved_cols, cols)
+
+        if top < bottom and left < right:
+            source = (slice(top - offset[0], bottom - offset[0]), slice(left - offset[1], right - offset[1]))
+            alive[top:bottom, left:right] = np.unpackbits(self._packed[source[0]], axis=1,
+                                                          count=saved_cols)[:, source[1]]
+            ages[top:bottom, left:right] = self._ages[source]
+
+        return alive, ages
+
+
+def write_board(path, alive, ages, generation, rule, compression='none', sync=False):
+    """
+    Writes a board file: a header with the size, the compression, the rule and the generation of the board, followed by
+    the alive cells packed 8 per byte along the rows and by the alive time of every cell as little endian uint16
+    :param path: path of the file
+    :param alive: rows x cols array with 1 (or True) for alive cells
+    :param ages: rows x cols array with the alive time of the cells
+    :param generation: generation of the board, written in decimal since it can outgrow any integer type
+    :param rule: Rule or rulestring of the rule of the board
+    :param compression: one of COMPRESSIONS
+    :param sync: True to wait for the file to be on the disk before returning
+    """
+
+    alive = np.asarray(alive)
+    rows, cols = alive.shape
+    packed = np.packbits(alive.astype(bool, copy=False), axis=1)
+    ages = np.ascontiguousarray(np.minimum(ages, MAX_TIME), dtype='<u2')
+    rule = str(rule).encode('ascii')
+    generation = str(generation).encode('ascii')
+    header = HEADER.pack(MAGIC, VERSION, COMPRESSIONS.index(compression), rows, cols, len(rule), len(generation))
+    header += rule + generation
+
+    with open(path, 'wb') as board_file:
+        board_file.write(header + bytes(-len(header) % ALIGNMENT))
+
+        if compression == 'zlib':
+            compressor = zlib.compressobj(ZLIB_LEVEL)
+            board_file.write(compressor.compress(packed))
+            board_file.write(compressor.compress(ages))
+            board_file.write(compressor.flush())
+        else:
+            board_file.write(packed)
+            board_file.write(bytes(-packed.nbytes % ALIGNMENT))
+            board_file.write(ages)
+
+        if sync:
+            board_file.flush()
+            os.fsync(board_file.fileno())
+
+
+def read_board(path):
+    """
+    Reads a board file, memory-mapping its planes if it is not compressed
+    :param path: path of the file
+    :returns: a SavedBoard
+    :raises ValueError: if the file is not a board file
+    """
+
+    with open(path, 'rb') as board_file:
+        fixed = board_file.read(HEADER.size)
+
+        if len(fixed) < HEADER.size:
+            raise ValueError("Not a board file: " + path)
+
+        magic, version, compression, rows, cols, rule_length, generation_length = HEADER.unpack(fixed)
+
+        if magic != MAGIC or version != VERSION or compression >= len(COMPRESSIONS):
+            raise ValueError("Not a board file, or written by a newer version of the game: " + path)
+
+        rule = board_file.read(rule_length).decode('ascii') or None
+        generation = int(board_file.read(generation_length))
+        start = HEADER.size + rule_length + generation_length
+        start += -start % ALIGNMENT
+        packed_cols = (cols + 7) // 8
+
+        ages_start = start + rows * packed_cols
+        ages_start += -ages_start % ALIGNMENT
+
+        if COMPRESSIONS[compression] == 'zlib':
+            board_file.seek(start)
+
+            try:
+                data = zlib.decompress(board_file.read())
+            except zlib.error:  # Corrupted or truncated
+                raise ValueError("Not a board file, its planes cannot be decompressed: " + path)
+
+            if len(data) != rows * packed_cols + 2 * rows * cols:
+                raise ValueError("Not a board file, its planes do not match its size: " + path)
+
+            packed = np.frombuffer(data, dtype=np.uint8, count=rows * packed_cols).reshape(rows, packed_cols)
+            ages = np.frombuffer(data, dtype='<u2', offset=rows * packed_cols).reshape(rows, cols)
+            return SavedBoard(packed, ages, generation, rule)
+
+        if os.fstat(board_file.fileno()).st_size < ages_start + 2 * rows * cols:  # Truncated
+            raise ValueError("Not a board file, its planes do not match its size: " + path)
+
+    if rows * cols == 0:  # An empty region cannot be memory-mapped
+        return SavedBoard(np.zeros((rows, packed_cols), dtype=np.uint8), np.zeros((rows, cols), dtype=np.uint16),
+                          generation, rule)
+
+    packed = np.memmap(path, dtype=np.uint8, mode='r', offset=start, shape=(rows, packed_cols))
+    ages = np.memmap(path, dtype='<u2', mode='r', offset=ages_start, shape=(rows, cols))
+    return SavedBoard(packed, ages, generation, rule)
@@ -0,0 +1,261 @@
+import io
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+from gamecore.formats import read_rle
+from gamecore.patterns import PATTERN_FORMATS, PATTERNS_DIR, load_pattern
+
+INDEX_FILE = '.index'  # Index of a patterns directory, kept inside it (without an extension, so it is not a pattern)
+INDEX_VERSION = 1  # Changed whenever the layout of the index changes, so that old indexes are rebuilt
+CACHE_CELLS = 1 << 22  # Alive cells of the decoded patterns kept in memory (about 64 MB)
+
+
+class Catalog:
+    """
+    Class that represents the collection of the known patterns stored in a directory, which can hold thousands of them:
+    one pattern per file, or many patterns one after the other in an RLE file. The name, size, population and rule of
+    every pattern and the position of its bytes in its file are kept in an index, stored in the directory and updated
+    only for the files that have changed, so listing and searching the patterns never decodes them. A pattern is decoded
+    when it is requested, and the most recently used ones are kept in a cache of bounded size
+    """
+
+    def __init__(self, path=PATTERNS_DIR, cache_cells=CACHE_CELLS):
+        """
+        Constructor of the class that reads the index of the directory, updating it if some files have changed
+        :param path: path of the patterns directory
+        :param cache_cells: maximum number of alive cells of the decoded patterns kept in memory
+        """
+
+        self._path = path
+        self._cache_cells = cache_cells
+        self._cache = OrderedDict()  # Decoded patterns by name, from the least to the most recently used
+        self._cached = 0  # Alive cells of the patterns in the cache
+        self._entries = {}  # Index entry of every pattern, by name
+        self._keys = []  # (lowercase name and rule, name) of every pattern, sorted by name, used by the search
+        self._load_index()
+
+    def get_path(self):
+        """
+        Getter of the directory of the catalog
+        :returns: the path of the patterns directory
+        """
+
+        return self._path
+
+    def __len__(self):
+        """
+        Counts the patterns of the catalog
+        :returns: the number of patterns
+        """
+
+        return len(self._entries)
+
+    def __contains__(self, name):
+        """
+        Tells whether the catalog has a pattern
+        :param name: name of the pattern
+        :returns: True if the catalog has a pattern with the given name, False otherwise
+        """
+
+        return name in self._entries
+
+    def get_names(self):
+        """
+        Lists the patterns of the catalog without decoding them
+        :returns: a list with the names of all the patterns, sorted
+        """
+
+        return [name for _, name in self._keys]
+
+    def get_info(self, name):
+        """
+        Reads the metadata of a pattern from the index, without decoding it
+        :param name: name of the pattern
+        :returns: a dictionary with the 'name', 'rows', 'cols', 'population' and 'rule' (None if unknown) of the
+        pattern, and the 'file', 'offset' and 'length' of its bytes
+        """
+
+        return dict(self._entries[name])
+
+    def search(self, text, limit=None):
+        """
+        Finds the patterns whose name or rule contains a text, ignoring the case, without decoding them
+        :param text: text to look for, every pattern is found if empty
+        :param limit: maximum number of names to return, all of them if not given
+        :returns: a list with the names of the patterns found, sorted
+        """
+
+        text = text.strip().lower()
+        names = [name for key, name in self._keys if text in key]
+        return names if limit is None else names[:limit]
+
+    def get(self, name):
+        """
+        Decodes a pattern, or takes it from the cache if it has been used recently
+        :param name: name of the pattern
+        :returns: the Pattern
+        :raises KeyError: if the catalog has no pattern with the given name
+        """
+
+        pattern = self._cache.get(name)
+
+        if pattern is not None:
+            self._cache.move_to_end(name)
+            return pattern
+
+        entry = self._entries[name]
+        pattern = self._decode(entry['file'], entry['offset'], entry['length'])
+        pattern.set_name(name)
+        self._cache[name] = pattern
+        self._cached += pattern.get_population()
+
+        while self._cached > self._cache_cells and len(self._cache) > 1:  # The requested pattern is always kept
+            _, evicted = self._cache.popitem(last=False)
+            self._cached -= evicted.get_population()
+
+        return pattern
+
+    def _decode(self, file_name, offset, length):
+        """
+        Decodes a pattern from its bytes in a file of the directory
+        :param file_name: name of the file
+        :param offset: position of the first byte of the pattern in the file
+        :param length: number of bytes of the pattern
+        :returns: a Pattern
+        """
+
+        path = os.path.join(self._path, file_name)
+
+        if os.path.splitext(file_name)[1].lower() != '.rle':  # The other formats hold a single pattern per file
+            return load_pattern(path)
+
+        with open(path, 'rb') as pattern_file:
+            pattern_file.seek(offset)
+            return read_rle(io.BytesIO(pattern_file.read(length)))
+
+    def _load_index(self):
+        """
+        Reads the index of the directory, indexes again the files that have been added or changed since it was written
+        and stores it back if it has changed. The index is kept in memory only if the directory cannot be written
+        """
+
+        index_path = os.path.join(self._path, INDEX_FILE)
+
+        try:
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            index = None
+
+        if index is None or index.get('version') != INDEX_VERSION:
+            index = {'version': INDEX_VERSION, 'files': {}}
+
+        old_files = index['files']
+        files = {}
+        changed = False
+
+        for file_name in sorted(os.listdir(self._path)):
+            if os.path.splitext(file_name)[1].lower() not in PATTERN_FORMATS:
+                continue
+
+            stat = os.stat(os.path.join(self._path, file_name))
+            signature = [stat.st_size, stat.st_mtime_ns]
+            old = old_files.get(file_name)
+
+            if old is not None and old['signature'] == signature:
+                files[file_name] = old
+            else:
+                try:
+                    entries = self._index_file(file_name)
+                except ValueError:  # A malformed file is left out, until it changes again
+                    entries = []
+
+                files[file_name] = {'signature': signature, 'entries': entries}
+                changed = True
+
+        changed = changed or files.keys() != old_files.keys()
+        index['files'] = files
+
+        for file_name, indexed in files.items():
+            for entry in indexed['entries']:
+                name = entry['name']
+
+                if name in self._entries:  # Two patterns with the same name, the second one is told by its file
+                    name = '{} ({})'.format(name, file_name)
+
+                self._entries[name] = dict(entry, name=name, file=file_name)
+
+        self._keys = [((name + ' ' + (self._entries[name]['rule'] or '')).lower(), name)
+                      for name in sorted(self._entries)]
+
+        if changed:
+            try:  # The index is replaced atomically, so that a reader never finds it half written
+                descriptor, temp_path = tempfile.mkstemp(dir=self._path, prefix=INDEX_FILE)
+
+                with os.fdopen(descriptor, 'w') as index_file:
+                    json.dump(index, index_file)
+
+                os.replace(temp_path, index_path)
+            except OSError:
+                pass
+
+    def _index_file(self, file_name):
+        """
+        Decodes every pattern of a file to build its index entries
+        :param file_name: name of the file in the directory
+        :returns: a list with the entry of every pattern of the file
+        """
+
+        path = os.path.join(self._path, file_name)
+        stem = os.path.splitext(file_name)[0]
+
+        if os.path.splitext(file_name)[1].lower() == '.rle':
+            spans = rle_spans(path)
+        else:
+            spans = [(0, os.path.getsize(path))]
+
+        entries = []
+
+        for number, (offset, length) in enumerate(spans):
+            pattern = self._decode(file_name, offset, length)
+            rows, cols = pattern.get_dimensions()
+            name = pattern.get_name()
+
+            if name is None or name == stem:  # Unnamed patterns take the name of their file
+                name = stem if len(spans) == 1 else '{} {}'.format(stem, number + 1)
+
+            entries.append({'name': name, 'rows': rows, 'cols': cols, 'population': pattern.get_population(),
+                            'rule': pattern.get_rule(), 'offset': offset, 'length': length})
+
+        return entries
+
+
+def rle_spans(path):
+    """
+    Finds the patterns stored one after the other in an RLE file, each made of its comment lines, its header line and
+    its body, ended by !
+    :param path: path of the RLE file
+    :returns: a list with the byte offset and the length of every pattern
+    """
+
+    spans = []
+    start = None
+    offset = 0
+
+    with open(path, 'rb') as pattern_file:
+        for line in pattern_file:
+            if start is None and line.strip():
+                start = offset
+
+            offset += len(line)
+
+            if start is not None and not line.startswith(b'#') and b'!' in line:
+                spans.append((start, offset - start))
+                start = None
+
+    if start is not None:  # A last pattern missing its !
+        spans.append((start, offset - start))
+
+    return spans
@@ -0,0 +1,178 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from gamecore.board import ENGINES, Board
+from gamecore.rules import get_rule
+
+OUTCOMES = ('died', 'still', 'oscillator', 'active')  # How a soup ends: empty, still life, periodic, or not yet settled
+CENSUS_ENGINES = [name for name in ENGINES if name != 'parallel']  # Each soup runs in a single process
+CHUNK_SOUPS = 16  # Soups handed to a worker process at once
+
+
+def make_soup(seed, index, rows, cols, density):
+    """
+    Fills a random soup, the same for the same seed and index on every machine
+    :param seed: seed of the census
+    :param index: number of the soup in the census
+    :param rows: number of rows of the soup
+    :param cols: number of columns of the soup
+    :param density: probability of each cell of being alive
+    :returns: a rows x cols boolean array of the alive cells
+    """
+
+    return np.random.default_rng([seed, index]).random((rows, cols)) < density
+
+
+def run_soup(soup, generations, engine='dense', rule=None):
+    """
+    Runs a soup until it becomes periodic or reaches a number of generations, and classifies it
+    :param soup: rows x cols array with 1 (or True) for the alive cells
+    :param generations: largest number of generations computed
+    :param engine: name of the engine used to run the soup, one of the keys of ENGINES
+    :param rule: Rule or rulestring of the rule, the Game of Life by default
+    :returns: a dictionary with the 'outcome' of the soup (one of OUTCOMES), its 'period' (None if it is still active),
+    the 'generation' in which the outcome has been found and the 'population' at that generation
+    """
+
+    board = Board(soup.shape[0], soup.shape[1], engine, rule)
+
+    try:
+        board.load(soup)
+        period = None
+
+        while period is None and board.get_generation() < generations:
+            _, period = board.step()
+
+        population = int(np.count_nonzero(board.get_engine().get_alive()))
+    finally:
+        board.close()
+
+    if period is None:
+        outcome = 'active'
+    elif population == 0:
+        outcome = 'died'
+    elif period == 1:
+        outcome = 'still'
+    else:
+        outcome = 'oscillator'
+
+    return {'outcome': outcome, 'period': period, 'generation': board.get_generation(), 'population': population}
+
+
+def _census_task(task):
+    """
+    Fills and runs a soup in a worker process
+    :param task: tuple with the seed, the index, the rows, the columns and the density of the soup, the generations,
+    the engine and the rulestring
+    :returns: the dictionary returned by run_soup, with the 'index' of the soup and its initial 'soup_population'
+    """
+
+    seed, index, rows, cols, density, generations, engine, rulestring = task
+    soup = make_soup(seed, index, rows, cols, density)
+    result = run_soup(soup, generations, engine, rulestring)
+    return dict(result, index=index, soup_population=int(np.count_nonzero(soup)))
+
+
+def census(soups, rows, cols, density=0.5, generations=10000, engine='dense', rule=None, seed=0, processes=None):
+    """
+    Runs many random soups across a pool of processes, yielding the result of each one as soon as it is available (in
+    no particular order, the index of the soup tells which one it is)
+    :param soups: number of soups
+    :param rows: number of rows of every soup
+    :param cols: number of columns of every soup
+    :param density: probability of each cell of being alive
+    :param generations: largest number of generations computed for each soup
+    :param engine: name of the engine used to run the soups, one of CENSUS_ENGINES
+    :param rule: Rule or rulestring of the rule, the Game of Life by default
+    :param seed: seed of the random soups
+    :param processes: number of worker processes, one per CPU if not given
+    :returns: a generator of the dictionaries returned by run_soup, with the 'index' of the soup and its initial
+    'soup_population'
+    """
+
+    rulestring = str(get_rule(rule))  # Checked before any process is started
+    tasks = ((seed, index, rows, cols, density, generations, engine, rulestring) for index in range(soups))
+    context = multiprocessing.get_context('spawn')  # The same on every platform, as the parallel engine
+
+    with context.Pool(processes or os.cpu_count() or 1) as pool:
+        yield from pool.imap_unordered(_census_task, tasks, chunksize=CHUNK_SOUPS)
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line arguments of the census
+    :param argv: list of arguments, the ones of the process by default
+    :returns: the parsed arguments
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m gamecore.census',
+                                     description="Runs many random soups in parallel and classifies how they end")
+    parser.add_argument('-n', '--soups', type=int, default=1000, help="number of soups (default: %(default)s)")
+    parser.add_argument('--rows', type=int, default=32, help="number of rows of the soups (default: %(default)s)")
+    parser.add_argument('--cols', type=int, default=32, help="number of columns of the soups (default: %(default)s)")
+    parser.add_argument('--density', type=float, default=0.5,
+                        help="probability of each cell of being alive (default: %(default)s)")
+    parser.add_argument('-g', '--generations', type=int, default=10000,
+                        help="largest number of generations of each soup (default: %(default)s)")
+    parser.add_argument('--engine', choices=CENSUS_ENGINES, default='dense', help="stepping engine (default: dense)")
+    parser.add_argument('--rule', default=None, help="Life-like rule in the B/S notation (default: B3/S23)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the random soups (default: %(default)s)")
+    parser.add_argument('-j', '--processes', type=int, help="number of worker processes (default: one per CPU)")
+    parser.add_argument('-o', '--output', help="path of the JSON lines file receiving the result of every soup as soon "
+                                               "as it is classified")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Entry point of the census: runs the soups, writes the result of each one and prints the count of every outcome and
+    of every period
+    :param argv: list of arguments, the ones of the process by default
+    :returns: the exit code of the process
+    """
+
+    args = parse_args(argv)
+
+    try:
+        rule = get_rule(args.rule)
+    except ValueError as error:  # Invalid rulestring
+        print(error, file=sys.stderr)
+        return 2
+
+    outcomes = Counter({outcome: 0 for outcome in OUTCOMES})
+    periods = Counter()
+    start = time.perf_counter()
+    output = open(args.output, 'w', buffering=1) if args.output is not None else None  # A line at a time
+
+    try:
+        for result in census(args.soups, args.rows, args.cols, args.density, args.generations, args.engine, rule,
+                             args.seed, args.processes):
+            outcomes[result['outcome']] += 1
+
+            if result['outcome'] == 'oscillator':
+                periods[result['period']] += 1
+
+            if output is not None:
+                output.write(json.dumps(result) + '\n')
+    finally:
+        if output is not None:
+            output.close()
+
+    seconds = time.perf_counter() - start
+    summary = {'rule': str(rule), 'rows': args.rows, 'cols': args.cols, 'density': args.density,
+               'generations': args.generations, 'seed': args.seed, 'soups': args.soups, 'outcomes': dict(outcomes),
+               'periods': {str(period): count for period, count in sorted(periods.items())}, 'seconds': seconds,
+               'soups_per_second': args.soups / max(seconds, 1e-9)}
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from gamecore.boardfile import read_board, write_board
+
+CHECKPOINT_INTERVAL = 30  # Seconds between two periodic checkpoints
+AUTOSAVE_PATH = os.path.join(os.path.expanduser('~'), '.game_of_life', 'autosave.gol')  # Periodic checkpoints of the
+# game, left behind only if the game did not end cleanly
+LOGGER = logging.getLogger(__name__)
+
+
+class CheckpointWriter:
+    """
+    Class that writes checkpoints of a board in the background: the snapshots handed to it are serialized and written by
+    its own thread, so that neither the simulation nor the GUI wait for the disk. Every checkpoint is written to a
+    temporary file which then replaces the target at once, so a crash while writing leaves the previous checkpoint
+    intact
+    """
+
+    def __init__(self, interval=CHECKPOINT_INTERVAL, on_written=None):
+        """
+        Constructor of the class, the thread is started by the first checkpoint
+        :param interval: number of seconds between two periodic checkpoints
+        :param on_written: function called by the writer thread after each checkpoint, with its path, the generation of
+        the board and the exception raised while writing it (None if it has been written)
+        """
+
+        self._interval = interval
+        self._on_written = on_written
+        self._jobs = queue.Queue()  # (path, snapshot, rule, compression, release) of the checkpoints, None to stop
+        self._pending = 0  # Checkpoints submitted and not written yet
+        self._lock = threading.Lock()
+        self._last = time.monotonic()  # Time of the last submitted checkpoint
+        self._thread = None
+
+    def get_interval(self):
+        """
+        Getter of the interval between two periodic checkpoints
+        :returns: the number of seconds between two checkpoints
+        """
+
+        return self._interval
+
+    def set_interval(self, interval):
+        """
+        Setter of the interval between two periodic checkpoints
+        :param interval: number of seconds between two checkpoints
+        """
+
+        self._interval = interval
+
+    def is_idle(self):
+        """
+        Tells whether every submitted checkpoint has been written
+        :returns: True if the writer has nothing to do
+        """
+
+        return self._pending == 0
+
+    def is_due(self):
+        """
+        Tells whether a periodic checkpoint should be taken: the interval has passed and the previous one has been
+        written, so that a slow disk never makes the checkpoints pile up
+        :returns: True if a checkpoint should be submitted
+        """
+
+        return self._pending == 0 and time.monotonic() - self._last >= self._interval
+
+    def submit(self, path, snapshot, rule, compression='none', release=None):
+        """
+        Hands a snapshot over to the writer thread, returning immediately
+        :param path: path of the board file to write
+        :param snapshot: Snapshot of the board, which must not change until it is released
+        :param rule: Rule or rulestring of the board
+        :param compression: compression of the board file, one of COMPRESSIONS
+        :param release: function called with the snapshot once it has been written
+        """
+
+        with self._lock:
+            self._pending += 1
+            self._last = time.monotonic()
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='Checkpoint writer', daemon=True)
+                self._thread.start()
+
+        self._jobs.put((path, snapshot, rule, compression, release))
+
+    def close(self):
+        """
+        Waits for the submitted checkpoints to be written and stops the writer thread
+        """
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+
+        if thread is not None:
+            self._jobs.put(None)
+            thread.join()
+
+    def _run(self):
+        """
+        Loop of the writer thread, which writes the submitted checkpoints one at a time. A checkpoint that cannot be
+        written is logged and reported, but it never stops the thread: the next checkpoints are still written and the
+        pending count always goes back to 0, so that neither is_due nor close wait forever
+        """
+
+        while True:
+            job = self._jobs.get()
+
+            if job is None:
+                break
+
+            path, snapshot, rule, compression, release = job
+            generation = snapshot.get_generation()  # Read before the snapshot is released and possibly reused
+            error = None
+
+            try:
+                try:
+                    write_checkpoint(path, snapshot.get_alive(), snapshot.get_ages(), generation, rule, compression)
+                finally:
+                    if release is not None:
+                        release(snapshot)
+            except Exception as exception:  # Not only the disk, also a snapshot or a rule that cannot be written
+                LOGGER.exception("Cannot write the checkpoint %s of generation %s", path, generation)
+                error = exception
+            finally:
+                with self._lock:
+                    self._pending -= 1
+
+            if self._on_written is not None:
+                try:
+                    self._on_written(path, generation, error)
+                except Exception:
+                    LOGGER.exception("Error reporting the checkpoint %s", path)
+
+
+def write_checkpoint(path, alive, ages, generation, rule, compression='none'):
+    """
+    Writes a board file atomically: the board is written and flushed to the disk in a temporary file of the same
+    directory, which then replaces the target, so the target is always either the old or the new board
+    :param path: path of the board file
+    :param alive: rows x cols array with 1 for the alive cells
+    :param ages: rows x cols array with the alive time of the cells
+    :param generation: generation of the board
+    :param rule: Rule or rulestring of the board
+    :param compression: one of COMPRESSIONS
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    os.close(descriptor)
+
+    try:
+        write_board(temp_path, alive, ages, generation, rule, compression, sync=True)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def find_autosave(path=AUTOSAVE_PATH):
+    """
+    Looks for the checkpoint left behind by a game that did not end cleanly
+    :param path: path of the autosave file
+    :returns: the SavedBoard of the checkpoint, None if there is none or it cannot be read
+    """
+
+    try:
+        return read_board(path)
+    except (OSError, ValueError):
+        return None
+
+
+def remove_autosave(path=AUTOSAVE_PATH):
+    """
+    Removes the autosave file, once the game has ended cleanly or its checkpoint has been dismissed
+    :param path: path of the autosave file
+    """
+
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
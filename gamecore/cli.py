@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from gamecore.board import ENGINES, Board
+from gamecore.boardfile import BOARD_EXTENSION, COMPRESSIONS
+from gamecore.catalog import Catalog
+from gamecore.formats import Pattern
+from gamecore.patterns import PATTERN_FORMATS, PATTERNS_DIR, load_pattern, save_pattern
+from gamecore.stats import stream_statistics
+
+MIN_SIDE = 50  # Smallest default side of the board, so that the small known patterns have room to evolve
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line arguments of the headless runner
+    :param argv: list of arguments, the ones of the process by default
+    :returns: the parsed arguments
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m gamecore',
+                                     description="Runs a pattern for a number of generations without a display")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--pattern', help="name of a known pattern, stored in the patterns directory")
+    source.add_argument('--state', help="path of a pattern file (.rle, .cells, .txt, .lif, .life) or of a state saved "
+                                        "by the game (.json)")
+    parser.add_argument('--patterns', default=PATTERNS_DIR,
+                        help="path of the patterns directory (default: %(default)s)")
+    parser.add_argument('-n', '--generations', type=int, default=1000,
+                        help="number of generations to compute (default: %(default)s)")
+    parser.add_argument('--engine', choices=ENGINES.keys(), default='dense', help="stepping engine (default: dense)")
+    parser.add_argument('--rule', default=None,
+                        help="Life-like rule in the B/S notation (default: the one of the pattern, or B3/S23)")
+    parser.add_argument('--rows', type=int,
+                        help="number of rows of the board (default: the ones of the pattern, at least 50)")
+    parser.add_argument('--cols', type=int,
+                        help="number of columns of the board (default: the ones of the pattern, at least 50)")
+    parser.add_argument('--offset', type=int, nargs=2, metavar=('ROW', 'COL'),
+                        help="position of the top left corner of the pattern (default: the one stored with the "
+                             "pattern, or centered)")
+    parser.add_argument('-o', '--output', help="path of the file receiving the final state, in the format given by its "
+                                               "extension (.gol for a board file, which keeps the generation)")
+    parser.add_argument('--compression', choices=COMPRESSIONS, default='none',
+                        help="compression of the output board file (default: %(default)s)")
+    parser.add_argument('--stats', help="path of the JSON file receiving the timing stats (default: standard output)")
+    parser.add_argument('--population', help="path of the JSON lines file receiving the population, births, deaths, "
+                                             "bounding box and age histogram of every generation, which are then "
+                                             "computed one at a time")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Entry point of the headless runner: loads the pattern, runs it at the maximum speed of the engine and writes the
+    final state and the timing stats
+    :param argv: list of arguments, the ones of the process by default
+    :returns: the exit code of the process
+    """
+
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    if args.output is not None and os.path.splitext(args.output)[1].lower() not in PATTERN_FORMATS:
+        print("Unknown pattern format: " + args.output, file=sys.stderr)  # Checked before the run, not after it
+        return 2
+
+    try:
+        if args.pattern is not None:
+            catalog = Catalog(args.patterns)  # Only the requested pattern is decoded
+
+            if args.pattern not in catalog:
+                print("Unknown pattern: " + args.pattern, file=sys.stderr)
+                return 2
+
+            pattern = catalog.get(args.pattern)
+        else:
+            pattern = load_pattern(args.state)
+    except (ValueError, OSError) as error:  # Unknown extension, malformed, missing or unreadable file
+        print(error, file=sys.stderr)
+        return 2
+
+    corner = pattern.get_position() or (0, 0)  # The default board also holds a pattern placed at its stored position
+    rows = args.rows or max(corner[0] + pattern.get_dimensions()[0], MIN_SIDE)
+    cols = args.cols or max(corner[1] + pattern.get_dimensions()[1], MIN_SIDE)
+
+    try:
+        board = Board(rows, cols, args.engine, args.rule or pattern.get_rule())
+    except ValueError as error:  # Invalid rulestring or rule not supported by the engine
+        print(error, file=sys.stderr)
+        return 2
+
+    try:
+        board.load_pattern(pattern, args.offset)
+        loaded = time.perf_counter()
+
+        if args.population is not None:
+            with open(args.population, 'w') as population_file:
+                for sample in stream_statistics(board, args.generations):
+                    population_file.write(json.dumps(sample) + '\n')
+        else:
+            board.run(args.generations)
+
+        finished = time.perf_counter()
+        board.follow_population()  # A pattern that has left the viewport of the plane is written where it has gone
+        alive = board.get_engine().get_alive()
+
+        stats = {'engine': args.engine, 'rule': str(board.get_rule()), 'rows': rows, 'cols': cols,
+                 'generations': args.generations, 'generation': board.get_generation(),
+                 'population': int(alive.sum()), 'load_seconds': loaded - start, 'run_seconds': finished - loaded,
+                 'generations_per_second': args.generations / max(finished - loaded, 1e-9),
+                 'cells_per_second': args.generations * rows * cols / max(finished - loaded, 1e-9)}
+
+        if args.output is not None and os.path.splitext(args.output)[1].lower() == BOARD_EXTENSION:
+            board.save(args.output, args.compression)
+        elif args.output is not None:
+            save_pattern(args.output, Pattern.from_arrays(alive, board.get_engine().get_ages(), pattern.get_name(),
+                                                          str(board.get_rule())))
+    except OSError as error:  # Population or output file that cannot be written
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        board.close()
+
+    if args.stats is not None:
+        try:
+            with open(args.stats, 'w') as stats_file:
+                json.dump(stats, stats_file, indent=2)
+        except OSError as error:
+            print(error, file=sys.stderr)
+            return 1
+    else:
+        print(json.dumps(stats, indent=2))
+
+    return 0
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+
+import numpy as np
+
+CYCLE_ACTIONS = ('report', 'pause', 'skip')  # What the game loop does once the board has become periodic
+
+
+def splitmix64(values):
+    """
+    Scrambles an array of integers into well distributed 64 bit values, with the finalizer of the SplitMix64 generator
+    :param values: uint64 array
+    :returns: a uint64 array with the same shape
+    """
+
+    values = values + np.uint64(0x9E3779B97F4A7C15)  # Unsigned arrays wrap around silently, as the algorithm expects
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class CycleDetector:
+    """
+    Class that detects when a board becomes periodic (a still life has period 1, a field of blinkers period 2). The hash
+    of the board is the XOR of a pseudorandom key for each alive cell (Zobrist hashing), so it can be updated from the
+    births and deaths of a generation alone. The keys are computed from the integers that identify the cells in the
+    engine (get_cell_ids), which on the unbounded plane also cover the cells outside of the viewport. The hashes of the
+    recent generations are kept in a bounded table: finding the current hash in the table means that the board is the
+    same of P generations ago, so it repeats with period P.
+    Two different boards have the same 64 bit hash with negligible probability, so the boards themselves are not stored
+    """
+
+    def __init__(self, history=1024):
+        """
+        Constructor of the class, which does not store the keys of the cells: they are computed when needed from the
+        integers identifying the cells, so the detector takes the same memory for any size of the board
+        :param history: number of recent generations whose hash is kept, which is also the longest detectable period
+        """
+
+        self._history = history
+        self._seen = OrderedDict()  # Hashes of the recent generations, mapped to the last generation they appeared in
+        self._hash = np.uint64(0)
+        self._cycle = None
+
+    def get_hash(self):
+        """
+        Getter of the hash of the board in the last generation
+        :returns: the 64 bit hash as an integer
+        """
+
+        return int(self._hash)
+
+    def get_cycle(self):
+        """
+        Getter of the cycle the board is in, if one has been found since the last reset
+        :returns: a (period, generation) tuple with the period and the generation in which it was detected, or None
+        """
+
+        return self._cycle
+
+    def keys(self, ids):
+        """
+        Computes the keys of some cells, scrambling the integers that identify them
+        :param ids: uint64 array with the n integers returned by the engine for the cells
+        :returns: a uint64 array with the n keys
+        """
+
+        return splitmix64(np.asarray(ids, dtype=np.uint64))
+
+    def reset(self, ids, generation):
+        """
+        Computes the hash of a whole board from scratch and forgets the previous ones, used when the board has been
+        edited or replaced without going through update
+        :param ids: uint64 array identifying every alive cell, as returned by the get_cell_ids of the engine
+        :param generation: generation of the board
+        """
+
+        self._hash = np.bitwise_xor.reduce(self.keys(ids))
+        self._seen.clear()
+        self._seen[int(self._hash)] = generation
+        self._cycle = None
+
+    def update(self, born, died, generation):
+        """
+        Updates the hash with the changes of a generation and looks it up among the hashes of the previous ones
+        :param born: uint64 array identifying the cells born in the generation, as returned by get_changed_ids
+        :param died: uint64 array identifying the cells dead in the generation
+        :param generation: generation reached with the changes
+        :returns: the period of the board if it has just been found to repeat itself, None otherwise
+        """
+
+        for ids in (born, died):  # Both a birth and a death flip the key of the cell in the hash
+            self._hash ^= np.bitwise_xor.reduce(self.keys(ids))
+
+        current = int(self._hash)
+        previous = self._seen.pop(current, None)
+        self._seen[current] = generation
+
+        if len(self._seen) > self._history:
+            self._seen.popitem(last=False)  # Forgets the oldest generation
+
+        if previous is None or self._cycle is not None:  # A periodic board keeps matching, it is only reported once
+            return None
+
+        self._cycle = (generation - previous, generation)
+        return self._cycle[0]
@@ -0,0 +1,193 @@
+import numpy as np
+
+from gamecore.engine import Engine, MAX_TIME
+
+
+def neighbor_sum(padded, out=None):
+    """
+    Sums the eight shifted views of a block of cells surrounded by a ring of halo cells, or of a stack of such blocks
+    :param padded: (r + 2) x (c + 2) uint8 array, the cells to count the neighbors of and their halo, optionally
+    preceded by the axis of the stack
+    :param out: optional r x c uint8 array (n x r x c for a stack) receiving the result
+    :returns: an r x c (n x r x c) uint8 array with the number of alive neighbors of each inner cell
+    """
+
+    out = np.add(padded[..., :-2, :-2], padded[..., :-2, 1:-1], out=out)  # Top left and top
+    out += padded[..., :-2, 2:]  # Top right
+    out += padded[..., 1:-1, :-2]  # Left
+    out += padded[..., 1:-1, 2:]  # Right
+    out += padded[..., 2:, :-2]  # Bottom left
+    out += padded[..., 2:, 1:-1]  # Bottom
+    out += padded[..., 2:, 2:]  # Bottom right
+
+    return out
+
+
+class DenseEngine(Engine):
+    """
+    Class that represents a dense stepping engine, keeping the alive state of every cell in an uint8 array and its alive
+    time in an uint16 array, computing each generation with whole-array neighbor sums instead of a per-cell loop
+    """
+
+    def __init__(self, rows, cols, rule=None):
+        """
+        Constructor of the class that allocates the state arrays and the buffers reused at every generation
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param rule: Rule or rulestring used to compute the generations, the rules of the Game of Life by default
+        """
+
+        super().__init__(rows, cols, rule)
+        self._alive = np.zeros((rows, cols), dtype=np.uint8)
+        self._ages = np.zeros((rows, cols), dtype=np.uint16)
+        self._padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)  # Board surrounded by a ring of dead cells
+        self._counts = np.zeros((rows, cols), dtype=np.uint8)
+
+    def get_alive(self):
+        """
+        Getter of the alive state of the board, the array is not copied so it must be treated as read only
+        :returns: a rows x cols uint8 array containing 1 for alive cells and 0 for dead ones
+        """
+
+        return self._alive
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the board, the array is not copied so it must be treated as read only
+        :returns: a rows x cols uint16 array containing the alive time of every cell
+        """
+
+        return self._ages
+
+    def get_value(self, row, col):
+        """
+        Getter of the value of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the value of the cell (1 or 0)
+        """
+
+        return int(self._alive[row, col])
+
+    def set_value(self, row, col, value):
+        """
+        Sets the value of a single cell, resetting its alive time if the cell dies
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new value of the cell (1 or 0)
+        """
+
+        self._alive[row, col] = value
+
+        if value == 0:
+            self._ages[row, col] = 0
+
+    def get_time(self, row, col):
+        """
+        Getter of the alive time of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the alive time of the cell
+        """
+
+        return int(self._ages[row, col])
+
+    def set_time(self, row, col, value):
+        """
+        Sets the alive time of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new alive time of the cell
+        """
+
+        self._ages[row, col] = min(value, MAX_TIME)
+
+    def clear(self):
+        """
+        Resets the whole board to its initial empty state
+        """
+
+        self._alive.fill(0)
+        self._ages.fill(0)
+
+    def _load(self, alive, ages):
+        """
+        Replaces the state of the board, called by load once the arrays have been normalized
+        :param alive: rows x cols boolean array of the alive cells
+        :param ages: rows x cols uint16 array of the alive time of the cells
+        """
+
+        self._alive[...] = alive
+        self._ages[...] = ages
+        self._ages[~alive] = 0
+
+    def alive_neighbors(self, row, col):
+        """
+        Counts the alive neighbors of a given cell, cells outside of the board are considered dead
+        :param row: row of the cell to count the neighbors of
+        :param col: column of the cell to count the neighbors of
+        :returns: an integer representing the number of alive neighbors
+        """
+
+        block = self._alive[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2]
+        return int(block.sum()) - int(self._alive[row, col])
+
+    def neighbor_counts(self):
+        """
+        Computes the number of alive neighbors of every cell at once, summing the eight shifted views of the board
+        :returns: a rows x cols uint8 array with the number of alive neighbors of each cell (reused at every call)
+        """
+
+        self._padded[1:-1, 1:-1] = self._alive
+        return neighbor_sum(self._padded, out=self._counts)
+
+    def step(self):
+        """
+        Computes the next generation given the rule of the engine, with the same semantics of the per-cell update:
+        born cells start with an alive time of 0, surviving cells increase it by 1 and dead cells reset it
+        :returns: a dictionary with the 'birth' and 'death' keys, each containing an (n, 2) array with the coordinates
+        of the cells in that category, the surviving cells being every other alive cell
+        """
+
+        alive, new_alive = self._next_alive()
+        born = new_alive & ~alive
+        survived = new_alive & alive
+        died = alive & ~new_alive
+
+        self._age(survived)
+        self._alive[...] = new_alive
+        self._generation += 1
+
+        return {'birth': np.argwhere(born), 'death': np.argwhere(died)}
+
+    def run(self, generations):
+        """
+        Advances the board by a number of generations without reporting the changes, used when only the final state is
+        needed
+        :param generations: number of generations to compute
+        """
+
+        for _ in range(generations):
+            alive, new_alive = self._next_alive()
+            self._age(new_alive & alive)
+            self._alive[...] = new_alive
+
+        self._generation += generations
+
+    def _next_alive(self):
+        """
+        Applies the rule to the whole board, looking up the next state of every cell in its transition table
+        :returns: two boolean arrays, the current alive state and the alive state of the next generation
+        """
+
+        counts = self.neighbor_counts()
+        return self._alive.astype(bool), self._rule.apply(self._alive, counts)
+
+    def _age(self, survived):
+        """
+        Increases by 1 the alive time of the surviving cells (saturating at MAX_TIME) and resets all the others
+        :param survived: boolean array of the cells that survive to the next generation
+        """
+
+        np.add(self._ages, 1, out=self._ages, where=survived & (self._ages < MAX_TIME))
+        self._ages[~survived] = 0
@@ -0,0 +1,89 @@
+import numpy as np
+
+NO_CELLS = np.empty((0, 2), dtype=np.intp)
+
+
+class GenerationDiff:
+    """
+    Class that describes how a board has changed in a single event, which is a generation or an edit: the coordinates
+    of the cells that have been born, that have died and that have aged (survived, increasing their alive time by 1).
+    The cells that have survived a generation are every other alive cell of the board, so they are only listed when an
+    observer asks for them. A full diff tells instead that the whole board has been replaced (a load, a jump or a skip),
+    so the observers must read it again
+    """
+
+    def __init__(self, generation, born=NO_CELLS, died=NO_CELLS, aged=NO_CELLS, full=False):
+        """
+        Constructor of the class
+        :param generation: generation of the board after the change
+        :param born: (n, 2) array with the coordinates of the cells that have been born
+        :param died: (n, 2) array with the coordinates of the cells that have died
+        :param aged: (n, 2) array with the coordinates of the cells that have survived, None for a generation whose
+        survivors are every alive cell that has not been born
+        :param full: True if the whole board has been replaced, in which case the coordinates are not given
+        """
+
+        self._generation = generation
+        self._born = born
+        self._died = died
+        self._aged = aged
+        self._full = full
+
+    @staticmethod
+    def from_changes(changes, generation):
+        """
+        Builds the diff of a generation from the dictionary of the changes returned by the step of an engine
+        :param changes: dictionary with the 'birth' and 'death' keys
+        :param generation: generation of the board after the step
+        :returns: a GenerationDiff
+        """
+
+        return GenerationDiff(generation, changes['birth'], changes['death'], None)
+
+    def get_generation(self):
+        """
+        Getter of the generation of the board after the change
+        :returns: the generation number
+        """
+
+        return self._generation
+
+    def get_born(self):
+        """
+        Getter of the cells that have been born
+        :returns: an (n, 2) array of coordinates
+        """
+
+        return self._born
+
+    def get_died(self):
+        """
+        Getter of the cells that have died
+        :returns: an (n, 2) array of coordinates
+        """
+
+        return self._died
+
+    def get_aged(self, alive):
+        """
+        Getter of the cells that have survived, whose alive time has increased by 1. The survivors of a generation are
+        listed from the board the first time they are requested, since that takes a scan of the whole board
+        :param alive: rows x cols array with 1 for the alive cells of the board after the change, only read the first
+        time the survivors of a generation are requested
+        :returns: an (n, 2) array of coordinates
+        """
+
+        if self._aged is None:
+            survived = np.array(alive, dtype=bool)
+            survived[tuple(self._born.T)] = False  # Every alive cell, but the ones born in this generation
+            self._aged = np.argwhere(survived)
+
+        return self._aged
+
+    def is_full(self):
+        """
+        Tells whether the whole board has been replaced
+        :returns: True if the observers must read the whole board again, False if the coordinates describe the change
+        """
+
+        return self._full
@@ -0,0 +1,243 @@
+import numpy as np
+
+from gamecore.rules import get_rule
+
+MAX_TIME = np.iinfo(np.uint16).max  # Alive time saturates here instead of wrapping around to 0
+
+
+class Engine:
+    """
+    Base class of the stepping engines, defining the interface used by the state grid to read, edit and advance the
+    board. Unless stated otherwise, an engine keeps the board finite, considering the cells outside of it as dead
+    """
+
+    def __init__(self, rows, cols, rule=None):
+        """
+        Constructor of the class that sets the attributes shared by all the engines
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param rule: Rule or rulestring used to compute the generations, the rules of the Game of Life by default
+        """
+
+        self._rows = rows
+        self._cols = cols
+        self._rule = get_rule(rule)
+        self._generation = 0
+        self.check_rule(self._rule)
+
+    def get_dimensions(self):
+        """
+        Method used to retrieve the number of rows and columns of the board
+        :returns: the number of rows and columns of the board
+        """
+
+        return self._rows, self._cols
+
+    def get_generation(self):
+        """
+        Getter of the number of generations computed since the creation of the engine
+        :returns: the current generation
+        """
+
+        return self._generation
+
+    def get_rule(self):
+        """
+        Getter of the rule used to compute the generations
+        :returns: the compiled Rule of the engine
+        """
+
+        return self._rule
+
+    def set_rule(self, rule):
+        """
+        Changes the rule used to compute the generations, starting from the next one
+        :param rule: Rule or rulestring
+        :raises ValueError: if the rule is not supported by the engine
+        """
+
+        rule = get_rule(rule)
+        self.check_rule(rule)
+        self._rule = rule
+
+    @staticmethod
+    def check_rule(rule):
+        """
+        Checks that a rule is supported by the engine, every Life-like rule is unless the engine overrides this method
+        :param rule: compiled Rule
+        :raises ValueError: if the rule cannot be simulated by the engine
+        """
+
+        pass
+
+    def get_alive(self):
+        """
+        Getter of the alive state of the board, which must be treated as read only
+        :returns: a rows x cols uint8 array containing 1 for alive cells and 0 for dead ones
+        """
+
+        raise NotImplementedError
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the board, which must be treated as read only
+        :returns: a rows x cols uint16 array containing the alive time of every cell
+        """
+
+        raise NotImplementedError
+
+    def get_cell_ids(self):
+        """
+        Identifies the alive cells of the board with integers, used to hash the board when looking for cycles
+        :returns: a uint64 array with the index of every alive cell in the flattened board
+        """
+
+        return np.flatnonzero(self.get_alive()).astype(np.uint64)
+
+    def get_changed_ids(self, changes):
+        """
+        Identifies the cells born and dead in a generation with the same integers used by get_cell_ids
+        :param changes: dictionary returned by step
+        :returns: the uint64 arrays of the born cells and of the dead cells
+        """
+
+        return tuple(np.ravel_multi_index(tuple(changes[key].T), (self._rows, self._cols)).astype(np.uint64)
+                     for key in ('birth', 'death'))
+
+    def get_value(self, row, col):
+        """
+        Getter of the value of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the value of the cell (1 or 0)
+        """
+
+        raise NotImplementedError
+
+    def set_value(self, row, col, value):
+        """
+        Sets the value of a single cell, resetting its alive time if the cell dies
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new value of the cell (1 or 0)
+        """
+
+        raise NotImplementedError
+
+    def get_time(self, row, col):
+        """
+        Getter of the alive time of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the alive time of the cell
+        """
+
+        raise NotImplementedError
+
+    def set_time(self, row, col, value):
+        """
+        Sets the alive time of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new alive time of the cell
+        """
+
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Resets the whole board to its initial empty state
+        """
+
+        raise NotImplementedError
+
+    def load(self, alive, ages=None, generation=None):
+        """
+        Replaces the whole board with the given state
+        :param alive: rows x cols array with 1 (or True) for alive cells
+        :param ages: optional rows x cols array with the alive time of the cells, 0 for every cell if not given
+        :param generation: optional generation of the loaded state, the current one is kept if not given
+        """
+
+        if ages is None:
+            ages = np.zeros((self._rows, self._cols), dtype=np.uint16)
+
+        if generation is not None:
+            self._generation = generation
+
+        self._load(np.asarray(alive, dtype=bool), np.minimum(ages, MAX_TIME).astype(np.uint16))
+
+    def alive_neighbors(self, row, col):
+        """
+        Counts the alive neighbors of a given cell, cells outside of the board are considered dead
+        :param row: row of the cell to count the neighbors of
+        :param col: column of the cell to count the neighbors of
+        :returns: an integer representing the number of alive neighbors
+        """
+
+        count = 0
+
+        for neighbor_row in range(max(row - 1, 0), min(row + 2, self._rows)):
+            for neighbor_col in range(max(col - 1, 0), min(col + 2, self._cols)):
+                if (neighbor_row, neighbor_col) != (row, col):
+                    count += self.get_value(neighbor_row, neighbor_col)
+
+        return count
+
+    def follow_population(self):
+        """
+        Moves the viewport of an engine on the unbounded plane back onto its population, once every alive cell has left
+        it. A bounded board is the whole board, so it never moves
+        :returns: True if the viewport has moved, in which case the whole board seen by the grid has changed
+        """
+
+        return False
+
+    def step(self):
+        """
+        Computes the next generation given the rule of the engine: born cells start with an alive time of 0,
+        surviving cells increase it by 1 and dead cells reset it
+        :returns: a dictionary with the 'birth' and 'death' keys, each containing an (n, 2) array with the coordinates
+        of the cells in that category, the surviving cells being every other alive cell
+        """
+
+        raise NotImplementedError
+
+    def run(self, generations):
+        """
+        Advances the board by a number of generations without reporting the changes, used when only the final state is
+        needed
+        :param generations: number of generations to compute
+        """
+
+        raise NotImplementedError
+
+    def skip(self, generations, period):
+        """
+        Advances a board that repeats itself every period generations by a whole number of cycles without computing
+        them: the alive cells stay the same, the ones alive for a whole cycle (which never die) keep aging, while the
+        ones born during the last cycle are born again at the same point of the next one and keep their alive time
+        :param generations: number of generations to skip, a multiple of the period
+        :param period: period of the board
+        """
+
+        alive = self.get_alive().copy()  # Some engines return views, which are overwritten by load
+        ages = self.get_ages().astype(np.int64)
+        ages[ages >= period] += generations
+        self.load(alive, ages, self._generation + generations)
+
+    def close(self):
+        """
+        Releases the resources held by the engine, after which it can no longer be used
+        """
+
+        pass
+
+    def _load(self, alive, ages):
+        """
+        Replaces the state of the board, called by load once the arrays have been normalized
+        :param alive: rows x cols boolean array of the alive cells
+        :param ages: rows x cols uint16 array of the alive time of the cells
+        """
+
+        raise NotImplementedError
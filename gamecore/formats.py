@@ -0,0 +1,432 @@
+import re
+
+import numpy as np
+
+from gamecore.rules import CONWAY
+
+CHUNK_SIZE = 1 << 18  # Bytes of an RLE file parsed at a time
+RLE_LINE = 70  # Maximum length of the lines of a written RLE file, as required by the format
+RLE_HEADER = re.compile(r'x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?', re.IGNORECASE)
+RLE_POSITION = re.compile(r'\s*(-?\d+)\s+(-?\d+)\s*$')  # Arguments of the #P and #R lines, the x and y of the position
+SPACES = np.isin(np.arange(256), np.frombuffer(b' \t\r\n', dtype=np.uint8))  # Lookup tables of the bytes
+DIGITS = (np.arange(256) >= ord('0')) & (np.arange(256) <= ord('9'))
+LIFE_106 = '#Life 1.06'  # First line of the files in the Life 1.06 format, a list of alive cells
+
+
+class Pattern:
+    """
+    Class that represents a pattern as the list of its alive cells (and optionally their alive time) inside a bounding
+    box, which takes memory proportional to its population instead of to its area. Patterns are placed on a board at an
+    offset, by default the position stored with the pattern or the center of the board if it has none
+    """
+
+    def __init__(self, rows, cols, cells, ages=None, name=None, rule=None, position=None):
+        """
+        Constructor of the class
+        :param rows: number of rows of the bounding box
+        :param cols: number of columns of the bounding box
+        :param cells: (n, 2) array with the coordinates of the alive cells inside the bounding box
+        :param ages: array with the alive time of each of the n cells, all 0 if not given
+        :param name: name of the pattern
+        :param rule: rulestring of the rule the pattern was designed for, if known
+        :param position: row and column of the board at which the top left corner of the bounding box is placed by
+        default, the pattern is centered if not given
+        """
+
+        self._rows = rows
+        self._cols = cols
+        self._cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        self._ages = None if ages is None else np.asarray(ages, dtype=np.int64)
+        self._name = name
+        self._rule = rule
+        self._position = None if position is None else (int(position[0]), int(position[1]))
+
+    @staticmethod
+    def from_arrays(alive, ages=None, name=None, rule=None):
+        """
+        Builds a pattern from the arrays of a board
+        :param alive: rows x cols array with 1 (or True) for alive cells
+        :param ages: rows x cols array with the alive time of the cells, if it must be kept
+        :param name: name of the pattern
+        :param rule: rulestring of the rule of the pattern
+        :returns: a Pattern with the size of the board
+        """
+
+        alive = np.asarray(alive, dtype=bool)
+        cells = np.argwhere(alive)
+        return Pattern(alive.shape[0], alive.shape[1], cells, None if ages is None else np.asarray(ages)[alive], name,
+                       rule)
+
+    @staticmethod
+    def from_state(state, name=None):
+        """
+        Builds a pattern from a state saved by the game, keeping the alive time of the cells
+        :param state: list of rows, each a list of [value, time] pairs
+        :param name: name of the pattern
+        :returns: a Pattern with the size of the state
+        """
+
+        if len(state) == 0:
+            return Pattern(0, 0, [], name=name)
+
+        cells = np.asarray(state, dtype=np.int64)  # Shape (rows, cols, 2)
+        return Pattern.from_arrays(cells[:, :, 0] == 1, cells[:, :, 1], name)
+
+    def get_name(self):
+        """
+        Getter of the name of the pattern
+        :returns: the name, None if unknown
+        """
+
+        return self._name
+
+    def set_name(self, name):
+        """
+        Setter of the name of the pattern
+        :param name: new name of the pattern
+        """
+
+        self._name = name
+
+    def get_rule(self):
+        """
+        Getter of the rule the pattern was designed for
+        :returns: the rulestring, None if unknown
+        """
+
+        return self._rule
+
+    def get_generation(self):
+        """
+        Getter of the generation of the pattern, which is only known for the boards saved by the game
+        :returns: None, since a pattern does not record its generation
+        """
+
+        return None
+
+    def get_dimensions(self):
+        """
+        Getter of the size of the bounding box of the pattern
+        :returns: the number of rows and columns of the bounding box
+        """
+
+        return self._rows, self._cols
+
+    def get_cells(self):
+        """
+        Getter of the alive cells of the pattern
+        :returns: an (n, 2) array with the coordinates of the alive cells inside the bounding box
+        """
+
+        return self._cells
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the cells of the pattern
+        :returns: an array with the alive time of each alive cell, None if not kept
+        """
+
+        return self._ages
+
+    def get_population(self):
+        """
+        Getter of the number of alive cells of the pattern
+        :returns: the number of alive cells
+        """
+
+        return len(self._cells)
+
+    def get_position(self):
+        """
+        Getter of the position stored with the pattern
+        :returns: the row and column of the board at which the top left corner of the bounding box is placed by
+        default, None if the pattern is centered
+        """
+
+        return self._position
+
+    def center(self, rows, cols):
+        """
+        Computes the offset that centers the pattern on a board
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :returns: the row and column of the board at which the top left corner of the bounding box is placed
+        """
+
+        return (rows - self._rows) // 2, (cols - self._cols) // 2
+
+    def to_arrays(self, rows, cols, offset=None):
+        """
+        Places the pattern on an empty board, cropping the cells that fall outside of it
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param offset: row and column of the board at which the top left corner of the bounding box is placed, the
+        stored position of the pattern if not given, or the center of the board if it has none
+        :returns: a rows x cols boolean array of the alive cells and a rows x cols int64 array of their alive time
+        """
+
+        if offset is None:
+            offset = self.center(rows, cols) if self._position is None else self._position
+
+        cell_rows = self._cells[:, 0] + offset[0]
+        cell_cols = self._cells[:, 1] + offset[1]
+        inside = (cell_rows >= 0) & (cell_rows < rows) & (cell_cols >= 0) & (cell_cols < cols)
+        alive = np.zeros((rows, cols), dtype=bool)
+        ages = np.zeros((rows, cols), dtype=np.int64)
+        alive[cell_rows[inside], cell_cols[inside]] = True
+
+        if self._ages is not None:
+            ages[cell_rows[inside], cell_cols[inside]] = self._ages[inside]
+
+        return alive, ages
+
+
+def read_rle(stream, chunk_size=CHUNK_SIZE):
+    """
+    Reads a pattern in the RLE format, in which every line of the pattern is a sequence of runs of dead (b) and alive
+    (o) cells, ended by $ (preceded by a count for multiple lines) and the whole pattern by !. The body is parsed a
+    chunk at a time with array operations, so the memory used besides the pattern itself does not depend on the file
+    size. A #P (or #R) comment line gives the column and row of the board at which the pattern is placed
+    :param stream: binary file object positioned at the start of the file
+    :param chunk_size: number of bytes parsed at a time
+    :returns: a Pattern
+    """
+
+    name = None
+    rule = None
+    position = None
+    header = None
+
+    for line in stream:  # Comment lines (the name is in #N) and then the header line
+        line = line.strip().decode('utf-8', 'replace')
+
+        if line.startswith('#N'):
+            name = line[2:].strip() or None
+        elif line.startswith('#r'):  # Old way of specifying the rule
+            rule = line[2:].strip() or None
+        elif line.startswith(('#P', '#R')):  # Top left corner of the pattern, as x (column) and y (row)
+            coords = RLE_POSITION.match(line[2:])
+
+            if coords is not None:  # Otherwise an ordinary comment
+                position = int(coords.group(2)), int(coords.group(1))
+        elif line and not line.startswith('#'):
+            header = RLE_HEADER.match(line)
+            break
+
+    if header is None:
+        raise ValueError("Missing RLE header line (x = ..., y = ...)")
+
+    cols, rows = int(header.group(1)), int(header.group(2))
+    rule = header.group(3) or rule
+    runs = []  # (rows, cols, lengths) arrays of the runs of alive cells of every chunk
+    row, col = 0, 0
+    pending = b''  # Incomplete token at the end of the previous chunk
+    finished = False
+
+    while not finished:
+        chunk = stream.read(chunk_size)
+        data = pending + chunk
+
+        if chunk:  # The trailing count (and whitespace) belongs to a token that continues in the next chunk
+            end = len(data.rstrip(b'0123456789 \t\r\n'))
+            data, pending = data[:end], data[end:]
+        else:
+            finished = True
+
+        chunk_runs, row, col, ended = _parse_rle_chunk(data, row, col)
+        runs.append(chunk_runs)
+        finished = finished or ended
+
+    run_rows, run_cols, lengths = (np.concatenate(arrays) for arrays in zip(*runs))
+    cells = np.empty((int(lengths.sum()), 2), dtype=np.int64)
+    cells[:, 0] = np.repeat(run_rows, lengths)
+    cells[:, 1] = np.repeat(run_cols - np.cumsum(lengths) + lengths, lengths)  # Column of the run minus its first index
+    cells[:, 1] += np.arange(len(cells))
+
+    if len(cells) > 0:  # A malformed header must not hide cells
+        rows = max(rows, int(cells[:, 0].max()) + 1)
+        cols = max(cols, int(cells[:, 1].max()) + 1)
+
+    return Pattern(rows, cols, cells, name=name, rule=rule, position=position)
+
+
+def _parse_rle_chunk(data, row, col):
+    """
+    Parses a sequence of complete RLE tokens, each an optional count followed by a tag
+    :param data: bytes of the tokens
+    :param row: row at which the first token starts
+    :param col: column at which the first token starts
+    :returns: a tuple with the (rows, cols, lengths) arrays of the runs of alive cells, the row and column following
+    the last token and whether the end of the pattern (!) has been reached
+    """
+
+    codes = np.frombuffer(data, dtype=np.uint8)
+    codes = codes[~SPACES[codes]]
+    end = np.flatnonzero(codes == ord('!'))
+    ended = len(end) > 0
+
+    if ended:
+        codes = codes[:end[0]]
+
+    digit = DIGITS[codes]
+    tags = np.flatnonzero(~digit)
+
+    if len(tags) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return (empty, empty, empty), row, col, ended
+
+    # The count of a tag is made of the digits between the previous tag and it, added one place value at a time
+    starts = np.concatenate(([0], tags[:-1] + 1))
+    counts = np.zeros(len(tags), dtype=np.int64)
+
+    for place in range(int((tags - starts).max())):
+        position = tags - 1 - place
+        has_digit = position >= starts
+        counts[has_digit] += (codes[position[has_digit]].astype(np.int64) - ord('0')) * 10 ** place
+
+    counts[tags == starts] = 1  # A tag without a count stands for a single cell or line
+    tag_codes = codes[tags]
+    newline = tag_codes == ord('$')
+    alive = ~newline & (tag_codes != ord('b')) & (tag_codes != ord('.'))  # Any other tag is an alive state
+    row_steps = np.where(newline, counts, 0)
+    col_steps = np.where(newline, 0, counts)
+    token_rows = row + np.cumsum(row_steps) - row_steps
+    reached = np.cumsum(col_steps)  # Columns advanced since the first token, reset by the newlines below
+    last_newline = np.maximum.accumulate(np.where(newline, np.arange(len(tags)), -1))
+    line_start = np.where(last_newline >= 0, reached[np.maximum(last_newline, 0)], -col)
+    token_cols = reached - col_steps - line_start
+
+    if newline.any():
+        col = int(reached[-1] - reached[np.flatnonzero(newline)[-1]])
+    else:
+        col += int(reached[-1])
+
+    return (token_rows[alive], token_cols[alive], counts[alive]), row + int(row_steps.sum()), col, ended
+
+
+def write_rle(stream, pattern):
+    """
+    Writes a pattern in the RLE format, computing the runs of the whole pattern with array operations
+    :param stream: text file object
+    :param pattern: Pattern to write
+    """
+
+    rows, cols = pattern.get_dimensions()
+
+    if pattern.get_name() is not None:
+        stream.write('#N ' + pattern.get_name() + '\n')
+
+    if pattern.get_position() is not None:
+        stream.write('#P {1} {0}\n'.format(*pattern.get_position()))
+
+    stream.write('x = {}, y = {}, rule = {}\n'.format(cols, rows, pattern.get_rule() or CONWAY))
+    cells = pattern.get_cells()
+    cells = cells[np.lexsort((cells[:, 1], cells[:, 0]))]  # Sorted by row and then by column
+    breaks = np.flatnonzero((np.diff(cells[:, 0]) != 0) | (np.diff(cells[:, 1]) != 1)) + 1  # Starts of the runs
+    run_starts = np.concatenate(([0], breaks)) if len(cells) > 0 else np.empty(0, dtype=np.int64)
+    lengths = np.diff(np.concatenate((run_starts, [len(cells)])))
+    run_rows, run_cols = cells[run_starts, 0], cells[run_starts, 1]
+
+    # Every run is preceded by the lines it skips ($) and by the dead cells before it in its line (b)
+    row_steps = np.diff(np.concatenate(([0], run_rows)))
+    previous_ends = np.concatenate(([0], run_cols[:-1] + lengths[:-1]))
+    previous_ends[row_steps > 0] = 0
+    counts = np.column_stack((row_steps, run_cols - previous_ends, lengths)).ravel().tolist()
+    tags = '$bo' * len(lengths)
+    tokens = [(str(count) if count > 1 else '') + tag for count, tag in zip(counts, tags) if count > 0]
+    tokens.append('!')
+    ends = np.cumsum([len(token) for token in tokens])  # Length of the body up to the end of every token
+    start = 0
+
+    while start < len(tokens):  # Every line takes as many whole tokens as fit in RLE_LINE characters
+        before = ends[start - 1] if start > 0 else 0
+        stop = max(int(np.searchsorted(ends, before + RLE_LINE, side='right')), start + 1)
+        stream.write(''.join(tokens[start:stop]) + '\n')
+        start = stop
+
+
+def read_plaintext(stream):
+    """
+    Reads a pattern in the plaintext format, with a line of text for every row of cells: O for alive cells and . for
+    dead ones, preceded by comment lines starting with ! (the name is given in a !Name: line)
+    :param stream: text file object
+    :returns: a Pattern
+    """
+
+    name = None
+    rows = []
+    cols = []
+    width = 0
+    row = 0
+
+    for line in stream:
+        line = line.rstrip('\r\n')
+
+        if line.startswith('!'):
+            if line.startswith('!Name:'):
+                name = line[6:].strip() or None
+
+            continue
+
+        codes = np.frombuffer(line.encode('ascii', 'replace'), dtype=np.uint8)
+        alive = np.flatnonzero((codes == ord('O')) | (codes == ord('*')))
+        rows.append(np.full(len(alive), row, dtype=np.int64))
+        cols.append(alive)
+        width = max(width, len(line))
+        row += 1
+
+    cells = np.column_stack((np.concatenate(rows), np.concatenate(cols))) if rows else []
+    return Pattern(row, width, cells, name=name)
+
+
+def write_plaintext(stream, pattern):
+    """
+    Writes a pattern in the plaintext format
+    :param stream: text file object
+    :param pattern: Pattern to write
+    """
+
+    rows, cols = pattern.get_dimensions()
+
+    if pattern.get_name() is not None:
+        stream.write('!Name: ' + pattern.get_name() + '\n')
+
+    lines = np.full((rows, cols), ord('.'), dtype=np.uint8)
+    cells = pattern.get_cells()
+    lines[cells[:, 0], cells[:, 1]] = ord('O')
+
+    for line in lines:
+        stream.write(line.tobytes().decode('ascii') + '\n')
+
+
+def read_life106(stream):
+    """
+    Reads a pattern in the Life 1.06 format, a list of the x (column) and y (row) coordinates of the alive cells, which
+    may be negative: the pattern is moved so that its bounding box starts at 0, 0
+    :param stream: text file object
+    :returns: a Pattern
+    """
+
+    first = stream.readline().strip()
+
+    if first != LIFE_106:
+        raise ValueError("Missing " + LIFE_106 + " header line")
+
+    coords = np.loadtxt(stream, dtype=np.int64, comments='#', ndmin=2).reshape(-1, 2)
+
+    if len(coords) == 0:
+        return Pattern(0, 0, [])
+
+    cells = coords[:, ::-1] - coords[:, ::-1].min(axis=0)  # From (x, y) to (row, col)
+    return Pattern(int(cells[:, 0].max()) + 1, int(cells[:, 1].max()) + 1, cells)
+
+
+def write_life106(stream, pattern):
+    """
+    Writes a pattern in the Life 1.06 format
+    :param stream: text file object
+    :param pattern: Pattern to write
+    """
+
+    stream.write(LIFE_106 + '\n')
+    np.savetxt(stream, pattern.get_cells()[:, ::-1], fmt='%d')
@@ -0,0 +1,350 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from gamecore.rules import get_rule
+
+
+class Node:
+    """
+    Class that represents a node of the quadtree, a square of 2^level x 2^level cells split into four quadrants.
+    Nodes are canonicalised by HashLife, so two equal squares are always the same object and can be compared and hashed
+    by identity
+    """
+
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        """
+        Constructor of the class, which should only be called by HashLife to keep the nodes canonical
+        :param nw: north west quadrant
+        :param ne: north east quadrant
+        :param sw: south west quadrant
+        :param se: south east quadrant
+        :param level: base 2 logarithm of the side of the square
+        :param population: number of alive cells in the square
+        """
+
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+
+class HashLife:
+    """
+    Class that represents a HashLife universe: the unbounded plane is stored as a quadtree of canonical nodes and the
+    evolution of every node is memoised, so that repeated or periodic patterns are computed only once and the board
+    can be advanced by 2^k generations in a single call. Since the plane is unbounded, the result matches the bounded
+    engines only as long as the pattern does not reach the border of the board. The alive time is not tracked
+    """
+
+    def __init__(self, rule=None, max_nodes=1 << 20, max_results=1 << 20):
+        """
+        Constructor of the class that creates the two leaves and an empty universe
+        :param rule: Rule or rulestring used to compute the generations, the rules of the Game of Life by default
+        :param max_nodes: number of canonical nodes above which the unreachable nodes are discarded
+        :param max_results: number of memoised results above which the least recently used ones are evicted
+        :raises ValueError: if the rule makes cells without neighbors come to life, filling the unbounded plane
+        """
+
+        self._rule = get_rule(rule)
+
+        if 0 in self._rule.get_birth():
+            raise ValueError("B0 rules are not supported on the unbounded plane")
+
+        self._max_nodes = max_nodes
+        self._max_results = max_results
+        self._nodes = {}  # Canonical table, mapping the four quadrants to the node made of them
+        self._results = OrderedDict()  # Memoised evolution, mapping (node, j) to its centre after 2^j generations
+        self._empty = []  # Empty node of each level
+        self._off = Node(None, None, None, None, 0, 0)
+        self._on = Node(None, None, None, None, 0, 1)
+        self._root = self.empty(3)
+        self._top = 0  # Coordinates of the top left cell of the root
+        self._left = 0
+        self._generation = 0
+
+    def join(self, nw, ne, sw, se):
+        """
+        Creates (or retrieves, if it already exists) the canonical node made of four quadrants
+        :returns: the canonical node one level above the quadrants
+        """
+
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1, nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+
+        return node
+
+    def empty(self, level):
+        """
+        Retrieves the canonical empty node of a given level
+        :param level: level of the node
+        :returns: a node with no alive cells
+        """
+
+        while len(self._empty) <= level:
+            if not self._empty:
+                self._empty.append(self._off)
+            else:
+                smaller = self._empty[-1]
+                self._empty.append(self.join(smaller, smaller, smaller, smaller))
+
+        return self._empty[level]
+
+    def get_rule(self):
+        """
+        Getter of the rule used to compute the generations
+        :returns: the compiled Rule of the universe
+        """
+
+        return self._rule
+
+    def get_generation(self):
+        """
+        Getter of the number of generations computed since the universe was loaded
+        :returns: the current generation
+        """
+
+        return self._generation
+
+    def get_population(self):
+        """
+        Getter of the number of alive cells in the universe
+        :returns: the population of the root node
+        """
+
+        return self._root.population
+
+    def load(self, alive, top=0, left=0, generation=0):
+        """
+        Replaces the universe with the alive cells of a board
+        :param alive: 2-D array with 1 (or True) for alive cells
+        :param top: row of the plane in which the first row of the board is placed
+        :param left: column of the plane in which the first column of the board is placed
+        :param generation: generation of the loaded board
+        """
+
+        rows, cols = alive.shape
+        level = max(3, (max(rows, cols) - 1).bit_length())
+        square = np.zeros((1 << level, 1 << level), dtype=bool)
+        square[:rows, :cols] = alive
+        self._root = self._build(square, level)
+        self._top = top
+        self._left = left
+        self._generation = generation
+
+    def to_array(self, rows, cols, top=0, left=0):
+        """
+        Copies a window of the plane into an array
+        :param rows: number of rows of the window
+        :param cols: number of columns of the window
+        :param top: row of the plane of the first row of the window
+        :param left: column of the plane of the first column of the window
+        :returns: a rows x cols uint8 array with 1 for alive cells and 0 for dead ones
+        """
+
+        alive = np.zeros((rows, cols), dtype=np.uint8)
+        stack = [(self._root, self._top - top, self._left - left)]
+
+        while stack:
+            node, row, col = stack.pop()
+            side = 1 << node.level
+
+            if node.population == 0 or row >= rows or col >= cols or row + side <= 0 or col + side <= 0:
+                continue  # Empty or outside of the window
+
+            if node.level == 0:
+                alive[row, col] = 1
+            else:
+                half = side >> 1
+                stack.extend(((node.nw, row, col), (node.ne, row, col + half), (node.sw, row + half, col),
+                              (node.se, row + half, col + half)))
+
+        return alive
+
+    def advance_pow2(self, power):
+        """
+        Advances the universe by 2^power generations with a single evaluation of the root
+        :param power: base 2 logarithm of the number of generations
+        """
+
+        while self._root.level < power + 2 or self._centre(self._root).population != self._root.population:
+            self._expand()
+
+        self._expand()  # Two more levels of empty space, so that the pattern cannot grow out of the result
+        self._expand()
+        offset = 1 << (self._root.level - 2)
+        self._root = self._successor(self._root, power)
+        self._top += offset
+        self._left += offset
+        self._generation += 1 << power
+        self._shrink()
+        self._collect()
+
+    def advance(self, generations):
+        """
+        Advances the universe by an arbitrary number of generations, splitting it in powers of 2
+        :param generations: number of generations to compute
+        """
+
+        power = 0
+
+        while generations:
+            if generations & 1:
+                self.advance_pow2(power)
+
+            generations >>= 1
+            power += 1
+
+    def _build(self, square, level):
+        """
+        Builds the quadtree of a square array, skipping the empty regions
+        :param square: 2^level x 2^level boolean array
+        :param level: level of the node to build
+        :returns: the canonical node representing the array
+        """
+
+        if not square.any():
+            return self.empty(level)
+
+        if level == 0:
+            return self._on
+
+        half = 1 << (level - 1)
+        return self.join(self._build(square[:half, :half], level - 1), self._build(square[:half, half:], level - 1),
+                         self._build(square[half:, :half], level - 1), self._build(square[half:, half:], level - 1))
+
+    def _centre(self, node):
+        """
+        Retrieves the centre of a node, the square of half its side around its middle
+        :param node: node of level 2 or more
+        :returns: the canonical node one level below
+        """
+
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _expand(self):
+        """
+        Doubles the side of the root, placing it at the centre of a square of empty space
+        """
+
+        root = self._root
+        empty = self.empty(root.level - 1)
+        self._root = self.join(self.join(empty, empty, empty, root.nw), self.join(empty, empty, root.ne, empty),
+                               self.join(empty, root.sw, empty, empty), self.join(root.se, empty, empty, empty))
+        offset = 1 << (root.level - 1)
+        self._top -= offset
+        self._left -= offset
+
+    def _shrink(self):
+        """
+        Halves the side of the root as long as all of its alive cells are in its centre
+        """
+
+        while self._root.level > 3 and self._centre(self._root).population == self._root.population:
+            offset = 1 << (self._root.level - 2)
+            self._root = self._centre(self._root)
+            self._top += offset
+            self._left += offset
+
+    def _successor(self, node, power):
+        """
+        Computes the centre of a node after 2^power generations, assuming that everything outside of it is dead
+        :param node: node of level 2 or more
+        :param power: base 2 logarithm of the number of generations, at most the level of the node minus 2
+        :returns: the canonical node one level below, representing the evolved centre
+        """
+
+        key = (node, power)
+        result = self._results.get(key)
+
+        if result is not None:
+            self._results.move_to_end(key)
+            return result
+
+        if node.population == 0:
+            result = node.nw
+        elif node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            # Nine overlapping sub-squares of half the side, each evolved into its centre
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            squares = (nw, self.join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+                       self.join(nw.sw, nw.se, sw.nw, sw.ne), self._centre(node), self.join(ne.sw, ne.se, se.nw, se.ne),
+                       sw, self.join(sw.ne, se.nw, sw.se, se.sw), se)
+
+            if power < node.level - 2:  # Half of the generations: advance the sub-squares once and join their centres
+                c = [self._successor(square, power) for square in squares]
+                result = self.join(self.join(c[0].se, c[1].sw, c[3].ne, c[4].nw),
+                                   self.join(c[1].se, c[2].sw, c[4].ne, c[5].nw),
+                                   self.join(c[3].se, c[4].sw, c[6].ne, c[7].nw),
+                                   self.join(c[4].se, c[5].sw, c[7].ne, c[8].nw))
+            else:  # All of the generations: advance the sub-squares and then the four squares made of their results
+                c = [self._successor(square, power - 1) for square in squares]
+                result = self.join(self._successor(self.join(c[0], c[1], c[3], c[4]), power - 1),
+                                   self._successor(self.join(c[1], c[2], c[4], c[5]), power - 1),
+                                   self._successor(self.join(c[3], c[4], c[6], c[7]), power - 1),
+                                   self._successor(self.join(c[4], c[5], c[7], c[8]), power - 1))
+
+        self._results[key] = result
+
+        if len(self._results) > self._max_results:
+            self._results.popitem(last=False)  # Evicts the least recently used result
+
+        return result
+
+    def _life_4x4(self, node):
+        """
+        Applies the rule to the centre of a 4x4 node, looking up the next state of each cell in its transition table
+        :param node: node of level 2
+        :returns: the canonical 2x2 node of the centre after one generation
+        """
+
+        cells = [[0] * 4 for _ in range(4)]
+
+        for row_offset, col_offset, quadrant in ((0, 0, node.nw), (0, 2, node.ne), (2, 0, node.sw), (2, 2, node.se)):
+            cells[row_offset][col_offset] = quadrant.nw.population
+            cells[row_offset][col_offset + 1] = quadrant.ne.population
+            cells[row_offset + 1][col_offset] = quadrant.sw.population
+            cells[row_offset + 1][col_offset + 1] = quadrant.se.population
+
+        table = self._rule.get_table()
+        centre = []
+
+        for row in (1, 2):
+            for col in (1, 2):
+                count = sum(cells[r][c] for r in range(row - 1, row + 2) for c in range(col - 1, col + 2))
+                count -= cells[row][col]
+                centre.append(self._on if table[cells[row][col], count] else self._off)
+
+        return self.join(*centre)
+
+    def _collect(self):
+        """
+        Discards the memoised results and the nodes that cannot be reached from the root once the canonical table has
+        grown over its limit, keeping the memory used by the universe bounded
+        """
+
+        if len(self._nodes) <= self._max_nodes:
+            return
+
+        self._results.clear()
+        reachable = {}
+        stack = [self._root] + self._empty[1:]
+
+        while stack:
+            node = stack.pop()
+            key = (node.nw, node.ne, node.sw, node.se)
+
+            if node.level > 0 and key not in reachable:
+                reachable[key] = node
+                stack.extend(key)
+
+        self._nodes = reachable
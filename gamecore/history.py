@@ -0,0 +1,292 @@
+import numpy as np
+
+from gamecore.engine import MAX_TIME
+
+HISTORY_BUDGET = 64 << 20  # Bytes of history kept by default
+KEYFRAME_INTERVAL = 64  # Changes recorded after a keyframe before the next one is taken
+ENTRY_BYTES = 128  # Estimated size of the Python objects of a recorded change, besides its arrays
+
+
+class History:
+    """
+    Class that records the past generations of a board within a memory budget, so that it can be rewound to any of them.
+    The history is a sequence of segments, each starting with a keyframe (the whole board, with the alive cells packed
+    8 per byte and the alive time of the alive cells only) followed by the births and deaths of every change, stored as
+    flat cell indices. A board is rebuilt by replaying the changes from the keyframe before it, and when the budget is
+    exceeded the oldest segments are dropped
+    """
+
+    def __init__(self, rows, cols, budget=HISTORY_BUDGET, keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Constructor of the class that creates an empty history
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param budget: maximum number of bytes taken by the history, 0 to disable it
+        :param keyframe_interval: maximum number of changes recorded after a keyframe
+        """
+
+        self._rows = rows
+        self._cols = cols
+        self._budget = budget
+        self._interval = keyframe_interval
+        self._index_type = np.int32 if rows * cols < 2 ** 31 else np.int64
+        self._segments = []  # HistorySegment objects, from the oldest to the newest
+        self._size = 0  # Bytes taken by all the segments
+        self._rewound = None  # Generation the board has been rewound to, whose following ones are dropped at the next
+        # change
+
+    def get_budget(self):
+        """
+        Getter of the memory budget of the history
+        :returns: the maximum number of bytes taken by the history, 0 if it is disabled
+        """
+
+        return self._budget
+
+    def set_budget(self, budget):
+        """
+        Setter of the memory budget of the history, dropping the oldest segments if it is exceeded
+        :param budget: maximum number of bytes taken by the history, 0 to disable it
+        """
+
+        self._budget = budget
+
+        if budget == 0:
+            self.clear()
+        else:
+            self._evict()
+
+    def get_size(self):
+        """
+        Getter of the memory taken by the history
+        :returns: the number of bytes of all the recorded segments
+        """
+
+        return self._size
+
+    def get_range(self):
+        """
+        Getter of the generations that can be rebuilt
+        :returns: the first and the last recorded generation, None if nothing has been recorded
+        """
+
+        if not self._segments:
+            return None
+
+        return self._segments[0].get_generation(), self._segments[-1].get_last_generation()
+
+    def clear(self):
+        """
+        Forgets every recorded generation
+        """
+
+        self._segments = []
+        self._size = 0
+        self._rewound = None
+
+    def record(self, diff, source):
+        """
+        Records a change of the board: a full change, or the first one after KEYFRAME_INTERVAL changes or after changes
+        bigger than the keyframe, starts a new segment with the board after the change, while the others are stored as
+        births and deaths. A change to a later generation is a step, in which the surviving cells grow older
+        :param diff: GenerationDiff of the change
+        :param source: engine (or any object with get_alive and get_ages) holding the board after the change, whose
+        arrays are only read when a new segment is started
+        """
+
+        if self._budget == 0:
+            return
+
+        if self._rewound is not None:  # The board changes again after a rewind, so the old future is forgotten
+            self.truncate(self._rewound)
+            self._rewound = None
+
+        segment = self._segments[-1] if self._segments else None
+
+        if diff.is_full() or segment is None or segment.is_complete(self._interval):
+            segment = HistorySegment(diff.get_generation(), source.get_alive(), source.get_ages())
+            self._segments.append(segment)
+            self._size += segment.get_size()
+        else:
+            self._size += segment.add(diff.get_generation(), self._flatten(diff.get_born()),
+                                      self._flatten(diff.get_died()))
+
+        self._evict()
+
+    def seek(self, generation):
+        """
+        Rebuilds a recorded board, replaying the changes from the keyframe before it
+        :param generation: generation to rebuild, the board after all of its changes (including the edits) is returned
+        :returns: a rows x cols boolean array of the alive cells, a rows x cols uint16 array of their alive time and the
+        generation of the board, which is the last recorded one before the given generation if that has been skipped
+        :raises ValueError: if the generation has not been recorded or has been dropped
+        """
+
+        recorded = self.get_range()
+
+        if recorded is None or not recorded[0] <= generation <= recorded[1]:
+            raise ValueError("Generation " + str(generation) + " is not in the history")
+
+        segment = [segment for segment in self._segments if segment.get_generation() <= generation][-1]
+        return segment.replay(generation, self._rows, self._cols)
+
+    def rewind(self, generation):
+        """
+        Rebuilds a recorded board that the board is brought back to. The generations after it are kept, so that the
+        board can be moved forward again, until the board changes
+        :param generation: generation to rebuild
+        :returns: the same as seek
+        """
+
+        alive, ages, generation = self.seek(generation)
+        self._rewound = generation
+        return alive, ages, generation
+
+    def truncate(self, generation):
+        """
+        Forgets the generations after a given one, used when the board is rewound to it and then changes again
+        :param generation: last generation to keep
+        """
+
+        while self._segments and self._segments[-1].get_generation() > generation:
+            self._size -= self._segments.pop().get_size()
+
+        if self._segments:
+            self._size -= self._segments[-1].truncate(generation)
+
+    def _flatten(self, coords):
+        """
+        Converts coordinates into flat cell indices
+        :param coords: (n, 2) array of coordinates
+        :returns: an array with the index of each cell in the board
+        """
+
+        coords = np.asarray(coords)
+        return (coords[:, 0] * self._cols + coords[:, 1]).astype(self._index_type)
+
+    def _evict(self):
+        """
+        Drops the oldest segments until the history fits its budget, always keeping the newest one
+        """
+
+        while self._size > self._budget and len(self._segments) > 1:
+            self._size -= self._segments.pop(0).get_size()
+
+
+class HistorySegment:
+    """
+    Class that represents a keyframe of the history and the changes recorded after it
+    """
+
+    def __init__(self, generation, alive, ages):
+        """
+        Constructor of the class that stores the keyframe
+        :param generation: generation of the keyframe
+        :param alive: rows x cols array with 1 for the alive cells
+        :param ages: rows x cols array with the alive time of the cells
+        """
+
+        alive = np.asarray(alive, dtype=bool)
+        self._generation = generation
+        self._packed = np.packbits(alive)
+        self._ages = np.minimum(np.asarray(ages)[alive], MAX_TIME).astype(np.uint16)  # Dead cells have no age
+        self._changes = []  # (generation, step, born, died) of every change after the keyframe
+        self._keyframe_size = self._packed.nbytes + self._ages.nbytes + ENTRY_BYTES
+        self._changes_size = 0
+
+    def get_generation(self):
+        """
+        Getter of the generation of the keyframe
+        :returns: the generation number
+        """
+
+        return self._generation
+
+    def get_last_generation(self):
+        """
+        Getter of the generation of the last change of the segment
+        :returns: the generation number
+        """
+
+        return self._changes[-1][0] if self._changes else self._generation
+
+    def get_size(self):
+        """
+        Getter of the memory taken by the segment
+        :returns: the number of bytes of the keyframe and of the changes
+        """
+
+        return self._keyframe_size + self._changes_size
+
+    def is_complete(self, interval):
+        """
+        Tells whether the next change should start a new segment, because the segment has many changes or because
+        replaying them takes longer than reading a keyframe
+        :param interval: maximum number of changes of a segment
+        :returns: True if a new keyframe should be taken
+        """
+
+        return len(self._changes) >= interval or self._changes_size > self._keyframe_size
+
+    def add(self, generation, born, died):
+        """
+        Records a change after the keyframe
+        :param generation: generation of the board after the change
+        :param born: flat indices of the cells that have been born
+        :param died: flat indices of the cells that have died
+        :returns: the number of bytes taken by the change
+        """
+
+        step = generation != self.get_last_generation()  # Otherwise it is an edit, which does not age the cells
+        self._changes.append((generation, step, born, died))
+        size = born.nbytes + died.nbytes + ENTRY_BYTES
+        self._changes_size += size
+        return size
+
+    def truncate(self, generation):
+        """
+        Forgets the changes after a given generation
+        :param generation: last generation to keep
+        :returns: the number of bytes freed
+        """
+
+        freed = 0
+
+        while self._changes and self._changes[-1][0] > generation:
+            _, _, born, died = self._changes.pop()
+            freed += born.nbytes + died.nbytes + ENTRY_BYTES
+
+        self._changes_size -= freed
+        return freed
+
+    def replay(self, generation, rows, cols):
+        """
+        Rebuilds the board at a generation of the segment, applying the changes with the semantics of the engines: born
+        cells start with an alive time of 0, surviving cells increase it by 1 at every step and dead cells reset it
+        :param generation: generation to rebuild
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :returns: a rows x cols boolean array of the alive cells, a rows x cols uint16 array of their alive time and the
+        generation of the last change replayed
+        """
+
+        reached = self._generation
+        alive = np.unpackbits(self._packed, count=rows * cols).view(bool)
+        ages = np.zeros(rows * cols, dtype=np.uint16)
+        ages[alive] = self._ages
+
+        for change_generation, step, born, died in self._changes:
+            if change_generation > generation:
+                break
+
+            alive[died] = False
+            ages[died] = 0
+
+            if step:
+                np.add(ages, 1, out=ages, where=alive & (ages < MAX_TIME))
+
+            alive[born] = True
+            ages[born] = 0
+            reached = change_generation
+
+        return alive.reshape(rows, cols), ages.reshape(rows, cols), reached
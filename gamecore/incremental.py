@@ -0,0 +1,222 @@
+import numpy as np
+
+from gamecore.dense import neighbor_sum
+from gamecore.engine import Engine, MAX_TIME
+
+TILE = 32  # Side of the square tiles in which the board is divided to track the changes
+
+
+class IncrementalEngine(Engine):
+    """
+    Class that represents a change-tracking stepping engine, which divides the board in tiles and keeps a dirty set of
+    the tiles that changed in the last generation: only those tiles and their neighbors are evaluated in the next one,
+    so still lifes and empty space cost nothing and the step time scales with the activity on the board.
+    The alive time is derived from the generation in which each cell was born, so that surviving cells do not need to
+    be touched at every generation
+    """
+
+    def __init__(self, rows, cols, rule=None):
+        """
+        Constructor of the class that allocates the state arrays and an empty dirty set
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param rule: Rule or rulestring used to compute the generations, the rules of the Game of Life by default
+        """
+
+        super().__init__(rows, cols, rule)
+        self._padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)  # Board surrounded by a ring of dead cells
+        self._alive = self._padded[1:-1, 1:-1]
+        self._born = np.zeros((rows, cols), dtype=np.int64)  # Generation in which each alive cell was born
+        self._tile_rows = (rows + TILE - 1) // TILE
+        self._tile_cols = (cols + TILE - 1) // TILE
+        self._dirty = set()  # Tiles changed in the last generation or edited since then
+        self._pending = {}  # Alive times set on dead cells, applied when they are toggled alive
+
+    @staticmethod
+    def check_rule(rule):
+        """
+        Checks that a rule keeps empty space empty, which is what allows the engine to skip the quiet tiles
+        :param rule: compiled Rule
+        :raises ValueError: if the rule makes cells without neighbors come to life
+        """
+
+        if 0 in rule.get_birth():
+            raise ValueError("B0 rules are not supported by the incremental engine")
+
+    def set_rule(self, rule):
+        """
+        Changes the rule used to compute the generations, starting from the next one, in which the whole board is
+        evaluated since any cell may now behave differently
+        :param rule: Rule or rulestring
+        """
+
+        super().set_rule(rule)
+        self._dirty = {(row, col) for row in range(self._tile_rows) for col in range(self._tile_cols)}
+
+    def get_alive(self):
+        """
+        Getter of the alive state of the board, the array is not copied so it must be treated as read only
+        :returns: a rows x cols uint8 array containing 1 for alive cells and 0 for dead ones
+        """
+
+        return self._alive
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the board, computed from the birth generation of the cells
+        :returns: a rows x cols uint16 array containing the alive time of every cell
+        """
+
+        ages = np.minimum(self._generation - self._born, MAX_TIME).astype(np.uint16)
+        ages[self._alive == 0] = 0
+        return ages
+
+    def get_value(self, row, col):
+        """
+        Getter of the value of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the value of the cell (1 or 0)
+        """
+
+        return int(self._alive[row, col])
+
+    def set_value(self, row, col, value):
+        """
+        Sets the value of a single cell and marks its tile as dirty, a newly alive cell starts with an alive time of 0
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new value of the cell (1 or 0)
+        """
+
+        if value and not self._alive[row, col]:
+            self._born[row, col] = self._generation - self._pending.pop((row, col), 0)
+
+        self._alive[row, col] = value
+        self._dirty.add((row // TILE, col // TILE))
+
+    def get_time(self, row, col):
+        """
+        Getter of the alive time of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the alive time of the cell
+        """
+
+        if not self._alive[row, col]:
+            return self._pending.get((row, col), 0)
+
+        return int(min(self._generation - self._born[row, col], MAX_TIME))
+
+    def set_time(self, row, col, value):
+        """
+        Sets the alive time of a single cell, moving back its birth generation (or keeping it aside if the cell is dead)
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new alive time of the cell
+        """
+
+        if self._alive[row, col]:
+            self._born[row, col] = self._generation - min(value, MAX_TIME)
+        elif value:
+            self._pending[(row, col)] = min(value, MAX_TIME)
+        else:
+            self._pending.pop((row, col), None)
+
+    def clear(self):
+        """
+        Resets the whole board to its initial empty state
+        """
+
+        self._padded.fill(0)
+        self._dirty.clear()
+        self._pending.clear()
+
+    def _load(self, alive, ages):
+        """
+        Replaces the state of the board, called by load once the arrays have been normalized, and marks every tile as
+        dirty
+        :param alive: rows x cols boolean array of the alive cells
+        :param ages: rows x cols uint16 array of the alive time of the cells
+        """
+
+        self._alive[...] = alive
+        self._born[...] = self._generation - ages.astype(np.int64)
+        self._pending.clear()
+        self._dirty = {(row, col) for row in range(self._tile_rows) for col in range(self._tile_cols)}
+
+    def step(self):
+        """
+        Computes the next generation given the rule of the engine: born cells start with an alive time of 0,
+        surviving cells increase it by 1 and dead cells reset it. The births and deaths are collected from the changed
+        tiles alone, so the cost of a generation does not depend on the area of the board
+        :returns: a dictionary with the 'birth' and 'death' keys, each containing an (n, 2) array with the coordinates
+        of the cells in that category, the surviving cells being every other alive cell
+        """
+
+        births = [np.empty((0, 2), dtype=np.intp)]
+        deaths = [np.empty((0, 2), dtype=np.intp)]
+
+        for row, col, old, new in self._advance():
+            births.append(np.argwhere(new & ~old) + (row, col))
+            deaths.append(np.argwhere(old & ~new) + (row, col))
+
+        return {'birth': self._sorted(np.concatenate(births)), 'death': self._sorted(np.concatenate(deaths))}
+
+    def run(self, generations):
+        """
+        Advances the board by a number of generations without reporting the changes, used when only the final state is
+        needed
+        :param generations: number of generations to compute
+        """
+
+        for _ in range(generations):
+            self._advance()
+
+    def _advance(self):
+        """
+        Computes the next generation evaluating only the dirty tiles and their neighbors, then applies the changes and
+        replaces the dirty set with the tiles that have actually changed
+        :returns: a list of (row, col, old, new) tuples, one for each changed tile, with the coordinates of its top left
+        cell and its boolean state before and after the generation
+        """
+
+        candidates = set()
+
+        for tile_row, tile_col in self._dirty:  # A change can only affect the cells of the same or an adjacent tile
+            for near_row in range(max(tile_row - 1, 0), min(tile_row + 2, self._tile_rows)):
+                for near_col in range(max(tile_col - 1, 0), min(tile_col + 2, self._tile_cols)):
+                    candidates.add((near_row, near_col))
+
+        changes = []  # Keep the changes, apply them at the end
+
+        for tile_row, tile_col in candidates:
+            row, col = tile_row * TILE, tile_col * TILE
+            block = self._padded[row:row + TILE + 2, col:col + TILE + 2]  # Tile and its halo, clipped at the border
+            counts = neighbor_sum(block)
+            old = block[1:-1, 1:-1].astype(bool)
+            new = self._rule.apply(old, counts)
+
+            if (new != old).any():
+                changes.append((row, col, old, new))
+
+        self._generation += 1
+        self._dirty = set()
+
+        for row, col, old, new in changes:
+            height, width = new.shape
+            self._alive[row:row + height, col:col + width] = new
+            self._born[row:row + height, col:col + width][new & ~old] = self._generation
+            self._dirty.add((row // TILE, col // TILE))
+
+        return changes
+
+    @staticmethod
+    def _sorted(coords):
+        """
+        Sorts a list of coordinates by row and then by column, as they would be found scanning the board
+        :param coords: (n, 2) array of coordinates
+        :returns: the sorted array
+        """
+
+        return coords[np.lexsort((coords[:, 1], coords[:, 0]))]
@@ -0,0 +1,270 @@
+import multiprocessing
+import os
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from gamecore.dense import neighbor_sum
+from gamecore.engine import Engine, MAX_TIME
+from gamecore.rules import get_rule
+
+
+def _views(blocks, rows, cols):
+    """
+    Wraps the shared memory of a parallel engine in arrays, which are only valid as long as the blocks are open
+    :param blocks: shared memory blocks of the two boards and of the alive time
+    :param rows: number of rows of the board
+    :param cols: number of columns of the board
+    :returns: the two padded boards and the alive time array
+    """
+
+    boards = [np.ndarray((rows + 2, cols + 2), dtype=np.uint8, buffer=block.buf) for block in blocks[:2]]
+    ages = np.ndarray((rows, cols), dtype=np.uint16, buffer=blocks[2].buf)
+    return boards, ages
+
+
+def _work(names, rows, cols, start, stop, barrier, connection):
+    """
+    Main loop of a worker process, which owns the rows from start to stop of the board. For each generation it reads
+    its stripe and the row above and below it (the halo, written by the neighboring workers in the previous generation)
+    from the current board and writes its stripe into the other one, then waits for all the workers to be done
+    :param names: names of the shared memory blocks of the two boards and of the alive time
+    :param rows: number of rows of the board
+    :param cols: number of columns of the board
+    :param start: first row of the stripe
+    :param stop: row after the last one of the stripe
+    :param barrier: barrier shared by all the workers, crossed at the end of each generation
+    :param connection: end of the pipe used to receive the commands from the engine
+    """
+
+    blocks = [SharedMemory(name=name) for name in names]
+    boards, ages = _views(blocks, rows, cols)
+    stripe_ages = ages[start:stop]
+    counts = np.zeros((stop - start, cols), dtype=np.uint8)
+
+    while True:
+        command = connection.recv()
+
+        if command is None:  # The engine is being closed
+            break
+
+        current, generations, rulestring = command
+        rule = get_rule(rulestring)  # Compiled only the first time it is received
+
+        for _ in range(generations):
+            source, target = boards[current], boards[1 - current]
+            neighbor_sum(source[start:stop + 2], out=counts)  # Stripe and halo, in padded coordinates
+            alive = source[start + 1:stop + 1, 1:-1].astype(bool)
+            new_alive = rule.apply(alive, counts)
+            survived = new_alive & alive
+            np.add(stripe_ages, 1, out=stripe_ages, where=survived & (stripe_ages < MAX_TIME))
+            stripe_ages[~survived] = 0
+            target[start + 1:stop + 1, 1:-1] = new_alive
+            current = 1 - current
+            barrier.wait()
+
+        connection.send(True)
+
+    del boards, ages, stripe_ages  # The views must be released before closing the blocks
+    for block in blocks:
+        block.close()
+
+
+def _shutdown(processes, connections, blocks):
+    """
+    Stops the worker processes and releases the shared memory, called when the engine is closed or garbage collected
+    """
+
+    for connection in connections:
+        try:
+            connection.send(None)
+        except OSError:  # The worker has already terminated
+            pass
+
+    for process in processes:
+        process.join()
+
+    for block in blocks:
+        block.unlink()  # The memory is freed once the last view onto it is released
+
+        try:
+            block.close()
+        except BufferError:  # Arrays of the engine still refer to the block, which is closed when they are collected
+            pass
+
+
+class ParallelEngine(Engine):
+    """
+    Class that represents a multi-core stepping engine, which splits the board into horizontal stripes stepped by a pool
+    of worker processes. The two boards (current and next generation) and the alive time live in shared memory, so the
+    workers exchange the halo rows of their stripes simply by reading them after crossing a barrier at the end of each
+    generation. Each stripe is computed with the same operations of DenseEngine, so the results are identical
+    """
+
+    def __init__(self, rows, cols, rule=None, workers=None):
+        """
+        Constructor of the class that allocates the shared memory and starts the worker processes
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param rule: Rule or rulestring used to compute the generations, the rules of the Game of Life by default
+        :param workers: number of worker processes, by default one for each core (but never more than the rows)
+        """
+
+        super().__init__(rows, cols, rule)
+        workers = max(1, min(workers or os.cpu_count() or 1, rows))
+        sizes = ((rows + 2) * (cols + 2), (rows + 2) * (cols + 2), 2 * rows * cols)
+        self._blocks = [SharedMemory(create=True, size=max(size, 1)) for size in sizes]
+        names = [block.name for block in self._blocks]
+        self._boards, self._ages = _views(self._blocks, rows, cols)
+
+        for board in self._boards:
+            board.fill(0)
+        self._ages.fill(0)
+
+        self._current = 0  # Index of the board holding the current generation
+
+        # Spawned processes do not inherit the threads of the GUI, which makes them safe to start from it
+        context = multiprocessing.get_context('spawn')
+        self._barrier = context.Barrier(workers)  # Kept alive as long as the workers may still be unpickling it
+        bounds = np.linspace(0, rows, workers + 1).astype(int)
+        self._connections = []
+        self._processes = []
+
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=_work, daemon=True,
+                                      args=(names, rows, cols, start, stop, self._barrier, worker_connection))
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        self._finalizer = weakref.finalize(self, _shutdown, self._processes, self._connections, self._blocks)
+
+    def get_workers(self):
+        """
+        Getter of the number of worker processes
+        :returns: the number of stripes the board is split into
+        """
+
+        return len(self._processes)
+
+    def close(self):
+        """
+        Stops the worker processes and releases the shared memory, after which the engine can no longer be used
+        """
+
+        self._finalizer()
+
+    def get_alive(self):
+        """
+        Getter of the alive state of the board, the array is a view onto the shared memory so it must be treated as read
+        only and it is no longer valid after the next generation
+        :returns: a rows x cols uint8 array containing 1 for alive cells and 0 for dead ones
+        """
+
+        return self._boards[self._current][1:-1, 1:-1]
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the board, the array is a view onto the shared memory so it must be treated as read
+        only
+        :returns: a rows x cols uint16 array containing the alive time of every cell
+        """
+
+        return self._ages
+
+    def get_value(self, row, col):
+        """
+        Getter of the value of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the value of the cell (1 or 0)
+        """
+
+        return int(self._boards[self._current][row + 1, col + 1])
+
+    def set_value(self, row, col, value):
+        """
+        Sets the value of a single cell, resetting its alive time if the cell dies
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new value of the cell (1 or 0)
+        """
+
+        self._boards[self._current][row + 1, col + 1] = value
+
+        if value == 0:
+            self._ages[row, col] = 0
+
+    def get_time(self, row, col):
+        """
+        Getter of the alive time of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the alive time of the cell
+        """
+
+        return int(self._ages[row, col])
+
+    def set_time(self, row, col, value):
+        """
+        Sets the alive time of a single cell
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new alive time of the cell
+        """
+
+        self._ages[row, col] = min(value, MAX_TIME)
+
+    def clear(self):
+        """
+        Resets the whole board to its initial empty state
+        """
+
+        self._boards[self._current].fill(0)
+        self._ages.fill(0)
+
+    def step(self):
+        """
+        Computes the next generation given the rule of the engine: born cells start with an alive time of 0,
+        surviving cells increase it by 1 and dead cells reset it
+        :returns: a dictionary with the 'birth' and 'death' keys, each containing an (n, 2) array with the coordinates
+        of the cells in that category, the surviving cells being every other alive cell
+        """
+
+        old = self.get_alive().astype(bool)  # The other board is overwritten by the workers, so it must be copied
+        self.run(1)
+        new = self.get_alive().astype(bool)
+
+        return {'birth': np.argwhere(new & ~old), 'death': np.argwhere(old & ~new)}
+
+    def run(self, generations):
+        """
+        Advances the board by a number of generations without reporting the changes, letting the workers step their
+        stripes for all of them before waiting for the result
+        :param generations: number of generations to compute
+        """
+
+        if generations <= 0:
+            return
+
+        for connection in self._connections:
+            connection.send((self._current, generations, str(self._rule)))
+
+        for connection in self._connections:
+            connection.recv()
+
+        self._current = (self._current + generations) % 2
+        self._generation += generations
+
+    def _load(self, alive, ages):
+        """
+        Replaces the state of the board, called by load once the arrays have been normalized
+        :param alive: rows x cols boolean array of the alive cells
+        :param ages: rows x cols uint16 array of the alive time of the cells
+        """
+
+        self._boards[self._current][1:-1, 1:-1] = alive
+        self._ages[...] = ages
+        self._ages[~alive] = 0
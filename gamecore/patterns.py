@@ -0,0 +1,138 @@
+import json
+import os
+
+import numpy as np
+
+from gamecore.boardfile import BOARD_EXTENSION, read_board, write_board
+from gamecore.formats import Pattern, read_life106, read_plaintext, read_rle, write_life106, write_plaintext, \
+    write_rle
+from gamecore.rules import CONWAY
+
+PATTERNS_DIR = 'patterns'  # Known patterns shipped with the game, relative to the directory it is run from
+PATTERN_FORMATS = ('.rle', '.cells', '.txt', '.lif', '.life', '.json', BOARD_EXTENSION)  # Read by load_pattern
+
+
+def load_patterns(path=PATTERNS_DIR):
+    """
+    Loads the known patterns, stored one per file in a directory (or in the old patterns file, a JSON file mapping the
+    name of each pattern to its state)
+    :param path: path of the directory or of the JSON file
+    :returns: a dictionary mapping the name of each pattern to its Pattern, sorted by name
+    """
+
+    if not os.path.isdir(path):
+        with open(path) as patterns_file:
+            return {name: Pattern.from_state(state, name) for name, state in sorted(json.load(patterns_file).items())}
+
+    patterns = [load_pattern(os.path.join(path, file_name)) for file_name in os.listdir(path)
+                if os.path.splitext(file_name)[1].lower() in PATTERN_FORMATS]
+    return {pattern.get_name(): pattern for pattern in sorted(patterns, key=Pattern.get_name)}
+
+
+def load_pattern(path):
+    """
+    Loads a pattern in one of the supported formats, chosen by the extension of the file: RLE (.rle), plaintext
+    (.cells or .txt), Life 1.06 (.lif or .life), a board file (.gol) or a state saved by the game (.json)
+    :param path: path of the file
+    :returns: a Pattern (a SavedBoard for the board files), named after the file if the file does not name it
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.rle':
+        with open(path, 'rb') as pattern_file:
+            pattern = read_rle(pattern_file)
+    elif extension in ('.cells', '.txt'):
+        with open(path) as pattern_file:
+            pattern = read_plaintext(pattern_file)
+    elif extension in ('.lif', '.life'):
+        with open(path) as pattern_file:
+            pattern = read_life106(pattern_file)
+    elif extension == '.json':
+        pattern = Pattern.from_state(load_state(path))
+    elif extension == BOARD_EXTENSION:
+        pattern = read_board(path)
+    else:
+        raise ValueError("Unknown pattern format: " + path)
+
+    if pattern.get_name() is None:
+        pattern.set_name(os.path.splitext(os.path.basename(path))[0])
+
+    return pattern
+
+
+def save_pattern(path, pattern):
+    """
+    Saves a pattern in one of the supported formats, chosen by the extension of the file as done by load_pattern
+    :param path: path of the file
+    :param pattern: Pattern to save
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    writers = {'.rle': write_rle, '.cells': write_plaintext, '.txt': write_plaintext, '.lif': write_life106,
+               '.life': write_life106}
+
+    if extension == '.json':
+        save_state(path, arrays_to_state(*pattern.to_arrays(*pattern.get_dimensions(), offset=(0, 0))))
+    elif extension == BOARD_EXTENSION:
+        write_board(path, *pattern.to_arrays(*pattern.get_dimensions(), offset=(0, 0)), pattern.get_generation() or 0,
+                    pattern.get_rule() or CONWAY)
+    elif extension in writers:
+        with open(path, 'w') as pattern_file:
+            writers[extension](pattern_file, pattern)
+    else:
+        raise ValueError("Unknown pattern format: " + path)
+
+
+def load_state(path):
+    """
+    Loads a state saved by the game
+    :param path: path of the JSON file containing the state
+    :returns: the state, a list of rows, each a list of [value, time] pairs
+    """
+
+    with open(path) as state_file:
+        return json.load(state_file)
+
+
+def save_state(path, state):
+    """
+    Saves a state in the format read by load_state
+    :param path: path of the file to write
+    :param state: list of rows, each a list of [value, time] pairs
+    """
+
+    with open(path, 'w') as state_file:
+        json.dump(state, state_file)
+
+
+def state_to_arrays(state, rows, cols):
+    """
+    Converts a state into the arrays of a board, cropping it or filling it with dead cells to fit the board
+    :param state: list of rows, each a list of [value, time] pairs
+    :param rows: number of rows of the board
+    :param cols: number of columns of the board
+    :returns: a rows x cols boolean array of the alive cells and a rows x cols int64 array of their alive time
+    """
+
+    alive = np.zeros((rows, cols), dtype=bool)
+    ages = np.zeros((rows, cols), dtype=np.int64)
+
+    if len(state) > 0:
+        cells = np.asarray(state, dtype=np.int64)[:rows, :cols]  # Shape (rows, cols, 2)
+        alive[:cells.shape[0], :cells.shape[1]] = cells[:, :, 0] == 1
+        ages[:cells.shape[0], :cells.shape[1]] = cells[:, :, 1]
+        ages[~alive] = 0
+
+    return alive, ages
+
+
+def arrays_to_state(alive, ages):
+    """
+    Converts the arrays of a board into a state
+    :param alive: rows x cols array with 1 (or True) for alive cells
+    :param ages: rows x cols array with the alive time of the cells
+    :returns: a list of rows, each a list of [value, time] pairs
+    """
+
+    return np.stack((np.asarray(alive, dtype=np.int64), np.asarray(ages, dtype=np.int64)), axis=2).tolist()
@@ -0,0 +1,123 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+NEIGHBORHOOD = 8  # Number of neighbors of a cell, so the counts go from 0 to 8
+
+
+class Rule:
+    """
+    Class that represents a Life-like rule, compiled into a transition lookup table indexed by the state of a cell and
+    its number of alive neighbors. Rules are immutable and should be obtained through get_rule, which compiles each
+    rulestring only once
+    """
+
+    def __init__(self, birth, survival):
+        """
+        Constructor of the class that compiles the transition table
+        :param birth: numbers of neighbors that make a dead cell come to life
+        :param survival: numbers of neighbors that keep an alive cell alive
+        """
+
+        self._birth = frozenset(birth)
+        self._survival = frozenset(survival)
+        self._table = np.zeros((2, NEIGHBORHOOD + 1), dtype=np.uint8)  # Next state, indexed by [state, neighbors]
+        self._table[0, sorted(self._birth)] = 1
+        self._table[1, sorted(self._survival)] = 1
+        self._table.setflags(write=False)
+        self._flat = self._table.ravel()  # Indexed by state * 9 + neighbors, used by apply
+
+    def __str__(self):
+        """
+        Canonical rulestring of the rule, in the B/S notation
+        """
+
+        return 'B' + ''.join(map(str, sorted(self._birth))) + '/S' + ''.join(map(str, sorted(self._survival)))
+
+    def __repr__(self):
+        return "Rule('" + str(self) + "')"
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and (self._birth, self._survival) == (other._birth, other._survival)
+
+    def __hash__(self):
+        return hash((self._birth, self._survival))
+
+    def get_birth(self):
+        """
+        Getter of the numbers of neighbors that make a dead cell come to life
+        :returns: a frozenset of integers from 0 to 8
+        """
+
+        return self._birth
+
+    def get_survival(self):
+        """
+        Getter of the numbers of neighbors that keep an alive cell alive
+        :returns: a frozenset of integers from 0 to 8
+        """
+
+        return self._survival
+
+    def get_table(self):
+        """
+        Getter of the read only transition table of the rule
+        :returns: a 2 x 9 uint8 array containing the next state of a cell, indexed by its state and alive neighbors
+        """
+
+        return self._table
+
+    def apply(self, alive, counts):
+        """
+        Computes the next state of a block of cells with a single lookup in the transition table
+        :param alive: uint8 (or boolean) array with the current state of the cells
+        :param counts: uint8 array, with the same shape, containing the number of alive neighbors of each cell
+        :returns: a boolean array with the state of the cells in the next generation
+        """
+
+        index = counts + (NEIGHBORHOOD + 1) * alive.astype(np.uint8)
+        return np.take(self._flat, index).view(bool)
+
+
+@lru_cache(maxsize=None)
+def _compile(rulestring):
+    """
+    Parses a rulestring into a Rule, called only once for each distinct rulestring
+    :param rulestring: rule in the B/S notation (such as B3/S23) or in the S/B notation (such as 23/3)
+    :returns: the compiled Rule
+    """
+
+    text = rulestring.strip().upper()
+    match = re.fullmatch(r'B([0-8]*)/?S([0-8]*)', text) or re.fullmatch(r'S([0-8]*)/?B([0-8]*)', text)
+
+    if match is not None:
+        birth, survival = match.groups() if text.startswith('B') else reversed(match.groups())
+    else:
+        match = re.fullmatch(r'([0-8]*)/([0-8]*)', text)
+
+        if match is None:
+            raise ValueError("Invalid rulestring: " + rulestring)
+
+        survival, birth = match.groups()
+
+    return Rule((int(count) for count in birth), (int(count) for count in survival))
+
+
+def get_rule(rule):
+    """
+    Retrieves the compiled version of a rule
+    :param rule: a Rule, a rulestring (such as B3/S23, B36/S23 or 23/3) or None for the rules of the Game of Life
+    :returns: the compiled Rule
+    """
+
+    if rule is None:
+        return CONWAY
+
+    if isinstance(rule, Rule):
+        return rule
+
+    return _compile(rule)
+
+
+CONWAY = _compile('B3/S23')
@@ -0,0 +1,75 @@
+from time import perf_counter
+
+
+class FrameScheduler:
+    """
+    Class that paces a loop at a target frame rate using absolute deadlines: the frames are due at fixed intervals from
+    the start, so the time spent computing a frame is taken out of the wait instead of being added to it. A frame that
+    ends less than an interval late is caught up by the next ones, while the deadlines missed by a longer delay are
+    skipped (and reported as dropped) rather than rushed through. The waits are done on a condition, so that the loop
+    can be interrupted at any moment instead of sleeping until the deadline. A target of 0 frames per second runs the
+    loop as fast as possible, without waiting at all
+    """
+
+    def __init__(self, fps=30):
+        """
+        Constructor of the class
+        :param fps: target number of frames per second, 0 for no limit
+        """
+
+        self._interval = 1 / fps if fps else 0
+        self._deadline = None  # Time at which the current frame is due, set by start
+
+    def get_interval(self):
+        """
+        Getter of the target duration of a frame
+        :returns: the interval between two deadlines, in seconds, 0 if the frame rate is not limited
+        """
+
+        return self._interval
+
+    def set_fps(self, fps):
+        """
+        Setter of the target frame rate. When the rate changes the deadlines are anchored again to the current time, so
+        that the next frame is due an interval from now: the old deadline belongs to the old rate (and it is left far
+        behind while the loop runs without a limit), so keeping it would report the time in between as dropped frames
+        :param fps: target number of frames per second, 0 for no limit
+        """
+
+        interval = 1 / fps if fps else 0
+
+        if interval != self._interval and self._deadline is not None:
+            self._deadline = perf_counter() + interval
+
+        self._interval = interval
+
+    def start(self):
+        """
+        Anchors the deadlines to the current time, to be called when the loop starts or resumes
+        """
+
+        self._deadline = perf_counter() + self._interval
+
+    def wait(self, condition, interrupted):
+        """
+        Waits for the deadline of the current frame, unless it has already passed, and moves to the next one
+        :param condition: threading.Condition notified whenever the result of interrupted may have changed
+        :param interrupted: function without arguments returning True when the wait must end early
+        :returns: the number of deadlines missed (and skipped) since the previous frame
+        """
+
+        if not self._interval:  # Uncapped, every frame is due as soon as the previous one ends
+            return 0
+
+        now = perf_counter()
+        dropped = 0
+
+        if now < self._deadline:
+            with condition:
+                condition.wait_for(interrupted, self._deadline - now)
+        else:
+            dropped = int((now - self._deadline) / self._interval)  # Whole intervals missed
+            self._deadline += dropped * self._interval
+
+        self._deadline += self._interval
+        return dropped
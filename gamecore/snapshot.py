@@ -0,0 +1,163 @@
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class Snapshot:
+    """
+    Class that represents a copy of a board taken at a given generation, which is read only for everyone but the
+    SnapshotBuffer that owns it
+    """
+
+    def __init__(self, rows, cols):
+        """
+        Constructor of the class that allocates an empty snapshot
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        """
+
+        self._alive = np.zeros((rows, cols), dtype=np.uint8)
+        self._ages = np.zeros((rows, cols), dtype=np.uint16)
+        self._alive_view = self._alive.view()  # Read only views, the only ones handed out
+        self._alive_view.setflags(write=False)
+        self._ages_view = self._ages.view()
+        self._ages_view.setflags(write=False)
+        self._generation = 0
+        self._sequence = 0
+        self._pinned = False  # True while the snapshot is used outside of the buffer, which then stops reusing it
+
+    def get_alive(self):
+        """
+        Getter of the alive state of the board
+        :returns: a read only rows x cols uint8 array containing 1 for alive cells and 0 for dead ones
+        """
+
+        return self._alive_view
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the board
+        :returns: a read only rows x cols uint16 array containing the alive time of every cell
+        """
+
+        return self._ages_view
+
+    def get_generation(self):
+        """
+        Getter of the generation of the board
+        :returns: the generation in which the snapshot was taken
+        """
+
+        return self._generation
+
+    def get_sequence(self):
+        """
+        Getter of the number of snapshots published before this one, which tells apart two snapshots even when they
+        have the same generation (such as before and after an edit)
+        :returns: the sequence number of the snapshot
+        """
+
+        return self._sequence
+
+    def is_pinned(self):
+        """
+        Tells whether the snapshot is being used outside of the buffer
+        :returns: True if the snapshot must not be overwritten
+        """
+
+        return self._pinned
+
+    def _write(self, alive, ages, generation, sequence):
+        """
+        Overwrites the snapshot, only called by SnapshotBuffer on the snapshot that is not being shown
+        """
+
+        np.copyto(self._alive, alive, casting='unsafe')
+        np.copyto(self._ages, ages, casting='unsafe')
+        self._generation = generation
+        self._sequence = sequence
+
+
+class SnapshotBuffer:
+    """
+    Class that hands the boards computed by the simulation over to the display with two snapshots (double buffering):
+    the simulation writes the next board into the back snapshot and then swaps it with the front one, which is the one
+    read by the display. The swap waits for the display to be done reading, so a snapshot never changes while it is
+    being read, while the simulation never waits for the display to catch up: the boards published in between two reads
+    are simply never shown. A snapshot can also be pinned, to be kept for as long as needed (for example while it is
+    written to a file): it is copied on write, the buffer replacing it with a new snapshot instead of overwriting it
+    """
+
+    def __init__(self, rows, cols):
+        """
+        Constructor of the class that allocates the two snapshots
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        """
+
+        self._rows = rows
+        self._cols = cols
+        self._snapshots = [Snapshot(rows, cols), Snapshot(rows, cols)]
+        self._front = 0
+        self._sequence = 0
+        self._swap_lock = threading.Lock()  # Held while the front snapshot is read or swapped
+        self._write_lock = threading.Lock()  # Held while the back snapshot is written, in case two threads publish
+
+    def publish(self, alive, ages, generation):
+        """
+        Copies a board into the back snapshot and makes it the front one
+        :param alive: rows x cols array with 1 (or True) for alive cells
+        :param ages: rows x cols array with the alive time of the cells
+        :param generation: generation of the board
+        """
+
+        with self._write_lock:
+            self._sequence += 1
+
+            if self._snapshots[1 - self._front].is_pinned():  # Copy on write, the pinned snapshot leaves the buffer
+                self._snapshots[1 - self._front] = Snapshot(self._rows, self._cols)
+
+            self._snapshots[1 - self._front]._write(alive, ages, generation, self._sequence)
+
+            with self._swap_lock:
+                self._front = 1 - self._front
+
+    @contextmanager
+    def read(self):
+        """
+        Gives access to the latest published snapshot, which does not change until the end of the with block, so the
+        block should only copy from it what it needs
+        :returns: a context manager yielding the front Snapshot
+        """
+
+        with self._swap_lock:
+            yield self._snapshots[self._front]
+
+    def pin(self):
+        """
+        Takes the latest published snapshot without copying it: it is not overwritten until it is released
+        :returns: the front Snapshot, pinned
+        """
+
+        with self._write_lock, self._swap_lock:
+            snapshot = self._snapshots[self._front]
+            snapshot._pinned = True
+            return snapshot
+
+    def release(self, snapshot):
+        """
+        Gives back a pinned snapshot, which the buffer can reuse if it still holds it
+        :param snapshot: Snapshot returned by pin
+        """
+
+        with self._write_lock:
+            snapshot._pinned = False
+
+    def get_sequence(self):
+        """
+        Getter of the sequence number of the latest published snapshot, which can be read without waiting
+        :returns: the number of snapshots published so far
+        """
+
+        return self._sequence
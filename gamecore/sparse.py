@@ -0,0 +1,358 @@
+import numpy as np
+
+from gamecore.engine import Engine, MAX_TIME
+
+BIAS = 1 << 30  # Offset added to the coordinates so that they are always positive, cells must stay within +-2^30
+COL_BITS = 32
+COL_MASK = (1 << COL_BITS) - 1
+# Differences between the key of a cell and the keys of its eight neighbors
+NEIGHBOR_OFFSETS = np.array([(row << COL_BITS) + col for row in (-1, 0, 1) for col in (-1, 0, 1) if row or col],
+                            dtype=np.int64)
+
+
+def encode(rows, cols):
+    """
+    Encodes coordinates of the plane into sortable keys
+    :param rows: integer or array of rows
+    :param cols: integer or array of columns, with the same shape as rows
+    :returns: the int64 keys of the cells
+    """
+
+    return ((np.asarray(rows, dtype=np.int64) + BIAS) << COL_BITS) + (np.asarray(cols, dtype=np.int64) + BIAS)
+
+
+def decode(keys):
+    """
+    Decodes keys into coordinates of the plane
+    :param keys: array of int64 keys
+    :returns: the arrays of rows and columns of the cells
+    """
+
+    return (keys >> COL_BITS) - BIAS, (keys & COL_MASK) - BIAS
+
+
+class SparseEngine(Engine):
+    """
+    Class that represents a sparse stepping engine on the unbounded plane, storing only the sorted keys of the alive
+    cells and the generation in which each of them was born, so that its memory grows with the population and not with
+    the area. Births are found by counting how many times each candidate cell appears among the neighbors of the alive
+    cells. The board seen by the state grid is a rows x cols viewport onto the plane, which can be moved freely
+    """
+
+    def __init__(self, rows, cols, rule=None):
+        """
+        Constructor of the class that creates an empty plane with the viewport at its origin
+        :param rows: number of rows of the viewport
+        :param cols: number of columns of the viewport
+        :param rule: Rule or rulestring used to compute the generations, the rules of the Game of Life by default
+        """
+
+        super().__init__(rows, cols, rule)
+        self._keys = np.empty(0, dtype=np.int64)  # Sorted keys of the alive cells
+        self._born = np.empty(0, dtype=np.int64)  # Generation in which each alive cell was born
+        self._pending = {}  # Alive times set on dead cells (by key), applied when they are toggled alive
+        self._top = 0  # Row and column of the plane shown in the top left cell of the viewport
+        self._left = 0
+
+    @staticmethod
+    def check_rule(rule):
+        """
+        Checks that a rule keeps empty space empty, since a B0 rule would fill the whole unbounded plane
+        :param rule: compiled Rule
+        :raises ValueError: if the rule makes cells without neighbors come to life
+        """
+
+        if 0 in rule.get_birth():
+            raise ValueError("B0 rules are not supported on the unbounded plane")
+
+    def get_viewport(self):
+        """
+        Getter of the position of the viewport
+        :returns: the row and the column of the plane shown in the top left cell of the viewport
+        """
+
+        return self._top, self._left
+
+    def set_viewport(self, top, left):
+        """
+        Moves the viewport onto another region of the plane
+        :param top: row of the plane to show in the top left cell of the viewport
+        :param left: column of the plane to show in the top left cell of the viewport
+        """
+
+        self._top = top
+        self._left = left
+
+    def get_population(self):
+        """
+        Getter of the number of alive cells on the whole plane
+        :returns: the population of the plane
+        """
+
+        return len(self._keys)
+
+    def get_bounding_box(self):
+        """
+        Computes the smallest rectangle of the plane containing all the alive cells
+        :returns: the top, left, bottom and right coordinates (inclusive) of the rectangle, None if the plane is empty
+        """
+
+        if len(self._keys) == 0:
+            return None
+
+        rows, cols = decode(self._keys)
+        return int(rows[0]), int(cols.min()), int(rows[-1]), int(cols.max())  # Keys are sorted by row first
+
+    def follow_population(self):
+        """
+        Moves the viewport back onto the population once every alive cell has left it, as the spaceships do: onto the
+        middle of the population if it fits in the viewport, onto its cell closest to the viewport otherwise
+        :returns: True if the viewport has moved, in which case the whole viewport has changed
+        """
+
+        if len(self._keys) == 0 or len(self._visible()[0]):
+            return False
+
+        top, left, bottom, right = self.get_bounding_box()
+
+        if bottom - top < self._rows and right - left < self._cols:
+            row, col = (top + bottom) // 2, (left + right) // 2
+        else:  # A population spreading further than the viewport, such as the gliders of a gun
+            rows, cols = decode(self._keys)
+            distances = np.abs(rows - (self._top + self._rows // 2)) + np.abs(cols - (self._left + self._cols // 2))
+            nearest = np.argmin(distances)
+            row, col = int(rows[nearest]), int(cols[nearest])
+
+        self.set_viewport(row - self._rows // 2, col - self._cols // 2)
+        return True
+
+    def get_alive(self):
+        """
+        Getter of the alive state of the viewport, copied into a new array
+        :returns: a rows x cols uint8 array containing 1 for alive cells and 0 for dead ones
+        """
+
+        alive = np.zeros((self._rows, self._cols), dtype=np.uint8)
+        rows, cols, _ = self._visible()
+        alive[rows, cols] = 1
+        return alive
+
+    def get_ages(self):
+        """
+        Getter of the alive time of the viewport, copied into a new array
+        :returns: a rows x cols uint16 array containing the alive time of every cell
+        """
+
+        ages = np.zeros((self._rows, self._cols), dtype=np.uint16)
+        rows, cols, born = self._visible()
+        ages[rows, cols] = np.minimum(self._generation - born, MAX_TIME)
+        return ages
+
+    def get_cell_ids(self):
+        """
+        Identifies the alive cells of the whole plane with integers, used to hash the plane when looking for cycles, so
+        that the cells outside of the viewport are also taken into account
+        :returns: a uint64 array with the key of every alive cell
+        """
+
+        return self._keys.view(np.uint64)  # The biased keys are never negative
+
+    def get_changed_ids(self, changes):
+        """
+        Identifies the cells of the whole plane born and dead in a generation with the same integers used by
+        get_cell_ids
+        :param changes: dictionary returned by step
+        :returns: the uint64 arrays of the born cells and of the dead cells
+        """
+
+        return changes['plane_birth'].view(np.uint64), changes['plane_death'].view(np.uint64)
+
+    def get_value(self, row, col):
+        """
+        Getter of the value of a single cell of the viewport
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the value of the cell (1 or 0)
+        """
+
+        return int(self._find(row, col) is not None)
+
+    def set_value(self, row, col, value):
+        """
+        Sets the value of a single cell of the viewport, a newly alive cell starts with an alive time of 0
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new value of the cell (1 or 0)
+        """
+
+        index = self._find(row, col)
+
+        if value and index is None:
+            key = encode(self._top + row, self._left + col)
+            position = np.searchsorted(self._keys, key)
+            self._keys = np.insert(self._keys, position, key)
+            self._born = np.insert(self._born, position, self._generation - self._pending.pop(int(key), 0))
+        elif not value and index is not None:
+            self._keys = np.delete(self._keys, index)
+            self._born = np.delete(self._born, index)
+
+    def get_time(self, row, col):
+        """
+        Getter of the alive time of a single cell of the viewport
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the alive time of the cell
+        """
+
+        index = self._find(row, col)
+
+        if index is None:
+            return self._pending.get(int(encode(self._top + row, self._left + col)), 0)
+
+        return int(min(self._generation - self._born[index], MAX_TIME))
+
+    def set_time(self, row, col, value):
+        """
+        Sets the alive time of a single cell of the viewport, moving back its birth generation (or keeping it aside if
+        the cell is dead)
+        :param row: row of the cell
+        :param col: column of the cell
+        :param value: new alive time of the cell
+        """
+
+        index = self._find(row, col)
+        key = int(encode(self._top + row, self._left + col))
+
+        if index is not None:
+            self._born[index] = self._generation - min(value, MAX_TIME)
+        elif value:
+            self._pending[key] = min(value, MAX_TIME)
+        else:
+            self._pending.pop(key, None)
+
+    def clear(self):
+        """
+        Resets the whole plane to its initial empty state
+        """
+
+        self._keys = np.empty(0, dtype=np.int64)
+        self._born = np.empty(0, dtype=np.int64)
+        self._pending.clear()
+
+    def alive_neighbors(self, row, col):
+        """
+        Counts the alive neighbors of a given cell of the viewport, including the ones outside of it
+        :param row: row of the cell to count the neighbors of
+        :param col: column of the cell to count the neighbors of
+        :returns: an integer representing the number of alive neighbors
+        """
+
+        neighbors = encode(self._top + row, self._left + col) + NEIGHBOR_OFFSETS
+        return int(np.isin(neighbors, self._keys, assume_unique=True).sum())
+
+    def step(self):
+        """
+        Computes the next generation given the rule of the engine: born cells start with an alive time of 0,
+        surviving cells increase it by 1 and dead cells reset it
+        :returns: a dictionary with the 'birth' and 'death' keys, each containing an (n, 2) array with the coordinates
+        of the cells of the viewport in that category, the surviving cells being every other alive cell, and the
+        'plane_birth' and 'plane_death' keys, with the keys of the born and dead cells of the whole plane
+        """
+
+        old_keys = self._keys
+        self._advance()
+        new_keys = self._keys
+        born = new_keys[~np.isin(new_keys, old_keys, assume_unique=True)]
+        died = old_keys[~np.isin(old_keys, new_keys, assume_unique=True)]
+
+        return {'birth': self._viewport_coords(born), 'death': self._viewport_coords(died), 'plane_birth': born,
+                'plane_death': died}
+
+    def run(self, generations):
+        """
+        Advances the plane by a number of generations without reporting the changes, used when only the final state is
+        needed
+        :param generations: number of generations to compute
+        """
+
+        for _ in range(generations):
+            self._advance()
+
+    def skip(self, generations, period):
+        """
+        Advances the plane by a whole number of cycles without computing them, moving back the birth generation of the
+        cells alive for a whole cycle
+        :param generations: number of generations to skip, a multiple of the period
+        :param period: period of the whole plane, which the cycles are looked for on
+        """
+
+        self._born[self._generation - self._born >= period] -= generations
+        self._generation += generations
+
+    def _advance(self):
+        """
+        Computes the next generation: every alive cell adds one to the count of each of its neighbors, so only the
+        cells near the population are ever considered
+        """
+
+        candidates, counts = np.unique((self._keys[:, None] + NEIGHBOR_OFFSETS).ravel(), return_counts=True)
+        index = np.minimum(np.searchsorted(self._keys, candidates), max(len(self._keys) - 1, 0))
+        alive = (self._keys[index] == candidates) if len(self._keys) else np.zeros(len(candidates), dtype=bool)
+        new_alive = self._rule.apply(alive, counts.astype(np.uint8))
+
+        self._generation += 1
+        born = np.full(len(candidates), self._generation, dtype=np.int64)  # Newborn cells are born now...
+        born[alive] = self._born[index[alive]]  # ...while the others keep their birth generation
+        self._keys = candidates[new_alive]
+        self._born = born[new_alive]
+
+    def _load(self, alive, ages):
+        """
+        Replaces the whole plane with the given state, placed in the viewport
+        :param alive: rows x cols boolean array of the alive cells
+        :param ages: rows x cols uint16 array of the alive time of the cells
+        """
+
+        rows, cols = np.nonzero(alive)  # Row-major order, so the keys are already sorted
+        self._keys = encode(rows + self._top, cols + self._left)
+        self._born = self._generation - ages[rows, cols].astype(np.int64)
+        self._pending.clear()
+
+    def _find(self, row, col):
+        """
+        Looks for a cell of the viewport among the alive cells
+        :param row: row of the cell
+        :param col: column of the cell
+        :returns: the index of the cell in the keys, or None if the cell is dead
+        """
+
+        key = encode(self._top + row, self._left + col)
+        index = np.searchsorted(self._keys, key)
+
+        if index < len(self._keys) and self._keys[index] == key:
+            return int(index)
+
+        return None
+
+    def _visible(self):
+        """
+        Selects the alive cells inside the viewport
+        :returns: the arrays of rows and columns (relative to the viewport) and of birth generations of the cells
+        """
+
+        start, stop = np.searchsorted(self._keys, encode([self._top, self._top + self._rows], [self._left, self._left]))
+        rows, cols = decode(self._keys[start:stop])  # Only the rows of the viewport, then filtered by column
+        inside = (cols >= self._left) & (cols < self._left + self._cols)
+        return rows[inside] - self._top, cols[inside] - self._left, self._born[start:stop][inside]
+
+    def _viewport_coords(self, keys):
+        """
+        Converts sorted keys into coordinates of the viewport, discarding the cells outside of it
+        :param keys: sorted array of keys
+        :returns: an (n, 2) array with the row and column of each visible cell
+        """
+
+        rows, cols = decode(keys)
+        rows, cols = rows - self._top, cols - self._left
+        inside = (rows >= 0) & (rows < self._rows) & (cols >= 0) & (cols < self._cols)
+        return np.stack((rows[inside], cols[inside]), axis=1)
@@ -0,0 +1,318 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+from gamecore.diff import GenerationDiff
+
+AGE_EDGES = 1 << np.arange(16)  # First alive time of every age bin but the first: 1, 2, 4, ..., 32768
+AGE_BINS = len(AGE_EDGES) + 1  # Bin k holds the alive times with k binary digits, the last one up to MAX_TIME
+SERIES_LENGTH = 512  # Recent populations kept for the live chart
+EPOCH = 1 << 15  # Generations between two full counts, which keep the birth generations within 16 bits
+
+
+def age_bin(ages):
+    """
+    Finds the bin of the age histogram of some alive times
+    :param ages: alive time, or array of alive times
+    :returns: the index of the bin, or an array of indices
+    """
+
+    return np.searchsorted(AGE_EDGES, ages, side='right')
+
+
+class Statistics:
+    """
+    Class that keeps the statistics of a board up to date from its changes alone: the population, the births and deaths
+    of the last change, the bounding box of the alive cells and the histogram of their alive time, in bins doubling in
+    width. The births and deaths reported by each generation are enough to update them, so the board is never scanned
+    again but when it is replaced as a whole: the alive cells are counted per row and per column, and grouped by the
+    generation they were born in, since the cells born together age together and move to the next bin of the histogram
+    at the same generation.
+    The birth generation of every cell is kept in 16 bits, relative to the last full count. The board is counted again
+    every EPOCH generations, so that the cells alive since then are told apart from the ones born later: the cells
+    already EPOCH generations old at a count are all in the last bin, and they are grouped together
+    """
+
+    def __init__(self, rows, cols, series_length=SERIES_LENGTH):
+        """
+        Constructor of the class, with the statistics of an empty board
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param series_length: number of recent populations kept for the charts
+        """
+
+        self._rows = rows
+        self._cols = cols
+        self._generation = 0
+        self._now = 0  # Generations since the last full count, which the birth generations are relative to
+        self._births = np.zeros((rows, cols), dtype=np.uint16)  # Birth generation of every alive cell, relative and
+        # wrapping around
+        self._cohorts = {}  # Number of alive cells by relative birth generation
+        self._histogram = np.zeros(AGE_BINS, dtype=np.int64)
+        self._row_counts = np.zeros(rows, dtype=np.int64)  # Alive cells of every row, for the bounding box
+        self._col_counts = np.zeros(cols, dtype=np.int64)  # Alive cells of every column
+        self._population = 0
+        self._born = 0  # Cells born in the last change
+        self._died = 0  # Cells dead in the last change
+        self._series = deque(maxlen=series_length)  # (generation, population) of the recent changes
+        self._lock = threading.Lock()  # The series is extended by the game loop and read by the GUI thread
+        self._observers = []
+
+    def observe(self, callback):
+        """
+        Method used to implement the observable behaviour, calling a function after every change of the statistics
+        :param callback: function receiving the dictionary returned by get_sample, called by the thread changing the
+        board
+        """
+
+        self._observers.append(callback)
+
+    def unobserve(self, callback):
+        """
+        Stops calling a function connected through observe
+        :param callback: function to disconnect
+        """
+
+        self._observers.remove(callback)
+
+    def get_generation(self):
+        """
+        Getter of the generation of the board the statistics refer to
+        :returns: the generation number
+        """
+
+        return self._generation
+
+    def get_population(self):
+        """
+        Getter of the number of alive cells
+        :returns: the population of the board
+        """
+
+        return self._population
+
+    def get_births(self):
+        """
+        Getter of the number of cells born in the last change, 0 if the board has been replaced as a whole
+        :returns: the number of births
+        """
+
+        return self._born
+
+    def get_deaths(self):
+        """
+        Getter of the number of cells dead in the last change, 0 if the board has been replaced as a whole
+        :returns: the number of deaths
+        """
+
+        return self._died
+
+    def get_bounding_box(self):
+        """
+        Computes the smallest rectangle holding every alive cell from the counts of the rows and columns
+        :returns: the top row, left column, bottom row and right column (all included) of the rectangle, None if the
+        board is empty
+        """
+
+        rows = np.flatnonzero(self._row_counts)
+
+        if len(rows) == 0:
+            return None
+
+        cols = np.flatnonzero(self._col_counts)
+        return int(rows[0]), int(cols[0]), int(rows[-1]), int(cols[-1])
+
+    def get_age_histogram(self):
+        """
+        Getter of the histogram of the alive time of the alive cells
+        :returns: a list with AGE_BINS counts, the bin k holding the cells whose alive time has k binary digits (0, 1,
+        2 to 3, 4 to 7 and so on)
+        """
+
+        return self._histogram.tolist()
+
+    def get_sample(self):
+        """
+        Collects all the statistics of the board
+        :returns: a dictionary with the 'generation', 'population', 'births', 'deaths', 'bounding_box' and
+        'age_histogram' of the board
+        """
+
+        return {'generation': self._generation, 'population': self._population, 'births': self._born,
+                'deaths': self._died, 'bounding_box': self.get_bounding_box(),
+                'age_histogram': self.get_age_histogram()}
+
+    def get_series(self):
+        """
+        Getter of the recent populations, safe to call from another thread
+        :returns: a list of (generation, population) tuples, from the oldest to the newest
+        """
+
+        with self._lock:
+            return list(self._series)
+
+    def clear_series(self):
+        """
+        Forgets the recent populations, used when the board is brought back to a past generation
+        """
+
+        with self._lock:
+            self._series.clear()
+
+    def update(self, diff, source):
+        """
+        Updates the statistics with a change of the board. A full change counts the board again, as does a change every
+        EPOCH generations or one that does not match the statistics, while the others only apply their births and
+        deaths: a change to a later generation is a step, in which the surviving cells grow older
+        :param diff: GenerationDiff of the change
+        :param source: engine (or any object with get_alive and get_ages) holding the board after the change, whose
+        arrays are only read if the board must be counted again
+        """
+
+        died = diff.get_died()
+        born = diff.get_born()
+
+        if diff.is_full() or self._now + diff.get_generation() - self._generation >= EPOCH or not self._remove(died):
+            # Also when the change does not match the statistics
+            self.count(source.get_alive(), source.get_ages(), diff.get_generation())
+
+            if not diff.is_full():
+                self._born = len(born)
+                self._died = len(died)
+        else:
+            for _ in range(diff.get_generation() - self._generation):  # A step ages the cells once per generation
+                self._age()
+
+            self._add(born)
+            self._generation = diff.get_generation()
+            self._born = len(born)
+            self._died = len(died)
+            self._row_counts += np.bincount(born[:, 0], minlength=self._rows)
+            self._row_counts -= np.bincount(died[:, 0], minlength=self._rows)
+            self._col_counts += np.bincount(born[:, 1], minlength=self._cols)
+            self._col_counts -= np.bincount(died[:, 1], minlength=self._cols)
+
+        self._changed()
+
+    def count(self, alive, ages, generation):
+        """
+        Computes the statistics of a whole board, which is scanned once
+        :param alive: rows x cols array with 1 for the alive cells
+        :param ages: rows x cols array with the alive time of the cells
+        :param generation: generation of the board
+        """
+
+        alive = np.asarray(alive, dtype=bool)
+        alive_ages = np.asarray(ages)[alive].astype(np.int64)
+        self._generation = generation
+        self._now = 0
+        births = -np.minimum(alive_ages, EPOCH)  # The cells older than EPOCH share the same birth generation
+        self._births[alive] = births & 0xFFFF
+        cohorts, counts = np.unique(births, return_counts=True)
+        self._cohorts = dict(zip(cohorts.tolist(), counts.tolist()))
+        self._histogram = np.bincount(age_bin(alive_ages), minlength=AGE_BINS).astype(np.int64)
+        self._row_counts = alive.sum(axis=1, dtype=np.int64)
+        self._col_counts = alive.sum(axis=0, dtype=np.int64)
+        self._population = len(alive_ages)
+        self._born = 0
+        self._died = 0
+
+    def _remove(self, died):
+        """
+        Takes the dead cells out of their birth generation and of their bin of the histogram, unless they do not match
+        the alive cells of the statistics (such as after a change of the board that has not been reported)
+        :param died: (n, 2) array with the coordinates of the cells that have died
+        :returns: True if the cells have been taken out, False if the board must be counted again
+        """
+
+        if len(died) == 0:
+            return True
+
+        births = self._births[died[:, 0], died[:, 1]].astype(np.int64)
+        counts = np.bincount((self._now - births) & 0xFFFF)  # Dead cells by alive time
+        ages = np.flatnonzero(counts)
+        counts = counts[ages]
+        cohorts = (self._now - ages).tolist()
+
+        if len(died) > self._population or any(self._cohorts.get(cohort, 0) < count
+                                                for cohort, count in zip(cohorts, counts.tolist())):
+            return False
+
+        np.subtract.at(self._histogram, age_bin(ages), counts)
+
+        for cohort, count in zip(cohorts, counts.tolist()):
+            left = self._cohorts[cohort] - count
+
+            if left:
+                self._cohorts[cohort] = left
+            else:
+                del self._cohorts[cohort]
+
+        self._population -= len(died)
+        return True
+
+    def _age(self):
+        """
+        Advances the alive cells by one generation: the cells whose alive time reaches a power of 2 move to the next bin
+        of the histogram, and they are all found in the birth generation that many generations ago
+        """
+
+        self._now += 1
+
+        for index, edge in enumerate(AGE_EDGES.tolist()):
+            count = self._cohorts.get(self._now - edge)
+
+            if count:
+                self._histogram[index] -= count
+                self._histogram[index + 1] += count
+
+    def _add(self, born):
+        """
+        Adds the born cells to the birth generation of the current one and to the first bin of the histogram
+        :param born: (n, 2) array with the coordinates of the cells that have been born
+        """
+
+        if len(born) == 0:
+            return
+
+        self._births[born[:, 0], born[:, 1]] = self._now & 0xFFFF
+        self._cohorts[self._now] = self._cohorts.get(self._now, 0) + len(born)
+        self._histogram[0] += len(born)
+        self._population += len(born)
+
+    def _changed(self):
+        """
+        Adds the population to the series and hands the statistics over to the observers
+        """
+
+        with self._lock:
+            self._series.append((self._generation, self._population))
+
+        if self._observers:
+            sample = self.get_sample()
+
+            for callback in self._observers:
+                callback(sample)
+
+
+def stream_statistics(board, generations=None):
+    """
+    Advances a board one generation at a time, yielding its statistics after each of them, used to monitor long runs
+    without a display
+    :param board: Board to advance
+    :param generations: number of generations to compute, without an end if not given
+    :returns: a generator of the dictionaries returned by Statistics.get_sample, starting from the current board
+    """
+
+    engine = board.get_engine()
+    statistics = Statistics(*board.get_dimensions(), series_length=1)
+    statistics.count(engine.get_alive(), engine.get_ages(), engine.get_generation())
+    yield statistics.get_sample()
+    computed = 0
+
+    while generations is None or computed < generations:
+        changes, _ = board.step()
+        statistics.update(GenerationDiff.from_changes(changes, engine.get_generation()), engine)
+        computed += 1
+        yield statistics.get_sample()
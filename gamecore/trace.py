@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter
+
+PHASES = ('compute', 'publish', 'repaint', 'sleep')  # Parts of a frame measured by the tracer
+MERGE_GAP = 0.001  # Repaint spans closer than this (in seconds) are merged
+
+
+class Tracer:
+    """
+    Class that records where the time of each frame of the game loop goes: the computation of the generation, the
+    publication of the snapshot of the board, the repaint of the grid and the sleep. It also keeps track of the
+    achieved frame rate and of the dropped frames, the deadlines skipped by the scheduler of the loop. The recent
+    frames can be exported as a trace file in the Trace Event Format, which can be opened with chrome://tracing or
+    Perfetto. When the tracer is disabled every method returns immediately, so that it can be left in the hot paths
+    """
+
+    def __init__(self, capacity=10000):
+        """
+        Constructor of the class that creates a disabled tracer
+        :param capacity: number of recent frames kept for the statistics and the trace
+        """
+
+        self._enabled = False
+        self._interval = 1 / 30  # Target duration of a frame, in seconds
+        self._frames = deque(maxlen=capacity)  # (start, end, {phase: [(start, end), ...]}) of the recent frames
+        self._spans = None  # Spans of the frame being recorded
+        self._start = None  # Start of the frame being recorded
+        self._repaint = []  # Spans of repaint recorded by the GUI thread and not yet assigned to a frame
+        self._lock = threading.Lock()  # The repaint spans and the frames are shared by the GUI thread and the game loop
+        self._dropped = 0
+
+    def is_enabled(self):
+        """
+        Getter of the state of the tracer
+        :returns: True if the frames are being recorded, False otherwise
+        """
+
+        return self._enabled
+
+    def set_enabled(self, enabled):
+        """
+        Starts or stops the recording of the frames, forgetting the ones recorded until now when it is started
+        :param enabled: True to start the recording, False to stop it
+        """
+
+        if enabled and not self._enabled:
+            self.clear()
+
+        self._enabled = enabled
+
+    def set_target(self, fps):
+        """
+        Setter of the target frame rate, shown next to the achieved one
+        :param fps: target number of frames per second, 0 for no limit
+        """
+
+        self._interval = 1 / fps if fps else 0
+
+    def clear(self):
+        """
+        Forgets every frame recorded until now
+        """
+
+        self._spans = None
+        self._dropped = 0
+
+        with self._lock:
+            self._frames.clear()
+            self._repaint = []
+
+    def begin_frame(self):
+        """
+        Marks the start of a frame of the game loop
+        """
+
+        if self._enabled:
+            self._start = perf_counter()
+            self._spans = {phase: [] for phase in PHASES}
+
+    def add(self, phase, start, end=None):
+        """
+        Records a span of the frame being recorded, called by the game loop
+        :param phase: one of PHASES
+        :param start: value of perf_counter at the start of the span
+        :param end: value of perf_counter at the end of the span, the current one if not given
+        """
+
+        if self._enabled and self._spans is not None:
+            self._spans[phase].append((start, perf_counter() if end is None else end))
+
+    def add_repaint(self, start, end=None):
+        """
+        Records a repaint span, called by the GUI thread: it is assigned to the frame in which the game loop ends next.
+        A span starting right after the previous one is merged with it, the gap being the dispatch of the next repaint
+        :param start: value of perf_counter at the start of the repaint
+        :param end: value of perf_counter at the end of the repaint, the current one if not given
+        """
+
+        if self._enabled:
+            end = perf_counter() if end is None else end
+
+            with self._lock:
+                if self._repaint and start - self._repaint[-1][1] < MERGE_GAP:
+                    self._repaint[-1] = (self._repaint[-1][0], end)
+                else:
+                    self._repaint.append((start, end))
+
+    def end_frame(self, dropped=0):
+        """
+        Marks the end of a frame of the game loop
+        :param dropped: number of frames dropped because this one was late
+        """
+
+        if not self._enabled or self._spans is None:
+            return
+
+        end = perf_counter()
+
+        with self._lock:
+            self._spans['repaint'], self._repaint = self._repaint, []
+            self._frames.append((self._start, end, self._spans))
+
+        self._dropped += dropped
+        self._spans = None
+
+    def get_stats(self, window=1.0):
+        """
+        Computes the statistics of the frames ended in the last seconds
+        :param window: number of seconds to consider
+        :returns: a dictionary with the achieved and target (0 if not limited) frame rates, the dropped frames since the
+        start of the recording and the average milliseconds spent in each phase by a frame, None if no frame has been
+        recorded
+        """
+
+        with self._lock:  # The game loop keeps adding frames while they are read
+            frames = list(self._frames)
+
+        if not frames:
+            return None
+
+        last = frames[-1][1]
+        recent = [frame for frame in frames if frame[1] >= last - window]
+        elapsed = recent[-1][1] - recent[0][0]
+        stats = {'fps': len(recent) / elapsed if elapsed > 0 else 0.0,
+                 'target_fps': 1 / self._interval if self._interval else 0, 'dropped': self._dropped,
+                 'frames': len(frames)}
+
+        for phase in PHASES:
+            total = sum(end - start for frame in recent for start, end in frame[2][phase])
+            stats[phase + '_ms'] = 1000 * total / len(recent)
+
+        return stats
+
+    def export(self, path):
+        """
+        Writes the recorded frames in a trace file, with a complete event for each frame and for each of its spans
+        :param path: path of the JSON file to write
+        """
+
+        with self._lock:
+            frames = list(self._frames)
+
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': "Game of Life"}},
+                  {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': "Game loop"}},
+                  {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': 1, 'args': {'name': "GUI"}}]
+
+        for number, (start, end, spans) in enumerate(frames):
+            events.append({'name': 'frame', 'cat': 'frame', 'ph': 'X', 'pid': pid, 'tid': 0, 'ts': start * 1e6,
+                           'dur': (end - start) * 1e6, 'args': {'frame': number}})
+
+            for phase, phase_spans in spans.items():
+                tid = 1 if phase == 'repaint' else 0  # Repaints happen in the GUI thread, the rest in the game loop
+
+                for span_start, span_end in phase_spans:
+                    events.append({'name': phase, 'cat': phase, 'ph': 'X', 'pid': pid, 'tid': tid,
+                                   'ts': span_start * 1e6, 'dur': (span_end - span_start) * 1e6})
+
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
@@ -1,80 +1,101 @@
-from PyQt5.QtWidgets import QGridLayout, QGraphicsGridLayout
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QGridLayout
 from gamestate import Grid
-from gamecell import GameCell
+from gameview import GameView
+
+DISPLAY_FPS = 60  # Refresh rate of the grid, independent of the rate at which the generations are computed
 
 
 class GameGrid(QGridLayout):
     """
-    Class that visually represents the game grid using a QGridLayout
+    Class that visually represents the game grid using a QGridLayout containing a single GameView, which draws every
+    cell. The grid observes the changes of the state grid, one signal per generation, and redraws the latest snapshot
+    published by it at most DISPLAY_FPS times per second: the generations computed in between two redraws are never
+    drawn, and nothing is done while the board does not change
     """
 
-    def __init__(self, rows, cols, initial_state):
+    def __init__(self, rows, cols, initial_pattern=None, engine='dense', rule=None, cycle_action='report', offset=None,
+                 autosave=None):
         """
-        Initializes the model and associates a newly created "visual" cell to each model cell
+        Initializes the model and the view drawing its cells
         :param rows: number of rows of the grid
         :param cols: number of columns of the grid
-        :param initial_state: initial state of the grid, loaded from a file or a known pattern in the initial dropdown
+        :param initial_pattern: initial Pattern of the grid, loaded from a file or a known pattern in the initial
+        dropdown, None for an empty grid
+        :param engine: name of the engine used by the model to store and advance the state
+        :param rule: rulestring of the rule simulated by the model, the Game of Life by default
+        :param cycle_action: action taken by the model when the board becomes periodic
+        :param offset: row and column at which the initial pattern is placed, its stored position (or the center) if
+        not given
+        :param autosave: path of the file receiving the periodic checkpoints of the running game, None to disable them
         """
 
         super().__init__()
-        self.setHorizontalSpacing(0)  # Sets no horizontal spacing between adjacent cells
-        self.setVerticalSpacing(0)  # Sets no vertical spacing between adjacent cells
-        self._stategrid = Grid(rows, cols)  # Initialization of the state of the grid
+        self.setContentsMargins(0, 0, 0, 0)
+        self._stategrid = Grid(rows, cols, engine, rule, cycle_action, autosave)  # Initialization of the state grid
         self._rows = rows
         self._cols = cols
-        self._grid = []  # List containing all the game cells that are in the grid
-
-        for row in range(0, rows):
-            self._grid.append([])
-
-            for col in range(0, cols):
-                game_cell = GameCell(row, col)  # Creates a new "visual" cell
-                state_cell = self._stategrid.get_cell(row, col)  # Gets the corresponding state cell
-                state_cell.observe(game_cell.update_color)  # Connects the color update to a change in the model cell
-                game_cell.observe(state_cell.toggle_value)  # Connects the model update to a click in the "visual" cell
-                self._grid[row].append(game_cell)  # Adds the "visual" cell to the list of cells of the grid
-                self.addWidget(game_cell, row, col)
-
-        if len(initial_state) > 0:  # If the initial state is not empty, it is loaded into the state grid
-            for row in range(0, rows):
-                for col in range(0, cols):
-                    if initial_state[row][col][0] == 1:
-                        self._stategrid.get_cell(row, col).set_time(initial_state[row][col][1])
-                        self._stategrid.get_cell(row, col).toggle_value()  # Visual update of the cell in the grid
+        self._view = GameView(rows, cols, self._stategrid.get_tracer())
+        self._view.observe(self._stategrid.toggle)  # Connects the model update to a click on a cell of the view
+        self._view.observe_viewport(self.update_grid)  # A zoom or a pan shows a different region of the board
+        self._shown_sequence = None  # Sequence number of the snapshot on screen
+        self.addWidget(self._view, 0, 0)
+        self._timer = QTimer(self)  # Started by a change of the board, coalesces the changes until it fires
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.refresh)
+        self._stategrid.observe_generations(self.generation_changed)
+
+        if initial_pattern is not None:  # If there is an initial pattern, it is loaded into the state grid
+            self._stategrid.load_pattern(initial_pattern, offset)
 
         self.update_grid()
 
-    def heightForWidth(self, width):
+    def reset(self):
         """
-        Overridden method to maintain a square ratio of the grid
+        Method used to trigger the reset of the state of the grid
         """
 
-        return width
+        self._stategrid.reset()
 
-    def hasHeightForWidth(self):
+    def generation_changed(self, diff):
         """
-        Overridden method to maintain a square ratio of the grid
+        Slot connected to the generation_changed signal of the state grid, which schedules a redraw unless one is
+        already pending
+        :param diff: GenerationDiff of the change, not needed since the whole snapshot is drawn
         """
 
-        return True
+        if not self._timer.isActive():
+            self._timer.start(1000 // DISPLAY_FPS)
 
-    def reset(self):
+    def refresh(self, full=False):
         """
-        Method used to trigger the reset of the state of the grid
+        Shows the latest snapshot published by the state grid, if it has not been shown yet
+        :param full: True to redraw the snapshot even if it is already on screen
         """
 
-        self._stategrid.reset()
+        snapshots = self._stategrid.get_snapshots()
+
+        if not full and snapshots.get_sequence() == self._shown_sequence:
+            return
+
+        with snapshots.read() as snapshot:  # The colors are computed right away, so the game loop can swap it after
+            self._view.update_cells(snapshot.get_alive(), snapshot.get_ages())
+            self._shown_sequence = snapshot.get_sequence()
 
     def update_grid(self):
         """
-        Update of the game grid, invoked by the game loop at the desired rate, which changes the color of every cell
+        Update of the game grid, which redraws the latest snapshot
+        """
+
+        self.refresh(full=True)
+
+    def get_view(self):
+        """
+        Getter of the widget drawing the cells of the grid
+        :returns: the GameView of the grid
         """
 
-        for row in range(0, self._rows):
-            for col in range(0, self._cols):
-                occupied = self._stategrid.get_cell(row, col).get_value() # Check if the cell is populated
-                time = self._stategrid.get_cell(row, col).get_time() # Get the alive time of the cell
-                self._grid[row][col].update_color(occupied, time) # Trigger the cell recolor
+        return self._view
 
     def get_state_grid(self):
         """
@@ -1,8 +1,15 @@
+import os
+
 from PyQt5.QtCore import *
+from PyQt5.QtGui import QPainter, QPolygonF
 from PyQt5.QtWidgets import QVBoxLayout, QPushButton, QSpinBox, QLabel, QWidget, QSizePolicy, QHBoxLayout, \
-    QFileDialog, QMessageBox
+    QFileDialog, QCheckBox, QSlider
 
 from events import game_event
+from gamecore import AUTOSAVE_PATH, BOARD_EXTENSION
+
+SLIDER_LIMIT = 2 ** 31 - 1  # Largest position of a slider, the generations beyond it cannot be selected
+CHART_REFRESH = 250  # Milliseconds between two refreshes of the population chart
 
 
 class GameMenu(QVBoxLayout):
@@ -20,22 +27,75 @@ class GameMenu(QVBoxLayout):
         super().__init__()
         self._clear = ClearButton(game_grid)
         self._save = SaveButton(game_grid.get_state_grid())
-        self._start = StartButton(self._clear, self._save)
+        self._jump_power = JumpPower()
+        self._jump = JumpButton(game_grid.get_state_grid(), self._jump_power)
+        self._history = HistorySlider(game_grid.get_state_grid())
+        self._start = StartButton(self._clear, self._jump, self._history)
         self._settings = SettingsButton(signal)
         self._fps = FPSRegulator(game_grid.get_state_grid())
+        self._cycle_label = QLabel("No cycle detected")  # Shows the period of the board once it repeats itself
+        self._save_label = QLabel()  # Shows when the boards saved in background have been written
+        self._population = PopulationChart(game_grid.get_state_grid().get_statistics())
+        self._trace_overlay = TraceOverlay(game_grid.get_state_grid().get_tracer())
+        self._trace_toggle = TraceToggle(game_grid.get_state_grid().get_tracer(), self._trace_overlay)
+        self._export_trace = ExportTraceButton(game_grid.get_state_grid().get_tracer())
         self.addWidget(self._start)
         self.addWidget(self._clear)
         self.addWidget(self._save)
         self.addWidget(self._settings)
         self._fps_box = None
         self._fps_widget = None
+        self._jump_box = None
+        self._jump_widget = None
+        self._history_box = None
+        self._history_widget = None
 
         self.create_fps_widget()
+        self.create_jump_widget()
+        self.create_history_widget()
+        self.addWidget(self._cycle_label)
+        self.addWidget(self._save_label)
+        self.addWidget(self._population)
+        self.addWidget(self._trace_toggle)
+        self.addWidget(self._trace_overlay)
+        self.addWidget(self._export_trace)
+        game_grid.get_state_grid().observe_cycles(self.cycle_found)
+        game_grid.get_state_grid().observe_checkpoints(self.checkpoint_written)
 
     def get_start(self):
         # TODO: check if it is used
         return self._start
 
+    def cycle_found(self, period, generation):
+        """
+        Slot called when the state grid becomes periodic, which shows the period to the user and switches the start
+        button back if the state grid has paused the game
+        :param period: period of the board, 1 for a still life
+        :param generation: generation in which the cycle has been detected
+        """
+
+        if period == 1:
+            self._cycle_label.setText("Still life at generation " + str(generation))
+        else:
+            self._cycle_label.setText("Period " + str(period) + " at generation " + str(generation))
+
+        if not game_event.is_set() and self._start.is_running():  # The game has been paused by the state grid
+            self._start.toggle()
+
+    def checkpoint_written(self, path, generation, error):
+        """
+        Slot called when a board saved in background has been written, which tells the user where (the periodic
+        checkpoints are only reported if they fail)
+        :param path: path of the board file
+        :param generation: generation of the saved board
+        :param error: exception raised while writing the file, None if it has been written
+        """
+
+        if error is not None:
+            self._save_label.setText("Could not save " + os.path.basename(path) + ": " + str(error))
+        elif path != AUTOSAVE_PATH:
+            self._save_label.setText("Generation " + str(generation) + " saved to " + os.path.basename(path))
+
     def create_fps_widget(self):
         """
         Method that incapsulates the creation of the FPS widget not to overcomplicate the constructor
@@ -50,27 +110,67 @@ class GameMenu(QVBoxLayout):
         self._fps_widget.setLayout(self._fps_box)
         self.addWidget(self._fps_widget, Qt.AlignLeft)
 
+    def create_jump_widget(self):
+        """
+        Method that incapsulates the creation of the widget used to skip generations, with the button and the spinbox
+        selecting how many generations are skipped
+        """
+
+        self._jump_box = QHBoxLayout()
+        self._jump_box.addWidget(self._jump)
+        self._jump_box.addWidget(QLabel("2^"))
+        self._jump_box.addWidget(self._jump_power)
+        self._jump_widget = QWidget()
+        self._jump_widget.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self._jump_widget.setLayout(self._jump_box)
+        self.addWidget(self._jump_widget, Qt.AlignLeft)
+
+    def create_history_widget(self):
+        """
+        Method that incapsulates the creation of the widget used to rewind the grid, with the slider over the recorded
+        generations
+        """
+
+        self._history_box = QHBoxLayout()
+        self._history_box.addWidget(QLabel("Rewind"))
+        self._history_box.addWidget(self._history)
+        self._history_widget = QWidget()
+        self._history_widget.setLayout(self._history_box)
+        self.addWidget(self._history_widget)
+
 
 class StartButton(QPushButton):
     """
     Class that represents the start button placed in the game menu, created to customize the mousePressEvent method
     """
 
-    def __init__(self, clear_button, save_button):
+    def __init__(self, clear_button, jump_button, history_slider):
         """
-        Constructor that sets the size policy to fixed (non-expanding), sets the references to the clear and save
-        button and initializes a flag to control if the game is running or not without having to access the game grid.
+        Constructor that sets the size policy to fixed (non-expanding), sets the references to the clear and jump
+        buttons and to the history slider and initializes a flag to control if the game is running or not without
+        having to access the game grid. The save button works in both states, the board is saved in background
         :param clear_button: reference to the clear button of the menu, used to change its "clickability" based on the
         state of the game (running or paused/stopped)
-        :param save_button: reference to the save button of the menu, used to change its "clickability" based on the
+        :param jump_button: reference to the jump button of the menu, used to change its "clickability" based on the
         state of the game (running or paused/stopped)
+        :param history_slider: reference to the history slider of the menu, which can only be used while the game is
+        paused
         """
 
         super().__init__("Start")
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         self._running = False
         self._clear = clear_button
-        self._save = save_button
+        self._jump = jump_button
+        self._history = history_slider
+
+    def is_running(self):
+        """
+        Getter of the flag telling whether the game is running
+        :returns: True if the game is running, False if it is paused or stopped
+        """
+
+        return self._running
 
     def mousePressEvent(self, event):
         """
@@ -78,18 +178,27 @@ class StartButton(QPushButton):
         the game
         """
 
+        self.toggle()
+
+    def toggle(self):
+        """
+        Method that stops or starts the game loop, also used when the game is paused by the state grid
+        """
+
         self._running = not self._running  # First of all, toggle the state of the game...
 
         if self._running:  # If it is running, change it into a pause button and disable the other two buttons
             self.setText("Pause")
             game_event.set()  # Tells the game loop to actually update the grid
             self._clear.setEnabled(False)
-            self._save.setEnabled(False)
+            self._jump.setEnabled(False)
+            self._history.setEnabled(False)
         else:  # Otherwise, change it into a start button and enable the other two buttons
             self.setText("Start")
             game_event.clear()  # Tells the game loop to remain in the "outer" loop and wait for the game to start again
             self._clear.setEnabled(True)
-            self._save.setEnabled(True)
+            self._jump.setEnabled(True)
+            self._history.setEnabled(True)
 
 
 class ClearButton(QPushButton):
@@ -132,34 +241,107 @@ class SaveButton(QPushButton):
 
     def mousePressEvent(self, event):
         """
-        Override of the superclass method, used to read and save the state of the grid by iterating in all of its cells
+        Override of the superclass method, used to save the alive state and the alive time of every cell of the grid,
+        with its generation and rule, in a board file. The latest board when the file is chosen is written in
+        background, while the game keeps running, and the menu tells when it has been written
         """
 
-        rows, cols = self._grid.get_dimensions()
-        state = []
+        # Create the window and filters the files the user is able to see in the directory
+        filename, _ = QFileDialog.getSaveFileName(self, "Save state to board file", "",
+                                                  "Board files (*" + BOARD_EXTENSION + ")")
 
-        for row in range(0, rows):
-            state.append([])
+        if filename:  # If the filename has been selected and the save button has been pressed...
+            if not filename.lower().endswith(BOARD_EXTENSION):
+                filename += BOARD_EXTENSION
 
-            for col in range(0, cols):
-                cell = self._grid.get_cell(row, col)
-                state[row].append([cell.get_value(), cell.get_time()])  # Saves the alive/dead state and its alive time
+            self._grid.checkpoint(filename)  # The confirmation is shown by the menu once the file is written
 
-        # Create the window and filters the files the user is able to see in the directory
-        filename, _ = QFileDialog.getSaveFileName(self, "Save state to JSON file", "", "JSON (*.json)")
-        msg = QMessageBox()
 
-        if filename:  # If the filename has been selected and the save button has been pressed...
-            with open(filename + ".json", "w+") as save_file:  # Create the file with filename + .json
-                save_file.write(str(state))  # Dump the state onto the file
+class JumpButton(QPushButton):
+    """
+    Class that represents the jump button placed in the game menu, created to customize the mousePressEvent method
+    """
+
+    def __init__(self, state_grid, jump_power):
+        """
+        Constructor that sets the size policy to fixed (non-expanding) and sets the references to the state grid and to
+        the spinbox selecting the number of generations to skip.
+        :param state_grid: reference to the state of the game grid, used to advance it
+        :param jump_power: reference to the spinbox containing the base 2 logarithm of the generations to skip
+        """
+
+        super().__init__("Skip generations")
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self._grid = state_grid
+        self._power = jump_power
+
+    def mousePressEvent(self, event):
+        """
+        Override of the superclass method, used to skip 2^k generations of the grid at once, only if the game is paused
+        """
+
+        self._grid.jump(self._power.value())
 
-            msg.setIcon(QMessageBox.Information)
-            msg.setText("State successfully saved on file")
-            msg.setWindowTitle("Save success")
-            msg.setStandardButtons(QMessageBox.Ok)
-            msg.exec_()  # Show the user a confirmation message box
-        else:  # ...otherwise (window has been closed or Cancel button pressed) no confirmation is shown to the user
-            pass
+
+class HistorySlider(QSlider):
+    """
+    Class that represents the slider used to rewind the grid to one of the generations recorded in its history, only
+    while the game is paused. The position of the slider counts the generations from the oldest recorded one
+    """
+
+    def __init__(self, state_grid):
+        """
+        Constructor that sets the orientation of the slider and observes the changes of the state grid
+        :param state_grid: reference to the state of the game grid, used to rewind it and to read its history
+        """
+
+        super().__init__(Qt.Horizontal)
+        self._grid = state_grid
+        self._first = 0  # Oldest recorded generation, at the start of the slider
+        self.valueChanged.connect(self.rewind)
+        state_grid.observe_generations(self.generation_changed)
+        self.generation_changed(None)
+
+    def generation_changed(self, diff):
+        """
+        Slot connected to the generation_changed signal of the state grid, which moves the slider to the current
+        generation and stretches it over the recorded ones
+        :param diff: GenerationDiff of the change, None to read the current generation
+        """
+
+        recorded = self._grid.get_history().get_range() or (0, 0)
+        generation = self._grid.get_engine().get_generation() if diff is None else diff.get_generation()
+        self._first = recorded[0]
+        self.blockSignals(True)  # Moving the slider to the current generation must not rewind the grid
+        self.setRange(0, min(recorded[1] - recorded[0], SLIDER_LIMIT))
+        self.setValue(min(max(generation - recorded[0], 0), SLIDER_LIMIT))
+        self.blockSignals(False)
+
+    def rewind(self, value):
+        """
+        Slot connected to the valueChanged signal, which brings the grid back to the selected generation
+        :param value: position of the slider
+        """
+
+        if not game_event.is_set():
+            self._grid.rewind(self._first + value)
+
+
+class JumpPower(QSpinBox):
+    """
+    Class that represents the spinbox selecting how many generations are skipped by the jump button, as a power of 2
+    """
+
+    def __init__(self):
+        """
+        Constructor that sets the minimum, maximum and initial values of the spinbox
+        """
+
+        super().__init__()
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self.setMinimum(0)
+        self.setMaximum(30)
+        self.setValue(10)
 
 
 class SettingsButton(QPushButton):
@@ -198,12 +380,176 @@ class FPSRegulator(QSpinBox):
         """
         Constructor that sets the minimum and maximum values of the spinbox and connects the valueChanged signal to the
         method used to set the sleep of the grid update (which changes the number of frames per second in the visual
-        update)
+        update). The minimum, shown as "Max", runs the game as fast as possible
         :param state_grid: reference to the state of the grid, used to invoke its set_sleep method
         """
         super().__init__()
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-        self.setValue(30)
-        self.setMinimum(1)
+        self.setMinimum(0)
         self.setMaximum(300)
+        self.setValue(30)
+        self.setSpecialValueText("Max")  # Shown instead of 0, which removes the limit to the frames per second
         self.valueChanged.connect(state_grid.set_sleep)  # Sets the sleep value as soon as the value is changed
+
+
+class TraceToggle(QCheckBox):
+    """
+    Class that represents the checkbox turning on and off the recording of the frames of the game loop
+    """
+
+    def __init__(self, tracer, overlay):
+        """
+        Constructor that sets the references to the tracer and to the overlay showing its statistics
+        :param tracer: tracer of the state grid, enabled only while the checkbox is checked
+        :param overlay: overlay showing the statistics of the tracer, hidden while the checkbox is not checked
+        """
+
+        super().__init__("Show frame stats")
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self._tracer = tracer
+        self._overlay = overlay
+        self.toggled.connect(self.toggle_tracer)
+
+    def toggle_tracer(self, checked):
+        """
+        Slot called when the checkbox is checked or unchecked, which starts or stops the tracer and its overlay
+        :param checked: new state of the checkbox
+        """
+
+        self._tracer.set_enabled(checked)
+        self._overlay.setVisible(checked)
+
+
+class TraceOverlay(QLabel):
+    """
+    Class that represents the small overlay showing the achieved frame rate, the dropped frames and where the time of a
+    frame goes, refreshed twice per second while it is visible
+    """
+
+    def __init__(self, tracer):
+        """
+        Constructor that creates the timer refreshing the overlay, initially hidden
+        :param tracer: tracer of the state grid, read to show its statistics
+        """
+
+        super().__init__("Waiting for the game to start")
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self._tracer = tracer
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self.setVisible(False)
+
+    def setVisible(self, visible):
+        """
+        Override of the superclass method, which also starts or stops the refresh of the overlay
+        """
+
+        super().setVisible(visible)
+
+        if visible:
+            self._timer.start(500)
+        else:
+            self._timer.stop()
+
+    def refresh(self):
+        """
+        Shows the statistics of the frames ended in the last second
+        """
+
+        stats = self._tracer.get_stats()
+
+        if stats is None:  # No frame since the tracer has been enabled
+            return
+
+        target = "{:.0f}".format(stats['target_fps']) if stats['target_fps'] else "Max"
+        self.setText("FPS {:.1f} / {}, {} dropped\ncompute {:.1f} ms, publish {:.1f} ms\n"
+                     "repaint {:.1f} ms, sleep {:.1f} ms".format(stats['fps'], target, stats['dropped'],
+                                                                 stats['compute_ms'], stats['publish_ms'],
+                                                                 stats['repaint_ms'], stats['sleep_ms']))
+
+
+class PopulationChart(QWidget):
+    """
+    Class that represents the small chart of the population over the recent generations, with the current population,
+    births and deaths written above it. It is refreshed a few times per second from the statistics kept by the state
+    grid, so drawing it never reads the board
+    """
+
+    def __init__(self, statistics):
+        """
+        Constructor that creates the timer refreshing the chart
+        :param statistics: statistics of the state grid, read to draw the chart
+        """
+
+        super().__init__()
+        self.setMinimumSize(160, 60)
+        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        self._statistics = statistics
+        self._series = []  # (generation, population) of the generations drawn
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(CHART_REFRESH)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reads the recent populations and repaints the chart if they have changed since the last refresh
+        """
+
+        series = self._statistics.get_series()
+
+        if series != self._series:
+            self._series = series
+            self.update()
+
+    def paintEvent(self, event):
+        """
+        Overrides the QWidget method that paints the widget, drawing the populations as a line scaled to fit the chart
+        between 0 and the largest one
+        """
+
+        painter = QPainter(self)
+        painter.setPen(self.palette().text().color())
+        text_height = painter.fontMetrics().height()
+        statistics = self._statistics
+        painter.drawText(0, painter.fontMetrics().ascent(), "Population {} (+{} -{})".format(
+            statistics.get_population(), statistics.get_births(), statistics.get_deaths()))
+
+        if len(self._series) > 1:
+            top, bottom = text_height + 2, self.height() - 1
+            highest = max(max(population for _, population in self._series), 1)
+            step = (self.width() - 1) / (len(self._series) - 1)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(self.palette().highlight().color())
+            painter.drawPolyline(QPolygonF([QPointF(index * step, bottom - (bottom - top) * population / highest)
+                                            for index, (_, population) in enumerate(self._series)]))
+
+        painter.end()
+
+
+class ExportTraceButton(QPushButton):
+    """
+    Class that represents the button exporting the recorded frames in a trace file, created to customize the
+    mousePressEvent method
+    """
+
+    def __init__(self, tracer):
+        """
+        Constructor that sets the size policy to fixed (non-expanding) and sets the reference to the tracer.
+        :param tracer: tracer of the state grid, whose frames are exported
+        """
+
+        super().__init__("Export trace")
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self._tracer = tracer
+
+    def mousePressEvent(self, event):
+        """
+        Override of the superclass method, used to write the recorded frames in a file chosen by the user, which can be
+        opened with chrome://tracing or Perfetto
+        """
+
+        filename, _ = QFileDialog.getSaveFileName(self, "Export trace to JSON file", "", "JSON (*.json)")
+
+        if filename:  # Nothing is written if the window has been closed or the Cancel button pressed
+            self._tracer.export(filename if filename.endswith(".json") else filename + ".json")
@@ -1,42 +1,124 @@
-from time import sleep
+from time import perf_counter
 
+import numpy as np
 from PyQt5.QtCore import pyqtSignal, QObject
 
-from events import game_event, window_event
+from events import game_event, window_event, loop_changed
+from gamecore import Board, CheckpointWriter, FrameScheduler, GenerationDiff, History, SnapshotBuffer, \
+    Statistics, Tracer, remove_autosave
 
 
-class Grid:
+class Grid(QObject):
     """
-    Class that represents the grid for the game, containing all the cells and methods needed to simulate the population
+    Class that represents the grid for the game, adapting the board simulated by the core to the GUI: it exposes every
+    cell as an object and runs the game loop, paced by the events shared with the windows. The game loop never touches
+    the GUI, it publishes a snapshot of the board after each generation and the GUI shows the latest one
+    cycle_found signals that the board has become periodic, with its period and the generation it was detected in
+    generation_changed signals, once per generation or edit, the GenerationDiff of the board
+    checkpoint_written signals that a checkpoint has been written, with its path, generation and error (None if written)
     """
 
-    def __init__(self, rows, cols):
+    cycle_found = pyqtSignal(int, object)  # The generation is an object since it can outgrow a C int after the jumps
+    generation_changed = pyqtSignal(object)
+    checkpoint_written = pyqtSignal(str, object, object)
+
+    def __init__(self, rows, cols, engine='dense', rule=None, cycle_action='report', autosave=None):
         """
-        Constructor of the class that sets the attributes and initializes all the Cell objects
+        Constructor of the class that sets the attributes and creates the board holding the state of all the cells
         :param rows: number of rows of the state grid
         :param cols: number of columns of the state grid
+        :param engine: name of the engine used to store and advance the state, one of the keys of ENGINES
+        :param rule: rulestring of the Life-like rule to simulate (such as B36/S23), the Game of Life by default
+        :param cycle_action: what the game loop does when the board becomes periodic, one of CYCLE_ACTIONS: only
+        report it, pause the game or skip ahead by whole cycles
+        :param autosave: path of the file receiving the periodic checkpoints of the running game, None to disable them
         """
 
+        super().__init__()
         self._rows = rows
         self._cols = cols
-        self._cells = []
-        self._sleep = 0.03  # By default we set the refresh to (about) 30 Frames Per Second
-
-        for row in range(0, rows):
-            self._cells.append([])
-
-            for col in range(0, cols):
-                self._cells[row].append(Cell())
+        self._board = Board(rows, cols, engine, rule)  # Simulation without any user interface
+        self._engine = self._board.get_engine()  # Alive state and alive time of every cell, stored as arrays
+        self._cells = {}  # Cell objects, created on demand as views onto the engine arrays
+        self._cycle_action = cycle_action
+        self._scheduler = FrameScheduler(30)  # By default we set the refresh to 30 Frames Per Second
+        self._tracer = Tracer()  # Records where the time of each frame goes, disabled until the user turns it on
+        self._snapshots = SnapshotBuffer(rows, cols)  # Boards handed over to the GUI
+        self._history = History(rows, cols)  # Past generations, which the grid can be rewound to
+        self._statistics = Statistics(rows, cols)  # Population of the board, kept up to date from its changes
+        self._autosave = autosave
+        self._checkpoints = CheckpointWriter(on_written=self.checkpoint_written.emit)  # Writes the boards in background
 
     def get_cell(self, row, col):
         """
         Selects a cell from the state grid
         :param row: row from which the cell must be selected
         :param col: column from which the cell must be selected
-        :returns: a Cell object from the _cells list
+        :returns: a Cell object, a view onto the state of the cell stored in the engine
+        """
+
+        cell = self._cells.get((row, col))
+
+        if cell is None:  # The view is created the first time the cell is requested and then reused
+            cell = Cell(self._engine, row, col)
+            self._cells[(row, col)] = cell
+
+        return cell
+
+    def get_board(self):
+        """
+        Getter of the board simulated by the state grid
+        :returns: the Board of the state grid
+        """
+
+        return self._board
+
+    def get_snapshots(self):
+        """
+        Getter of the buffer through which the state grid hands its boards over to the GUI
+        :returns: the SnapshotBuffer of the state grid
+        """
+
+        return self._snapshots
+
+    def get_history(self):
+        """
+        Getter of the history recording the past generations of the state grid
+        :returns: the History of the state grid
+        """
+
+        return self._history
+
+    def get_statistics(self):
+        """
+        Getter of the statistics of the board, updated at every change
+        :returns: the Statistics of the state grid
+        """
+
+        return self._statistics
+
+    def publish(self):
+        """
+        Publishes a snapshot of the current board, to be shown by the GUI at its next refresh
         """
 
-        return self._cells[row][col]
+        self._snapshots.publish(self._engine.get_alive(), self._engine.get_ages(), self._engine.get_generation())
+
+    def get_tracer(self):
+        """
+        Getter of the tracer recording the frames of the game loop
+        :returns: the Tracer of the state grid
+        """
+
+        return self._tracer
+
+    def get_engine(self):
+        """
+        Getter of the engine that stores the state of the grid and computes its generations
+        :returns: the engine of the state grid
+        """
+
+        return self._engine
 
     def get_dimensions(self):
         """
@@ -46,17 +128,98 @@ class Grid:
 
         return self._rows, self._cols
 
+    def get_rule(self):
+        """
+        Getter of the rule simulated by the state grid
+        :returns: the compiled Rule used by the engine
+        """
+
+        return self._board.get_rule()
+
+    def set_rule(self, rule):
+        """
+        Changes the rule simulated by the state grid, starting from the next generation
+        :param rule: rulestring of the new rule
+        """
+
+        self._board.set_rule(rule)
+
+    def get_cycle_action(self):
+        """
+        Getter of the action taken by the game loop when the board becomes periodic
+        :returns: one of CYCLE_ACTIONS
+        """
+
+        return self._cycle_action
+
+    def set_cycle_action(self, cycle_action):
+        """
+        Setter of the action taken by the game loop when the board becomes periodic
+        :param cycle_action: one of CYCLE_ACTIONS
+        """
+
+        self._cycle_action = cycle_action
+
+    def observe_cycles(self, slot):
+        """
+        Method used to implement the observable behaviour, connecting a slot to the cycle_found signal
+        :param slot: slot to connect to the cycle_found signal
+        """
+
+        self.cycle_found.connect(slot)
+
+    def observe_checkpoints(self, slot):
+        """
+        Method used to implement the observable behaviour, connecting a slot to the checkpoint_written signal
+        :param slot: slot to connect to the checkpoint_written signal
+        """
+
+        self.checkpoint_written.connect(slot)
+
+    def observe_generations(self, slot):
+        """
+        Method used to implement the observable behaviour, connecting a slot to the generation_changed signal
+        :param slot: slot to connect to the generation_changed signal, which receives a GenerationDiff
+        """
+
+        self.generation_changed.connect(slot)
+
+    def _changed(self, diff):
+        """
+        Records the change in the history and in the statistics, publishes the current board and signals its change to
+        the observers
+        :param diff: GenerationDiff of the change
+        """
+
+        self._history.record(diff, self._engine)
+        self._statistics.update(diff, self._engine)
+        self.publish()
+        self.generation_changed.emit(diff)
+
     def reset(self):
         """
         Resets the whole grid to its initial empty state
         """
 
-        for row in range(0, self._rows):
-            for col in range(0, self._cols):
-                cell = self._cells[row][col]
+        died = np.argwhere(self._engine.get_alive())  # Reported as a single change, without a Cell for each of them
+        self._board.clear()
+        self._changed(GenerationDiff(self._engine.get_generation(), died=died))
+
+    def toggle(self, row, col):
+        """
+        Toggles the value of a cell, used when the user draws on the grid
+        :param row: row of the cell
+        :param col: column of the cell
+        """
+
+        cell = self.get_cell(row, col)
+        cell.toggle_value()
+        coords = np.array([[row, col]], dtype=np.intp)
 
-                if cell.get_value() == 1:  # Toggles only the occupied cells, avoiding unnecessary propagation
-                    cell.toggle_value()
+        if cell.get_value():
+            self._changed(GenerationDiff(self._engine.get_generation(), born=coords))
+        else:
+            self._changed(GenerationDiff(self._engine.get_generation(), died=coords))
 
     def alive_neighbors(self, row, col):
         """
@@ -66,116 +229,170 @@ class Grid:
         :returns: an integer representing the number of alive neighbors
         """
 
-        count = 0  # Keeps track of how many alive cells are in the neighborhood
+        return self._engine.alive_neighbors(row, col)
 
-        if row > 0: # Checks if there is an upper row
-            count += self._cells[row - 1][col].get_value() # Gets the value of the cell immediately above
+    def update_grid(self):
+        """
+        Updates in parallel the grid given the set of rules of the Game of Life, computing the whole generation in the
+        engine and then publishing the new board for the GUI, with a single signal carrying all the changed cells. When
+        the board is found to repeat itself the cycle is signalled and handled according to the cycle action
+        """
 
-            if col > 0: # Checks if there is a column to the left
-                count += self._cells[row - 1][col - 1].get_value() # Gets the value of the cell at its top left
+        start = perf_counter()
+        changes, period = self._board.step()
+        self._tracer.add('compute', start)
+        diff = GenerationDiff.from_changes(changes, self._engine.get_generation())
 
-            if col < self._cols - 1: # Checks if there is a column to the right
-                count += self._cells[row - 1][col + 1].get_value() # Gets the value of the cell at its top right
+        if self._board.follow_population():  # The population has left the viewport of the plane, which is moved
+            diff = GenerationDiff(self._engine.get_generation(), full=True)
 
-        if row < self._rows - 1: # Cheks if there is a lower row
-            count += self._cells[row + 1][col].get_value() # Gets the value of the cell immediately below
+        if period is not None:
+            self.cycle_found.emit(period, self._engine.get_generation())  # Queued to the slots in the GUI thread
 
-            if col > 0: # Checks if there is a column to the left
-                count += self._cells[row + 1][col - 1].get_value() # Gets the value of the cell at its bottom left
+            if self._cycle_action == 'pause':
+                game_event.clear()  # The game loop stops at the end of this update
+            elif self._cycle_action == 'skip':
+                self._board.skip_cycles(period)  # Fast-forwards by whole cycles, the board is published right after
+                diff = GenerationDiff(self._engine.get_generation(), full=True)
 
-            if col < self._cols - 1: # Checks if there is a column to the right
-                count += self._cells[row + 1][col + 1].get_value() # Gets the value of the cell at its bottom right
+        start = perf_counter()
+        self._changed(diff)
 
-        if col > 0: # Checks if there is a column to the left
-            count += self._cells[row][col - 1].get_value() # Gets the value of the cell at its left
+        if self._autosave is not None and self._checkpoints.is_due():  # Pins the snapshot just published
+            self.checkpoint(self._autosave, 'zlib')  # The periodic checkpoints favour the size over the load time
 
-        if col < self._cols - 1: # Checks if there is a column to the right
-            count += self._cells[row][col + 1].get_value() # Gets the value of the cell at its right
+        self._tracer.add('publish', start)
 
-        return count
+    def jump(self, power):
+        """
+        Advances the grid by 2^power generations at once using HashLife. The pattern evolves on the unbounded plane, so
+        the cells that leave the grid are lost at the end of the jump, and the alive time of every cell restarts from 0
+        :param power: base 2 logarithm of the number of generations to skip
+        """
 
-    def update_grid(self):
+        self._board.jump(power)
+        self._changed(GenerationDiff(self._engine.get_generation(), full=True))
+
+    def rewind(self, generation):
         """
-        Updates in parallel the grid given the set of rules of the Game of Life, applying changes only after having
-        calculated them all
+        Brings the grid back (or forward) to a recorded generation, rebuilding it from the history. The generations
+        after it are forgotten once the grid is edited or run again
+        :param generation: generation to go to, between the first and the last one of the history
         """
 
-        list_of_changes = {'birth': [], 'survival': [], 'death': []}  # Keep the changes, apply them at the end
+        alive, ages, generation = self._history.rewind(generation)
+        self._board.load(alive, ages, generation)
+        diff = GenerationDiff(generation, full=True)
+        self._statistics.clear_series()  # The populations recorded after this generation no longer lead to it
+        self._statistics.update(diff, self._engine)
+        self.publish()  # Not recorded again, the history already holds this board
+        self.generation_changed.emit(diff)
 
-        for row in range(0, self._rows):
-            for col in range(0, self._cols):
-                cell_neighbors = self.alive_neighbors(row, col)  # Computes the number of alive neighbors of the cell
+    def get_state(self):
+        """
+        Reads the whole grid in the format of the saved states
+        :returns: a list of rows, each a list of [value, time] pairs
+        """
 
-                if self._cells[row][col].get_value():  # If a cell is alive...
-                    if cell_neighbors in [2, 3]:  # ...check if it survives
-                        list_of_changes['survival'].append([row, col]) # Add it to the surviving cells
-                    else:  # ...check if it dies
-                        list_of_changes['death'].append([row, col]) # Add it to the dead cells
-                elif not self._cells[row][col].get_value() and cell_neighbors == 3:  # Check for a cell "birth"
-                    list_of_changes['birth'].append([row, col]) # Add it to the newborn cells
+        return self._board.get_state()
 
-        for coords in list_of_changes['birth']:  # Set the newborn cells to 1
-            self._cells[coords[0]][coords[1]].toggle_value()
+    def checkpoint(self, path, compression='none'):
+        """
+        Saves the latest published board in a board file in the background, so that the game loop keeps running while
+        it is written: the snapshot is pinned instead of copied, and checkpoint_written is emitted once it is on disk
+        :param path: path of the file
+        :param compression: one of COMPRESSIONS
+        """
+
+        self._checkpoints.submit(path, self._snapshots.pin(), self.get_rule(), compression, self._snapshots.release)
 
-        for coords in list_of_changes['survival']:  # Increase the alive time of a surviving cell
-            self._cells[coords[0]][coords[1]].increase_time()
+    def close_checkpoints(self):
+        """
+        Waits for the pending checkpoints to be written and removes the autosave file, since the game has ended cleanly
+        """
+
+        self._checkpoints.close()
+
+        if self._autosave is not None:
+            remove_autosave(self._autosave)
+
+    def load_pattern(self, pattern, offset=None):
+        """
+        Replaces the whole grid with a known pattern or a saved state, signalling the change of the whole board
+        :param pattern: Pattern to load
+        :param offset: row and column of the grid at which the top left corner of the pattern is placed, the pattern is
+        placed at its stored position (or centered) if not given
+        """
 
-        for coords in list_of_changes['death']:  # Set the dying cells to 0 and reset their alive time
-            self._cells[coords[0]][coords[1]].toggle_value()
-            self._cells[coords[0]][coords[1]].reset_time()
+        self._board.load_pattern(pattern, offset)
+        self._changed(GenerationDiff(self._engine.get_generation(), full=True))
 
     def get_sleep(self):
         """
-        Getter of the sleep time used to set the number of frames per second caused by the state grid update
-        :returns: an integer representing the value of _sleep
+        Getter of the target duration of a frame, used to set the number of frames per second of the state grid update
+        :returns: the interval between two updates, in seconds
         """
 
-        return self._sleep
+        return self._scheduler.get_interval()
 
     def set_sleep(self, fps):
         """
-        Method that sets the _sleep value to render the target number of frames per second
-        :param fps: number of frames per second the user wants to achieve
+        Method that sets the interval between two updates to render the target number of frames per second
+        :param fps: number of frames per second the user wants to achieve, 0 to compute the generations as fast as
+        possible (the GUI still shows them at its own refresh rate)
         """
 
-        self._sleep = round(1/fps, 3)
+        self._scheduler.set_fps(fps)
+        self._tracer.set_target(fps)
 
     def state_loop(self):
         """
-        Main game loop that performs updates at the target number of times per second
+        Main game loop that performs updates at the target number of times per second. Every wait blocks on the events
+        shared with the windows, so starting, pausing and closing the game take effect immediately and a paused game
+        does not use the CPU
         """
 
+        def interrupted():
+            return not game_event.is_set() or not window_event.is_set()
+
         while window_event.is_set():  # Checks if the main window is present
+            with loop_changed:  # Waits for the game to be started (or for the window to be closed)
+                loop_changed.wait_for(lambda: game_event.is_set() or not window_event.is_set())
+
+            if not window_event.is_set():
+                break
+
+            self._board.restart_cycles()  # The board may have been edited while paused, so its hash is computed anew
+            self._scheduler.start()
+
             while game_event.is_set() and window_event.is_set():  # Checks if the game is not paused
+                self._tracer.begin_frame()
                 self.update_grid()  # Periodically updates the state grid
-                sleep(self._sleep)  # Sleeps for a precise amount of time to achieve the target FPS
-            sleep(0.1)  # Sleeps to prevent a high CPU usage while waiting for the state loop to begin anew
+                start = perf_counter()
+                dropped = self._scheduler.wait(loop_changed, interrupted)  # Compensates the time spent computing
+                self._tracer.add('sleep', start)
+                self._tracer.end_frame(dropped)
+
+        self.close_checkpoints()
 
 
-class Cell(QObject):
+class Cell:
     """
-    Class that represents the single cell of the grid, holding the state of every single cell
-    cell_changed signals a change in the cell, being the update of its value or alive time
+    Class that represents the single cell of the grid, a view onto the state of the cell kept in the engine arrays. The
+    changes of the cells are not signalled one by one, but by the generation_changed signal of the grid
     """
 
-    cell_changed = pyqtSignal(int, int)
-
-    def __init__(self):
+    def __init__(self, engine, row, col):
         """
-        Constructor of the class that initializes the only two attributes
+        Constructor of the class that stores the position of the cell in the engine
+        :param engine: engine of the grid holding the state of the cell
+        :param row: row of the cell in the grid
+        :param col: column of the cell in the grid
         """
 
-        super().__init__()
-        self._value = 0
-        self._alive_time = 0
-
-    def observe(self, slot):
-        """
-        Method used to implement the observable behaviour, connecting a slot to the cell_changed signal
-        :param slot: slot to connect to the cell_pressed signal
-        """
-
-        self.cell_changed.connect(slot)
+        self._engine = engine
+        self._row = row
+        self._col = col
 
     def get_value(self):
         """
@@ -183,17 +400,15 @@ class Cell(QObject):
         :returns: the value of the cell (1 or 0)
         """
 
-        return self._value
+        return self._engine.get_value(self._row, self._col)
 
     def toggle_value(self):
         """
         Toggles the value of the cell: 1 if 0, 0 if 1
         """
 
-        self._value = 1 if self._value == 0 else 0
-        if self._value == 0:
-            self.reset_time()
-        self.cell_changed.emit(self._value, self._alive_time)  # Signal the change of value
+        value = 1 if self.get_value() == 0 else 0
+        self._engine.set_value(self._row, self._col, value)  # The engine resets the alive time of a dead cell
 
     def get_time(self):
         """
@@ -201,26 +416,26 @@ class Cell(QObject):
         :return: the value of the occupied time
         """
 
-        return self._alive_time
+        return self._engine.get_time(self._row, self._col)
 
     def increase_time(self):
         """
         Increases the alive time by 1, used by the game logic to keep track of the alive time of each cell
         """
 
-        self._alive_time += 1
-        self.cell_changed.emit(self._value, self._alive_time)  # Signal the change of alive time
+        self._engine.set_time(self._row, self._col, self.get_time() + 1)
 
     def set_time(self, value):
         """
         Sets the alive time at a precise value, used by the game logic to load a previously saved state
         :param value: new value of the alive time to be set
         """
-        self._alive_time = value  # No signal emitting since we call toggle_value after this
+
+        self._engine.set_time(self._row, self._col, value)
 
     def reset_time(self):
         """
         Resets the alive time of the cell, used when a cell dies
         """
 
-        self._alive_time = 0  # No need to signal the change, since the view is updated by the value toggle
+        self._engine.set_time(self._row, self._col, 0)
@@ -0,0 +1,338 @@
+from time import perf_counter
+
+import numpy as np
+from PyQt5.QtCore import QRectF, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+from events import game_event
+
+DEAD_COLOR = 0xFFFFFFFF  # White, in the 0xAARRGGBB format of the image
+MAX_AGE = 127  # Alive time after which the cells stop changing color
+GRID_LINES = 6  # Minimum side of a cell (in pixels) for the lines between the cells to be drawn
+MAX_ZOOM = 64  # Maximum side of a cell, in pixels
+ZOOM_STEP = 1.25  # Zoom factor of a step of the mouse wheel
+DRAG_DISTANCE = 4  # Distance in pixels the mouse has to move with a pressed button for the press to become a pan
+LOD_SAMPLES = 2  # Cells sampled along each side of a block of cells shown as a single pixel
+BACKGROUND = QColor(220, 220, 220)  # Color of the area around the board
+
+
+def age_color(time):
+    """
+    Color of an alive cell based on its age, which varies from blue to green to red over 128 generations
+    :param time: alive time of the cell
+    :returns: a tuple with the red, green and blue components of the color
+    """
+
+    time = min(time, MAX_AGE)  # Older cells keep the last color
+
+    if time < 32:
+        return 0, time * 8, 255
+    elif time < 64:
+        return 0, 255, 511 - (time * 8)
+    elif time < 96:
+        return (time * 8) - 512, 255, 0
+    else:
+        return 255, 1023 - (time * 8), 0
+
+
+def color_table():
+    """
+    Precomputes the colors of the cells, so that the image of a board is filled with a single lookup
+    :returns: an array of MAX_AGE + 2 colors in the 0xAARRGGBB format, the one of the dead cells first and then the one
+    of the alive cells for each alive time from 0 to MAX_AGE
+    """
+
+    table = np.empty(MAX_AGE + 2, dtype=np.uint32)
+    table[0] = DEAD_COLOR
+
+    for time in range(MAX_AGE + 1):
+        red, green, blue = age_color(time)
+        table[time + 1] = 0xFF000000 | (red << 16) | (green << 8) | blue
+
+    return table
+
+
+class GameView(QWidget):
+    """
+    Class that visually represents the cells of the game grid through a viewport, which can be zoomed with the mouse
+    wheel and panned by dragging the mouse. Only the visible region of the board is rasterized into an image, with a
+    pixel for each cell that is scaled to the size of the cells when painted. When a cell is smaller than a pixel the
+    board is shown at a lower level of detail: every pixel stands for a square block of cells and is shaded by their
+    density, estimated from at most LOD_SAMPLES x LOD_SAMPLES of them, so the cost of a redraw depends on the size of
+    the widget and not on the size of the board
+    cell_pressed signals the mouse click on a cell by the user manually drawing a pattern on the grid
+    viewport_changed signals that the viewport has been zoomed, panned or resized, so the board must be drawn again
+    """
+
+    cell_pressed = pyqtSignal(int, int)
+    viewport_changed = pyqtSignal()
+
+    def __init__(self, rows, cols, tracer):
+        """
+        Initializes the view with the whole board in sight
+        :param rows: number of rows of the grid
+        :param cols: number of columns of the grid
+        :param tracer: tracer of the state grid, which records the time spent repainting the grid
+        """
+
+        super().__init__()
+        self._rows = rows
+        self._cols = cols
+        self._tracer = tracer
+        self._colors = color_table()
+        self._zoom = 1.0  # Side of a cell, in pixels
+        self._origin = (0.0, 0.0)  # Cell coordinates (column, row) of the top left corner of the widget
+        self._fitted = True  # The viewport follows the size of the widget until the user zooms or pans
+        self._pixels = None  # Memory of the image, which must outlive it
+        self._image = None  # Rasterized visible region of the board
+        self._target = None  # Rectangle of the widget in which the image is drawn
+        self._press = None  # Position of the mouse and origin when a button has been pressed
+        self._dragging = False
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)  # Auto resizes with the window
+
+    def observe(self, slot):
+        """
+        Method used to implement the observable behaviour, connecting a slot to the cell_pressed signal
+        :param slot: slot to connect to the cell_pressed signal, which receives the row and the column of the cell
+        """
+
+        self.cell_pressed.connect(slot)
+
+    def observe_viewport(self, slot):
+        """
+        Method used to implement the observable behaviour, connecting a slot to the viewport_changed signal
+        :param slot: slot to connect to the viewport_changed signal
+        """
+
+        self.viewport_changed.connect(slot)
+
+    def get_zoom(self):
+        """
+        Getter of the zoom of the viewport
+        :returns: the side of a cell, in pixels
+        """
+
+        return self._zoom
+
+    def get_origin(self):
+        """
+        Getter of the position of the viewport
+        :returns: a tuple with the column and the row (fractional) shown in the top left corner of the widget
+        """
+
+        return self._origin
+
+    def fit_zoom(self):
+        """
+        Computes the zoom at which the whole board fits the widget, which is also the minimum one
+        :returns: the side of a cell, in pixels
+        """
+
+        return max(min(self.width() / self._cols, self.height() / self._rows), 1e-6)
+
+    def fit(self):
+        """
+        Zooms and centers the viewport so that the whole board is in sight
+        """
+
+        self._zoom = self.fit_zoom()
+        self._origin = ((self._cols - self.width() / self._zoom) / 2, (self._rows - self.height() / self._zoom) / 2)
+        self._fitted = True
+        self.viewport_changed.emit()
+
+    def set_viewport(self, zoom, origin):
+        """
+        Moves the viewport, keeping the zoom between the fit and the maximum one and at least half of the widget on the
+        board
+        :param zoom: side of a cell, in pixels
+        :param origin: column and row shown in the top left corner of the widget
+        """
+
+        if zoom <= self.fit_zoom():
+            self.fit()
+            return
+
+        self._zoom = min(zoom, MAX_ZOOM)
+        half_width = self.width() / self._zoom / 2
+        half_height = self.height() / self._zoom / 2
+        self._origin = (min(max(origin[0], -half_width), self._cols - half_width),
+                        min(max(origin[1], -half_height), self._rows - half_height))
+        self._fitted = False
+        self.viewport_changed.emit()
+
+    def update_cells(self, alive, ages):
+        """
+        Rasterizes the visible region of the board, to be painted at the next repaint
+        :param alive: rows x cols array with 1 for alive cells and 0 for dead ones
+        :param ages: rows x cols array with the alive time of the cells
+        """
+
+        first_col = max(int(np.floor(self._origin[0])), 0)
+        first_row = max(int(np.floor(self._origin[1])), 0)
+        last_col = min(int(np.ceil(self._origin[0] + self.width() / self._zoom)), self._cols)
+        last_row = min(int(np.ceil(self._origin[1] + self.height() / self._zoom)), self._rows)
+
+        if first_col >= last_col or first_row >= last_row:
+            self._image = None
+            self.update()
+            return
+
+        block = max(int(1 / self._zoom), 1)  # Side of the block of cells shown by a pixel
+
+        if block == 1:
+            indices = np.minimum(ages[first_row:last_row, first_col:last_col], MAX_AGE).astype(np.uint16)
+            indices += 1  # The dead color comes first in the table
+            indices *= alive[first_row:last_row, first_col:last_col]
+            self._pixels = np.ascontiguousarray(np.take(self._colors, indices))
+        else:
+            alive_sum, count = self._block_samples(alive, first_row, last_row, first_col, last_col, block)
+            shade = 191 - alive_sum.astype(np.uint32) * 191 // count  # From light gray to black with the density
+            shade[alive_sum == 0] = 255  # Any alive cell makes a block visible
+            shade *= 0x010101  # Same red, green and blue
+            shade |= 0xFF000000
+            self._pixels = shade
+
+        height, width = self._pixels.shape
+        self._image = QImage(self._pixels.data, width, height, width * 4, QImage.Format_RGB32)
+        self._target = QRectF((first_col - self._origin[0]) * self._zoom, (first_row - self._origin[1]) * self._zoom,
+                              width * block * self._zoom, height * block * self._zoom)
+        self.update()
+
+    @staticmethod
+    def _block_samples(alive, first_row, last_row, first_col, last_col, block):
+        """
+        Samples the square blocks of a region of the board to estimate their density, reading at most LOD_SAMPLES cells
+        along each side of a block. Every sample is a strided view of the board, so no cell other than the sampled ones
+        is read
+        :returns: two 2D arrays with the number of alive sampled cells and of sampled cells of every block
+        """
+
+        samples = min(block, LOD_SAMPLES)
+        offsets = [sample * block // samples for sample in range(samples)]
+        shape = (-(-(last_row - first_row) // block), -(-(last_col - first_col) // block))  # Ceiling divisions
+        alive_sum = np.zeros(shape, dtype=np.uint8)  # At most LOD_SAMPLES^2 samples per block
+        count = np.zeros(shape, dtype=np.uint8)  # The blocks on the edges may be sampled fewer times
+
+        for row_offset in offsets:
+            for col_offset in offsets:
+                sampled = alive[first_row + row_offset:last_row:block, first_col + col_offset:last_col:block]
+                alive_sum[:sampled.shape[0], :sampled.shape[1]] += sampled
+                count[:sampled.shape[0], :sampled.shape[1]] += 1
+
+        return alive_sum, count
+
+    def cell_at(self, x, y):
+        """
+        Maps a point of the widget to the cell shown there
+        :param x: horizontal coordinate of the point, in pixels
+        :param y: vertical coordinate of the point, in pixels
+        :returns: a tuple with the row and the column of the cell, None if the point is outside of the board
+        """
+
+        row = int(np.floor(self._origin[1] + y / self._zoom))
+        col = int(np.floor(self._origin[0] + x / self._zoom))
+
+        if 0 <= row < self._rows and 0 <= col < self._cols:
+            return row, col
+
+        return None
+
+    def resizeEvent(self, event):
+        """
+        Overrides the QWidget method called when the widget is resized, keeping the whole board in sight until the user
+        moves the viewport
+        """
+
+        if self._fitted:
+            self.fit()
+        else:
+            self.set_viewport(self._zoom, self._origin)
+
+    def wheelEvent(self, event):
+        """
+        Overrides the QWidget method dedicated to the mouse wheel, zooming in or out around the cell under the mouse
+        """
+
+        steps = event.angleDelta().y() / 120
+        zoom = self._zoom * ZOOM_STEP ** steps
+        zoom = min(zoom, MAX_ZOOM)
+        x, y = event.pos().x(), event.pos().y()
+        col = self._origin[0] + x / self._zoom  # Cell under the mouse, which stays there
+        row = self._origin[1] + y / self._zoom
+        self.set_viewport(zoom, (col - x / zoom, row - y / zoom))
+        event.accept()
+
+    def mousePressEvent(self, event):
+        """
+        Overrides the QWidget method dedicated to handling mouse clicks on the widget, which starts either a click or a
+        pan of the viewport
+        """
+
+        self._press = (event.pos(), self._origin)
+        self._dragging = False
+
+    def mouseMoveEvent(self, event):
+        """
+        Overrides the QWidget method dedicated to the movements of the mouse with a pressed button, which pan the
+        viewport once they are longer than DRAG_DISTANCE
+        """
+
+        if self._press is None:
+            return
+
+        delta = event.pos() - self._press[0]
+
+        if self._dragging or delta.manhattanLength() > DRAG_DISTANCE:
+            self._dragging = True
+            origin = self._press[1]
+            self.set_viewport(self._zoom, (origin[0] - delta.x() / self._zoom, origin[1] - delta.y() / self._zoom))
+
+    def mouseReleaseEvent(self, event):
+        """
+        Overrides the QWidget method dedicated to the release of the mouse buttons: a left click that has not become a
+        pan toggles the cell under the mouse
+        """
+
+        clicked = self._press is not None and not self._dragging and event.button() == Qt.LeftButton
+        self._press = None
+        cell = self.cell_at(event.x(), event.y()) if clicked else None
+
+        if cell is not None and not game_event.is_set():  # The cells can be drawn only while the game is paused
+            self.cell_pressed.emit(cell[0], cell[1])
+
+    def paintEvent(self, event):
+        """
+        Overrides the QWidget method that paints the widget, scaling the image of the visible cells to their size
+        (without smoothing, so that every cell stays a solid block) and drawing the lines between the cells if they are
+        large enough
+        """
+
+        start = perf_counter()
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND)
+
+        if self._image is not None:
+            painter.drawImage(self._target, self._image)
+
+            if self._zoom >= GRID_LINES:
+                self._paint_lines(painter)
+
+        painter.end()
+        self._tracer.add_repaint(start)
+
+    def _paint_lines(self, painter):
+        """
+        Draws the lines between the visible cells
+        :param painter: QPainter of the widget
+        """
+
+        painter.setPen(QColor(200, 200, 200))
+        left, top = self._target.left(), self._target.top()
+        right, bottom = self._target.right(), self._target.bottom()
+
+        for y in np.arange(top, bottom + 1, self._zoom):
+            painter.drawLine(int(left), int(y), int(right), int(y))
+
+        for x in np.arange(left, right + 1, self._zoom):
+            painter.drawLine(int(x), int(top), int(x), int(bottom))
@@ -3,6 +3,7 @@ import threading
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QHBoxLayout, QMainWindow, QSizePolicy, QWidget
 
+from gamecore import AUTOSAVE_PATH
 from gamegrid import GameGrid
 from gamemenu import GameMenu
 
@@ -15,16 +16,22 @@ class MainWindow(QMainWindow):
 
     change_window = pyqtSignal()
 
-    def __init__(self, state):
+    def __init__(self, pattern, engine='dense', rule=None, cycle_action='report', rows=50, cols=50, offset=None):
         """
         Constructor that initializes the basic window options, sets its layout to a MainPanel and its minimum dimensions
-        :param state: list containing the initial state of the grid, given from a file or from a pattern
+        :param pattern: initial Pattern of the grid, given from a file or from the known patterns (None if empty)
+        :param engine: name of the engine used to simulate the grid
+        :param rule: rulestring of the rule simulated in the grid
+        :param cycle_action: action taken when the grid becomes periodic
+        :param rows: number of rows of the grid
+        :param cols: number of columns of the grid
+        :param offset: row and column at which the pattern is placed, its stored position (or the center) if not given
         """
 
         super().__init__()
         self.setWindowTitle("Conway's Game of Life Remastered")  # The industry of gaming right now
         self.main_widget = QWidget()
-        self.main_panel = MainPanel(state, self.change_window)
+        self.main_panel = MainPanel(pattern, self.change_window, engine, rule, cycle_action, rows, cols, offset)
         self.main_widget.setLayout(self.main_panel)
         self.setCentralWidget(self.main_widget)
         self.show()
@@ -53,17 +60,25 @@ class MainPanel(QHBoxLayout):
     menu with buttons used to "control" the game. It contains a widget for both parts of the main view.
     """
 
-    def __init__(self, state, signal):
+    def __init__(self, pattern, signal, engine='dense', rule=None, cycle_action='report', rows=50, cols=50,
+                 offset=None):
         """
         Constructor of the class, which instantiates a grid and a menu and sets their proportions
-        :param state: list containing an initial state of the grid, given from a file or from a pattern
+        :param pattern: initial Pattern of the grid, given from a file or from the known patterns (None if empty)
         :param signal: signal used to trigger the opening of the settings window once the button is pressed
+        :param engine: name of the engine used to simulate the grid
+        :param rule: rulestring of the rule simulated in the grid
+        :param cycle_action: action taken when the grid becomes periodic
+        :param rows: number of rows of the grid
+        :param cols: number of columns of the grid
+        :param offset: row and column at which the pattern is placed, its stored position (or the center) if not given
         """
 
         super().__init__()
 
         self.grid_widget = GridWidget()
-        self.game_grid = GameGrid(50, 50, state)  # Static dimension of the grid
+        self.game_grid = GameGrid(rows, cols, pattern, engine, rule, cycle_action, offset, AUTOSAVE_PATH)  # The
+        # running game is checkpointed, so that it can be restored if the game does not end cleanly
         self.grid_widget.setLayout(self.game_grid)
         self.grid_widget.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
         self.game_menu = GameMenu(self.game_grid, signal)
@@ -84,30 +99,17 @@ class MainPanel(QHBoxLayout):
 
 class GridWidget(QWidget):
     """
-    Class that represents the widget containing the visual grid, set to be expanding in case of a window resize
+    Class that represents the widget containing the visual grid, set to be expanding in case of a window resize (the
+    view of the grid keeps the cells square)
     """
 
     def __init__(self):
         """
-        Constructor of the class, which sets the minimum dimension of the grid (about 10 pixels per cell) and the
-        expanding size policy of the grid widget
+        Constructor of the class, which sets the minimum dimension of the grid and the expanding size policy of the grid
+        widget
         """
 
         super().__init__()
         self.setMinimumWidth(512)
         self.setMinimumHeight(512)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-    def resizeEvent(self, event):
-        """
-        Overrides the default resizeEvent method, which is triggered every time the widget needs to be resized (in this
-        case, only when the user drags the window borders), to maintain the widget as a square and not causing the cells
-        to become rectangles. Simply, it checks which dimension is smaller and uses it as its side length
-        """
-
-        if event.size().width() > event.size().height():
-            super().resize(event.size().height(), event.size().height())
-        else:
-            super().resize(event.size().width(), event.size().width())
-
-        event.accept()
@@ -1,47 +1,133 @@
-import json
-
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QMainWindow, QWidget, QFormLayout, QLabel, QPushButton, QComboBox, QFrame, QFileDialog, \
-    QMessageBox
+    QMessageBox, QLineEdit, QSpinBox
+
+from gamecore import ENGINES, CONWAY, CYCLE_ACTIONS, Catalog, get_rule, load_pattern
+
+DEFAULT_SIDE = 50  # Default number of rows and columns of the grid
+MAX_SIDE = 20000  # Maximum number of rows and columns of the grid
+PATTERN_FILTER = 'Patterns (*.rle *.cells *.txt *.lif *.life *.gol *.json)'  # Formats read by load_pattern
+CENTER = -1  # Value of the offset spin boxes that keeps the stored position of the pattern along their axis (or
+# centers it, if it has none)
 
 
 class SettingsWindow(QMainWindow):
     """
     Class that visually represents the game settings window that lets the user select a know pattern or load one from a
     previously saved game state
-    change_window is a signal emitted when the user has clicked the save button or has submitted a state file
+    change_window is a signal emitted when the user has clicked the save button or has submitted a pattern file
     """
 
     change_window = pyqtSignal()
 
-    def __init__(self, state):
+    def __init__(self, pattern):
         """
         Constructor that initializes the basic window structure
-        :param state: list containing the initial state of the grid, given from a file or from a pattern
+        :param pattern: initial Pattern of the grid, given from a file or from the known patterns (None if empty)
         """
 
         super().__init__()
-        self._state = state
+        self._pattern = pattern
+        self._engine = 'dense'
+        self._rule = str(CONWAY)
+        self._cycle_action = 'report'
+        self._dimensions = (DEFAULT_SIDE, DEFAULT_SIDE)
+        self._offset = None
         self.setWindowTitle("Conway's Game of Life Remastered settings")
         self.main_widget = QWidget()
         self.main_layout = SettingsLayout(self.change_window)
         self.main_widget.setLayout(self.main_layout)
         self.setCentralWidget(self.main_widget)
 
-    def get_state(self):
+    def get_pattern(self):
+        """
+        Getter method to access the pattern selected from the known patterns or loaded from a user-submitted file
+        :returns: the Pattern loaded from the settings window, None if the grid starts empty
+        """
+
+        return self._pattern
+
+    def set_pattern(self, pattern):
+        """
+        Setter method of the pattern, used to load a selected pattern into the state grid
+        """
+
+        self._pattern = pattern
+
+    def get_engine(self):
+        """
+        Getter method to access the name of the engine selected to simulate the grid
+        :returns: the name of the engine selected in the settings window
+        """
+
+        return self._engine
+
+    def set_engine(self, engine):
+        """
+        Setter method of the engine, used to create the state grid with the selected engine
+        """
+
+        self._engine = engine
+
+    def get_rule(self):
+        """
+        Getter method to access the rulestring of the rule selected to simulate the grid
+        :returns: the rulestring written in the settings window
+        """
+
+        return self._rule
+
+    def set_rule(self, rule):
+        """
+        Setter method of the rule, used to create the state grid with the selected rule
+        """
+
+        self._rule = rule
+
+    def get_cycle_action(self):
+        """
+        Getter method to access the action taken by the game loop when the grid becomes periodic
+        :returns: one of CYCLE_ACTIONS
+        """
+
+        return self._cycle_action
+
+    def set_cycle_action(self, cycle_action):
+        """
+        Setter method of the action taken when the grid becomes periodic, used to create the state grid
+        """
+
+        self._cycle_action = cycle_action
+
+    def get_dimensions(self):
+        """
+        Getter method to access the dimensions of the grid selected in the settings window
+        :returns: the number of rows and columns of the grid
+        """
+
+        return self._dimensions
+
+    def set_dimensions(self, rows, cols):
+        """
+        Setter method of the dimensions of the grid, used to create the state grid with the selected size
+        """
+
+        self._dimensions = (rows, cols)
+
+    def get_offset(self):
         """
-        Getter method to access the state loaded from the patterns file or from a user-submitted previous state file
-        :returns: the state loaded from the settings window
+        Getter method to access the position of the pattern selected in the settings window
+        :returns: the row and column at which the top left corner of the pattern is placed, None to center it
         """
 
-        return self._state
+        return self._offset
 
-    def set_state(self, state):
+    def set_offset(self, offset):
         """
-        Setter method of the state, used to load a selected state into the state grid
+        Setter method of the position of the pattern, used to place it on the state grid
         """
 
-        self._state = state
+        self._offset = offset
 
     def observe(self, slot):
         """
@@ -66,16 +152,57 @@ class SettingsLayout(QFormLayout):
 
         super().__init__()
 
-        with open('patterns.json') as patterns_file:
-            self.patterns = json.load(patterns_file)  # Loads the know patterns listed in the dedicated file
+        self.catalog = Catalog()  # Index of the known patterns stored in the dedicated directory, which are decoded
+        # only once selected
 
         self.signal = signal
 
+        self.search_edit = QLineEdit()  # Filters the known patterns by name or rule
+        self.search_edit.setPlaceholderText("Name or rule")
+        self.search_edit.textChanged.connect(self.search_patterns)
+        self.addRow(QLabel("Search"), self.search_edit)
+
         self.patterns_combo = QComboBox()
-        self.patterns_combo.addItem("None")
-        self.patterns_combo.addItems(self.patterns.keys())
+        self.patterns_combo.currentTextChanged.connect(self.show_pattern_info)
         self.addRow(QLabel("Pattern"), self.patterns_combo)
 
+        self.pattern_info = QLabel()  # Size, population and rule of the selected pattern, read from the index
+        self.addRow(self.pattern_info)
+        self.search_patterns("")
+
+        self.engine_combo = QComboBox()  # Engine used to store and advance the state of the grid
+        self.engine_combo.addItems(ENGINES.keys())
+        self.addRow(QLabel("Engine"), self.engine_combo)
+
+        self.rule_edit = QLineEdit(str(CONWAY))  # Life-like rule to simulate, in the B/S notation
+        self.addRow(QLabel("Rule"), self.rule_edit)
+
+        self.cycle_combo = QComboBox()  # What to do once the pattern settles into a still life or an oscillator
+        self.cycle_combo.addItems(CYCLE_ACTIONS)
+        self.addRow(QLabel("On cycle"), self.cycle_combo)
+
+        self.rows_spin = QSpinBox()  # Size of the grid, the patterns are cropped or filled with dead cells to fit it
+        self.rows_spin.setRange(1, MAX_SIDE)
+        self.rows_spin.setValue(DEFAULT_SIDE)
+        self.addRow(QLabel("Rows"), self.rows_spin)
+
+        self.cols_spin = QSpinBox()
+        self.cols_spin.setRange(1, MAX_SIDE)
+        self.cols_spin.setValue(DEFAULT_SIDE)
+        self.addRow(QLabel("Columns"), self.cols_spin)
+
+        self.row_offset_spin = QSpinBox()  # Position of the top left corner of the pattern, the stored one by default
+        self.row_offset_spin.setRange(CENTER, MAX_SIDE - 1)
+        self.row_offset_spin.setSpecialValueText("Default")
+        self.row_offset_spin.setValue(CENTER)
+        self.addRow(QLabel("Row offset"), self.row_offset_spin)
+
+        self.col_offset_spin = QSpinBox()
+        self.col_offset_spin.setRange(CENTER, MAX_SIDE - 1)
+        self.col_offset_spin.setSpecialValueText("Default")
+        self.col_offset_spin.setValue(CENTER)
+        self.addRow(QLabel("Column offset"), self.col_offset_spin)
+
         self.load_pattern = QPushButton("Load pattern from file")
         self.load_pattern.clicked.connect(self.load_file)
         self.addRow(self.load_pattern)
@@ -95,23 +222,57 @@ class SettingsLayout(QFormLayout):
         default file explorer of the OS and then loads its contents into the state of the grid
         """
 
-        state_file = QFileDialog.getOpenFileName(None, 'Open file', filter='JSON files (*.JSON)')  # Files are filtered
+        if not self.check_rule():
+            return
+
+        pattern_file = QFileDialog.getOpenFileName(None, 'Open file', filter=PATTERN_FILTER)  # Files are filtered
 
         msg = QMessageBox()
+        msg.setIcon(QMessageBox.Warning)
+        msg.setWindowTitle("File selection error")
+        msg.setStandardButtons(QMessageBox.Ok)
 
-        try:  # state_file could be None (the user closes the window or presses the Cancel button)
-            with open(state_file[0], 'r+') as file:
-                file_content = json.load(file)
-                # TODO: check for file content correctness?
-                self.get_settings_window().set_state(file_content)
-                self.signal.emit()  # Feedback of a correct file load is given to the user by switching window
-                # to the window containing the grid
-        except FileNotFoundError:
-            msg.setIcon(QMessageBox.Warning)
-            msg.setText("No state file was provided")
-            msg.setWindowTitle("File selection error")
-            msg.setStandardButtons(QMessageBox.Ok)
+        if not pattern_file[0]:  # The user closes the window or presses the Cancel button
+            msg.setText("No pattern file was provided")
             msg.exec_()  # A warning is print to users to let them know that no file was provided
+            return
+
+        try:
+            pattern = load_pattern(pattern_file[0])
+        except (OSError, ValueError) as error:
+            msg.setText("The pattern file could not be read: " + str(error))
+            msg.exec_()
+            return
+
+        self.apply_settings(pattern)  # Feedback of a correct file load is given to the user by switching window to the
+        # window containing the grid
+
+    def search_patterns(self, text):
+        """
+        Method invoked when the search text changes, which lists in the dropdown menu only the known patterns whose name
+        or rule contains it
+        :param text: text written in the search field
+        """
+
+        self.patterns_combo.blockSignals(True)  # The combo is filled at once, and the info is shown once at the end
+        self.patterns_combo.clear()
+        self.patterns_combo.addItem("None")
+        self.patterns_combo.addItems(self.catalog.search(text))
+        self.patterns_combo.blockSignals(False)
+        self.show_pattern_info(self.patterns_combo.currentText())
+
+    def show_pattern_info(self, text):
+        """
+        Method invoked when the selected pattern changes, which shows its metadata without decoding it
+        :param text: name of the selected pattern
+        """
+
+        if text in self.catalog:
+            info = self.catalog.get_info(text)
+            self.pattern_info.setText("{} x {}, {} cells, rule {}".format(info['cols'], info['rows'],
+                                                                         info['population'], info['rule'] or CONWAY))
+        else:
+            self.pattern_info.setText("")
 
     def get_settings_window(self):
         """
@@ -128,7 +289,50 @@ class SettingsLayout(QFormLayout):
         of window
         """
 
+        if not self.check_rule():
+            return
+
         text = self.patterns_combo.currentText()
-        if text != "None":
-            self.get_settings_window().set_state(self.patterns[text])
+        self.apply_settings(self.catalog.get(text) if text in self.catalog else None)
+
+    def apply_settings(self, pattern):
+        """
+        Method used to store the selected pattern and the options of the form in the settings window, and then to signal
+        the change of window
+        :param pattern: Pattern selected by the user, None for an empty grid
+        """
+
+        rows, cols = self.rows_spin.value(), self.cols_spin.value()
+        offset = None
+
+        if pattern is not None and (self.row_offset_spin.value() != CENTER or self.col_offset_spin.value() != CENTER):
+            default = pattern.get_position() or pattern.center(rows, cols)  # An axis left to "Default" keeps it
+            offset = (default[0] if self.row_offset_spin.value() == CENTER else self.row_offset_spin.value(),
+                      default[1] if self.col_offset_spin.value() == CENTER else self.col_offset_spin.value())
+
+        self.get_settings_window().set_pattern(pattern)
+        self.get_settings_window().set_engine(self.engine_combo.currentText())
+        self.get_settings_window().set_rule(self.rule_edit.text())
+        self.get_settings_window().set_cycle_action(self.cycle_combo.currentText())
+        self.get_settings_window().set_dimensions(rows, cols)
+        self.get_settings_window().set_offset(offset)
         self.signal.emit()
+
+    def check_rule(self):
+        """
+        Method used to check that the rulestring written by the user is valid and supported by the selected engine,
+        warning the user otherwise
+        :returns: True if the rule can be used, False otherwise
+        """
+
+        try:
+            ENGINES[self.engine_combo.currentText()].check_rule(get_rule(self.rule_edit.text()))
+            return True
+        except ValueError as error:
+            msg = QMessageBox()
+            msg.setIcon(QMessageBox.Warning)
+            msg.setText(str(error))
+            msg.setWindowTitle("Rule error")
+            msg.setStandardButtons(QMessageBox.Ok)
+            msg.exec_()  # A warning is print to users to let them know that the rule cannot be used
+            return False
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from gamecore import COMPRESSIONS, read_board, write_board
+from gamecore.engine import MAX_TIME
+
+
+class TestBoardFile(unittest.TestCase):
+    """
+    Checks that a board file gives back the board it was written from, with every compression
+    """
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, 'board.gol')
+        generator = np.random.default_rng(1)
+        self._alive = generator.random((21, 35)) < 0.4  # Rows not a multiple of 8 cells, which are padded
+        self._ages = np.where(self._alive, generator.integers(0, MAX_TIME + 1, (21, 35)), 0)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_round_trip(self):
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                write_board(self._path, self._alive, self._ages, 10 ** 30, 'B36/S23', compression)
+                saved = read_board(self._path)
+                self.assertEqual(saved.get_dimensions(), (21, 35))
+                self.assertEqual(saved.get_generation(), 10 ** 30)
+                self.assertEqual(saved.get_rule(), 'B36/S23')
+                self.assertEqual(saved.get_population(), int(self._alive.sum()))
+                alive, ages = saved.to_arrays(21, 35)
+                np.testing.assert_array_equal(alive, self._alive)
+                np.testing.assert_array_equal(ages, self._ages)
+                del saved, alive, ages  # Closes the memory map before the file is replaced
+
+    def test_placement(self):
+        write_board(self._path, self._alive, self._ages, 0, 'B3/S23')
+        saved = read_board(self._path)
+        alive, ages = saved.to_arrays(30, 30, (-3, 4))  # Cropped on the top and on the right
+        np.testing.assert_array_equal(alive[:18, 4:], self._alive[3:, :26])
+        np.testing.assert_array_equal(ages[:18, 4:], self._ages[3:, :26])
+        self.assertFalse(alive[18:].any() or alive[:, :4].any())
+        self.assertEqual(saved.center(41, 45), (10, 5))
+        self.assertIsNone(saved.get_position())
+        del saved
+
+    def test_malformed(self):
+        with open(self._path, 'wb') as board_file:
+            board_file.write(b'not a board file')
+
+        with self.assertRaises(ValueError):
+            read_board(self._path)
+
+        for compression in COMPRESSIONS:
+            with self.subTest(compression=compression):
+                write_board(self._path, self._alive, self._ages, 0, 'B3/S23', compression)
+
+                with open(self._path, 'r+b') as board_file:  # Truncated in the middle of the planes
+                    board_file.truncate(os.path.getsize(self._path) - 100)
+
+                with self.assertRaises(ValueError):
+                    read_board(self._path)
+
+
+if __name__ == '__main__':
+    unittest.main()
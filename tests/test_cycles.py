@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from gamecore import ENGINES, SKIP_GENERATIONS, Board
+
+GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=bool)
+
+
+def place(rows, cols, cells, top, left):
+    """
+    Places a small pattern on an empty board
+    :param rows: number of rows of the board
+    :param cols: number of columns of the board
+    :param cells: boolean array of the pattern
+    :param top: row of the top left corner of the pattern
+    :param left: column of the top left corner of the pattern
+    :returns: a rows x cols boolean array
+    """
+
+    alive = np.zeros((rows, cols), dtype=bool)
+    alive[top:top + cells.shape[0], left:left + cells.shape[1]] = cells
+    return alive
+
+
+class TestCycles(unittest.TestCase):
+    """
+    Checks that the periodic boards are found with their period, and that the unbounded plane is never found periodic
+    because of the cells left in the viewport
+    """
+
+    def run_board(self, board, generations):
+        """
+        Advances a board, collecting the periods it reports
+        :param board: Board to advance
+        :param generations: number of generations to compute
+        :returns: a list of (period, generation) tuples
+        """
+
+        found = []
+
+        for _ in range(generations):
+            _, period = board.step()
+
+            if period is not None:
+                found.append((period, board.get_generation()))
+
+        return found
+
+    def test_periods(self):
+        alive = np.zeros((12, 12), dtype=bool)
+        alive[2, 2:5] = True  # Blinker
+        alive[8:10, 8:10] = True  # Block
+
+        for name in ENGINES:
+            with self.subTest(engine=name):
+                board = Board(12, 12, name)
+
+                try:
+                    board.load(alive)
+                    self.assertEqual(self.run_board(board, 5), [(2, 2)])
+                    before = board.get_engine().get_alive().astype(bool)
+                    board.skip_cycles(2)
+                    self.assertEqual(board.get_generation(), 5 + SKIP_GENERATIONS)
+                    np.testing.assert_array_equal(board.get_engine().get_alive().astype(bool), before)
+                finally:
+                    board.close()
+
+    def test_glider_leaving_the_viewport(self):
+        """
+        A glider leaves a small viewport of the unbounded plane next to a block, which would be a still life if only the
+        viewport were hashed
+        """
+
+        board = Board(10, 10, 'sparse')
+        alive = place(10, 10, GLIDER, 4, 4)
+        alive[0:2, 0:2] = True  # Block
+        board.load(alive)
+        self.assertEqual(self.run_board(board, 100), [])
+        self.assertEqual(board.get_engine().get_population(), 9)  # Still running outside of the viewport
+
+
+if __name__ == '__main__':
+    unittest.main()
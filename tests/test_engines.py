@@ -0,0 +1,237 @@
+import unittest
+
+import numpy as np
+
+from gamecore import ENGINES, STATUSES, BatchEngine, BitEngine, GenerationDiff, HashLife, get_rule
+from gamecore.engine import MAX_TIME
+
+RULES = ('B3/S23', 'B36/S23', 'B2/S')  # The Game of Life, HighLife and Seeds, whose cells never survive
+GENERATIONS = 12
+
+
+def naive_step(alive, ages, rule):
+    """
+    Computes the next generation of a bounded board one cell at a time, as the per-cell update of the original game did
+    :param alive: rows x cols boolean array of the alive cells
+    :param ages: rows x cols array with the alive time of the cells
+    :param rule: compiled Rule
+    :returns: the alive cells and their alive time after the generation, and the sets of the born and dead cells
+    """
+
+    rows, cols = alive.shape
+    new_alive = np.zeros_like(alive)
+    new_ages = np.zeros_like(ages)
+    born = set()
+    died = set()
+
+    for row in range(rows):
+        for col in range(cols):
+            neighbors = sum(int(alive[near_row, near_col])
+                            for near_row in range(max(row - 1, 0), min(row + 2, rows))
+                            for near_col in range(max(col - 1, 0), min(col + 2, cols))
+                            if (near_row, near_col) != (row, col))
+
+            if alive[row, col] and neighbors in rule.get_survival():
+                new_alive[row, col] = True
+                new_ages[row, col] = min(ages[row, col] + 1, MAX_TIME)
+            elif alive[row, col]:
+                died.add((row, col))
+            elif neighbors in rule.get_birth():
+                new_alive[row, col] = True
+                born.add((row, col))
+
+    return new_alive, new_ages, born, died
+
+
+def random_board(rows, cols, density, seed):
+    """
+    Fills a random board, with random alive times for its alive cells
+    :param rows: number of rows
+    :param cols: number of columns
+    :param density: probability of each cell of being alive
+    :param seed: seed of the random generator
+    :returns: a rows x cols boolean array of the alive cells and a rows x cols int64 array of their alive time
+    """
+
+    generator = np.random.default_rng(seed)
+    alive = generator.random((rows, cols)) < density
+    ages = np.where(alive, generator.integers(0, 5, (rows, cols)), 0)
+    ages[0, :] = np.where(alive[0, :], MAX_TIME, 0)  # Saturated cells must stay saturated
+    return alive, ages
+
+
+def coord_set(coords):
+    """
+    Converts an (n, 2) array of coordinates into a set of tuples
+    :param coords: array of coordinates
+    :returns: the set of the (row, col) tuples
+    """
+
+    return {(int(row), int(col)) for row, col in coords}
+
+
+class TestEngines(unittest.TestCase):
+    """
+    Checks every engine against the naive per-cell update: the alive cells, their alive time and the births, deaths and
+    survivals reported by each step
+    """
+
+    def check_engine(self, name, rows, cols, rule, seed):
+        """
+        Runs an engine and the reference from the same random board, comparing them at every generation
+        :param name: name of the engine, one of the keys of ENGINES
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :param rule: rulestring of the rule
+        :param seed: seed of the random board
+        """
+
+        alive, ages = random_board(rows, cols, 0.35, seed)
+        engine = ENGINES[name](rows, cols, rule)
+
+        try:
+            engine.load(alive, ages)
+
+            for generation in range(1, GENERATIONS + 1):
+                alive, ages, born, died = naive_step(alive, ages, get_rule(rule))
+                changes = engine.step()
+                self.assertEqual(engine.get_generation(), generation)
+                self.assertEqual(coord_set(changes['birth']), born)
+                self.assertEqual(coord_set(changes['death']), died)
+                diff = GenerationDiff.from_changes(changes, generation)
+                self.assertEqual(coord_set(diff.get_aged(engine.get_alive())), coord_set(np.argwhere(alive)) - born)
+                np.testing.assert_array_equal(engine.get_alive().astype(bool), alive)
+                np.testing.assert_array_equal(engine.get_ages(), ages)
+        finally:
+            engine.close()
+
+    def test_bounded_engines(self):
+        for name in ('dense', 'bitpacked', 'incremental', 'parallel'):
+            for rule in RULES:
+                with self.subTest(engine=name, rule=rule):
+                    self.check_engine(name, 37, 70, rule, seed=1)  # Not a multiple of a word or of a tile
+
+    def test_incremental_engine_across_tiles(self):
+        self.check_engine('incremental', 70, 100, 'B3/S23', seed=2)
+
+    def test_run_matches_step(self):
+        alive, ages = random_board(30, 30, 0.4, seed=3)
+
+        for name in ('dense', 'bitpacked', 'incremental'):
+            stepped = ENGINES[name](30, 30)
+            run = ENGINES[name](30, 30)
+            stepped.load(alive, ages)
+            run.load(alive, ages)
+
+            for _ in range(GENERATIONS):
+                stepped.step()
+
+            run.run(GENERATIONS)
+
+            with self.subTest(engine=name):
+                np.testing.assert_array_equal(run.get_alive(), stepped.get_alive())
+                np.testing.assert_array_equal(run.get_ages(), stepped.get_ages())
+
+    def test_bitpacked_without_time(self):
+        alive, ages = random_board(37, 70, 0.35, seed=6)
+        engine = BitEngine(37, 70, track_time=False)
+        engine.load(alive, ages)
+        rule = get_rule(None)
+
+        for _ in range(GENERATIONS):
+            alive, ages, born, _ = naive_step(alive, ages, rule)
+            changes = engine.step()
+            self.assertEqual(coord_set(changes['birth']), born)
+            np.testing.assert_array_equal(engine.get_alive().astype(bool), alive)
+            self.assertFalse(engine.get_ages().any())
+
+        engine.set_value(0, 0, 1 - engine.get_value(0, 0))  # The unpacked board follows the edits
+        self.assertEqual(engine.get_alive()[0, 0], 1 - alive[0, 0])
+
+    def test_sparse_engine(self):
+        """
+        The sparse engine runs on the unbounded plane, so the reference runs on a board with a margin the cells cannot
+        reach in the generations computed, and the viewport is compared with its middle
+        """
+
+        rows, cols, margin = 20, 24, GENERATIONS + 1
+        alive, ages = random_board(rows, cols, 0.35, seed=4)
+        engine = ENGINES['sparse'](rows, cols)
+        engine.load(alive, ages)
+        alive = np.pad(alive, margin)
+        ages = np.pad(ages, margin)
+        inside = (slice(margin, margin + rows), slice(margin, margin + cols))
+        rule = get_rule(None)
+
+        for _ in range(GENERATIONS):
+            alive, ages, born, died = naive_step(alive, ages, rule)
+            changes = engine.step()
+            self.assertEqual(coord_set(changes['birth']),
+                             {(row - margin, col - margin) for row, col in born
+                              if margin <= row < margin + rows and margin <= col < margin + cols})
+            np.testing.assert_array_equal(engine.get_alive().astype(bool), alive[inside])
+            np.testing.assert_array_equal(engine.get_ages(), ages[inside])
+
+    def test_sparse_viewport_follows(self):
+        """
+        A glider leaving the viewport of the plane brings the viewport along once it has left it, while the bounded
+        boards never move
+        """
+
+        alive = np.zeros((10, 10), dtype=bool)
+        alive[1:4, 1:4] = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]  # Glider moving down and to the right
+        engine = ENGINES['sparse'](10, 10)
+        engine.load(alive)
+        moves = 0
+
+        for _ in range(200):
+            engine.step()
+            moves += engine.follow_population()
+            self.assertGreater(engine.get_alive().sum(), 0)
+
+        top, left = engine.get_viewport()
+        self.assertGreater(moves, 1)
+        self.assertEqual(top, left)  # The glider moves by a cell in each direction every 4 generations
+        self.assertGreater(top, 20)
+        self.assertEqual(engine.get_alive().sum(), 5)
+        self.assertFalse(ENGINES['dense'](10, 10).follow_population())
+
+    def test_hashlife(self):
+        rows, cols, margin = 16, 16, 64
+        alive, _ = random_board(rows, cols, 0.4, seed=5)
+        universe = HashLife()
+        universe.load(alive, margin, margin)
+        reference = np.pad(alive, margin)
+        ages = np.zeros(reference.shape, dtype=np.int64)
+        rule = get_rule(None)
+
+        for _ in range(32):
+            reference, ages, _, _ = naive_step(reference, ages, rule)
+
+        universe.advance(32)
+        self.assertEqual(universe.get_generation(), 32)
+        np.testing.assert_array_equal(universe.to_array(*reference.shape).astype(bool), reference)
+
+    def test_batch_engine(self):
+        boards = 5
+        batch = BatchEngine(boards, 12, 15, 'B36/S23')
+        alive = np.stack([random_board(12, 15, 0.4, seed)[0] for seed in range(boards)])
+        alive[2] = False  # Terminates at once, and must then be left as it is
+        batch.load(alive)
+        ages = np.zeros(alive.shape, dtype=np.int64)
+        rule = get_rule('B36/S23')
+
+        for _ in range(GENERATIONS):
+            active = batch.get_active()
+            batch.step()
+
+            for board in np.flatnonzero(active):
+                alive[board], ages[board], _, _ = naive_step(alive[board], ages[board], rule)
+
+        np.testing.assert_array_equal(batch.get_alive().astype(bool), alive)
+        np.testing.assert_array_equal(batch.get_ages(), ages)
+        self.assertEqual(STATUSES[batch.get_status()[2]], 'died')
+
+
+if __name__ == '__main__':
+    unittest.main()
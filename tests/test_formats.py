@@ -0,0 +1,139 @@
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from gamecore import Pattern, load_pattern, save_pattern
+from gamecore.formats import read_life106, read_plaintext, read_rle, write_life106, write_plaintext, write_rle
+
+
+def random_pattern(rows, cols, density, seed, name=None, rule=None, position=None):
+    """
+    Builds a random pattern whose bounding box is filled up to its edges, as the formats store it
+    :param rows: number of rows of the bounding box
+    :param cols: number of columns of the bounding box
+    :param density: probability of each cell of being alive
+    :param seed: seed of the random generator
+    :param name: name of the pattern
+    :param rule: rulestring of the pattern
+    :param position: stored position of the pattern
+    :returns: a Pattern
+    """
+
+    alive = np.random.default_rng(seed).random((rows, cols)) < density
+    alive[0, 0] = alive[-1, -1] = True
+    return Pattern(rows, cols, np.argwhere(alive), name=name, rule=rule, position=position)
+
+
+def sorted_cells(pattern):
+    """
+    Sorts the cells of a pattern by row and then by column
+    :param pattern: Pattern
+    :returns: the (n, 2) array of the sorted coordinates
+    """
+
+    cells = pattern.get_cells()
+    return cells[np.lexsort((cells[:, 1], cells[:, 0]))]
+
+
+class TestFormats(unittest.TestCase):
+    """
+    Checks that a pattern written in each format is read back the same: its cells, its size and what the format keeps of
+    its name, rule and position
+    """
+
+    def assert_same_cells(self, read, written):
+        """
+        Checks that two patterns have the same size and alive cells
+        :param read: Pattern read back
+        :param written: Pattern written
+        """
+
+        self.assertEqual(read.get_dimensions(), written.get_dimensions())
+        np.testing.assert_array_equal(sorted_cells(read), sorted_cells(written))
+
+    def test_rle(self):
+        pattern = random_pattern(60, 230, 0.3, seed=1, name='Soup', rule='B36/S23', position=(5, 7))
+        stream = io.StringIO()
+        write_rle(stream, pattern)
+        lines = stream.getvalue().splitlines()
+        self.assertTrue(all(len(line) <= 70 for line in lines))
+
+        for chunk_size in (1, 7, 1 << 18):  # The tokens split between chunks at every possible place
+            with self.subTest(chunk_size=chunk_size):
+                read = read_rle(io.BytesIO(stream.getvalue().encode()), chunk_size)
+                self.assert_same_cells(read, pattern)
+                self.assertEqual((read.get_name(), read.get_rule(), read.get_position()), ('Soup', 'B36/S23', (5, 7)))
+
+    def test_rle_runs(self):
+        alive = np.zeros((3, 200), dtype=bool)
+        alive[0, :150] = True  # Run counts with many digits
+        alive[2, 199] = True  # Preceded by an empty line
+        pattern = Pattern.from_arrays(alive)
+        stream = io.StringIO()
+        write_rle(stream, pattern)
+        self.assert_same_cells(read_rle(io.BytesIO(stream.getvalue().encode())), pattern)
+
+    def test_rle_comments(self):
+        read = read_rle(io.BytesIO(b'#C A comment\n#r 23/3\n#P -2 3\nx = 3, y = 2\n2o$bo!\nignored'))
+        self.assertEqual(read.get_rule(), '23/3')
+        self.assertEqual(read.get_position(), (3, -2))
+        np.testing.assert_array_equal(read.to_arrays(2, 3, (0, 0))[0], [[1, 1, 0], [0, 1, 0]])
+        self.assertIsNone(read_rle(io.BytesIO(b'#P somewhere\nx = 1, y = 1\no!')).get_position())
+
+        with self.assertRaises(ValueError):
+            read_rle(io.BytesIO(b'#N No header\n'))
+
+    def test_placement(self):
+        centered = Pattern(2, 2, [[0, 0], [1, 1]])
+        placed = Pattern(2, 2, [[0, 0], [1, 1]], position=(1, 6))
+        self.assertEqual(np.argwhere(centered.to_arrays(6, 8)[0]).tolist(), [[2, 3], [3, 4]])
+        self.assertEqual(np.argwhere(placed.to_arrays(6, 8)[0]).tolist(), [[1, 6], [2, 7]])
+        self.assertEqual(np.argwhere(placed.to_arrays(6, 8, (4, 0))[0]).tolist(), [[4, 0], [5, 1]])
+        self.assertEqual(np.argwhere(placed.to_arrays(2, 7)[0]).tolist(), [[1, 6]])  # Cropped
+
+    def test_plaintext(self):
+        pattern = random_pattern(20, 33, 0.4, seed=2, name='Plain')
+        stream = io.StringIO()
+        write_plaintext(stream, pattern)
+        stream.seek(0)
+        read = read_plaintext(stream)
+        self.assert_same_cells(read, pattern)
+        self.assertEqual(read.get_name(), 'Plain')
+
+    def test_life106(self):
+        pattern = random_pattern(25, 18, 0.4, seed=3)
+        stream = io.StringIO()
+        write_life106(stream, pattern)
+        stream.seek(0)
+        self.assert_same_cells(read_life106(stream), pattern)
+
+    def test_files(self):
+        """
+        Saves a board with the alive time of its cells in every format chosen by the extension, the board formats keep
+        the alive time too
+        """
+
+        alive = np.random.default_rng(4).random((16, 24)) < 0.4
+        alive[0, 0] = alive[-1, -1] = True
+        ages = np.where(alive, np.arange(16 * 24).reshape(16, 24), 0)
+        pattern = Pattern.from_arrays(alive, ages, rule='B3/S23')
+
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in ('.rle', '.cells', '.txt', '.lif', '.life', '.json', '.gol'):
+                with self.subTest(extension=extension):
+                    path = os.path.join(directory, 'board' + extension)
+                    save_pattern(path, pattern)
+                    read = load_pattern(path)
+                    self.assertEqual(read.get_name(), 'board')
+                    read_alive, read_ages = read.to_arrays(16, 24, (0, 0))
+                    np.testing.assert_array_equal(read_alive, alive)
+
+                    if extension in ('.json', '.gol'):
+                        np.testing.assert_array_equal(read_ages, ages)
+
+
+if __name__ == '__main__':
+    unittest.main()
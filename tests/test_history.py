@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+
+from gamecore import DenseEngine, GenerationDiff, History
+
+ROWS, COLS = 24, 30
+
+
+class TestHistory(unittest.TestCase):
+    """
+    Checks that the history rebuilds every recorded board, across keyframes, edits, skipped generations and rewinds
+    """
+
+    def setUp(self):
+        self._engine = DenseEngine(ROWS, COLS)
+        self._engine.load(np.random.default_rng(1).random((ROWS, COLS)) < 0.4)
+        self._history = History(ROWS, COLS, keyframe_interval=8)
+        self._boards = {}  # Board recorded at every generation, after its edits
+        self._record(GenerationDiff(0, full=True))
+
+    def _record(self, diff):
+        """
+        Records a change of the engine in the history and keeps the board it leads to
+        :param diff: GenerationDiff of the change
+        """
+
+        self._history.record(diff, self._engine)
+        self._boards[diff.get_generation()] = self._engine.get_alive().astype(bool), self._engine.get_ages().copy()
+
+    def _step(self, generations):
+        """
+        Advances the engine, recording every generation
+        :param generations: number of generations to compute
+        """
+
+        for _ in range(generations):
+            changes = self._engine.step()
+            self._record(GenerationDiff.from_changes(changes, self._engine.get_generation()))
+
+    def _edit(self, row, col):
+        """
+        Toggles a cell of the current generation, recording the edit
+        :param row: row of the cell
+        :param col: column of the cell
+        """
+
+        value = 1 - self._engine.get_value(row, col)
+        self._engine.set_value(row, col, value)
+        coords = np.array([[row, col]])
+        self._record(GenerationDiff(self._engine.get_generation(), born=coords) if value else
+                     GenerationDiff(self._engine.get_generation(), died=coords))
+
+    def assert_board(self, generation, expected=None):
+        """
+        Checks the board rebuilt by the history at a generation
+        :param generation: generation to seek
+        :param expected: generation of the board that must be rebuilt, the same one by default
+        """
+
+        alive, ages, reached = self._history.seek(generation)
+        expected = generation if expected is None else expected
+        self.assertEqual(reached, expected)
+        np.testing.assert_array_equal(alive, self._boards[expected][0])
+        np.testing.assert_array_equal(ages, self._boards[expected][1])
+
+    def test_seek(self):
+        self._step(50)
+
+        for generation in range(51):
+            self.assert_board(generation)
+
+        self.assertEqual(self._history.get_range(), (0, 50))
+
+    def test_edits(self):
+        self._step(5)
+        self._edit(3, 4)
+        self._edit(10, 10)
+        self._step(20)
+        self.assert_board(5)  # After both edits
+        self.assert_board(6)
+        self.assert_board(25)
+
+    def test_skipped_generations(self):
+        self._step(10)
+        self._engine.skip(100, 1)  # Whatever the board, the planes are replaced as a whole
+        self._record(GenerationDiff(self._engine.get_generation(), full=True))
+        self._step(3)
+        self.assert_board(60, expected=10)  # Not recorded, the last recorded one before it is rebuilt
+        self.assert_board(110)
+        self.assert_board(113)
+
+    def test_rewind(self):
+        self._step(30)
+        alive, ages, generation = self._history.rewind(12)
+        self.assertEqual(generation, 12)
+        self.assert_board(30)  # The future is kept until the board changes again
+
+        self._engine.load(alive, ages, generation)
+        self._edit(0, 0)
+        self._step(4)
+        self.assertEqual(self._history.get_range(), (0, 16))
+        self.assert_board(12)
+        self.assert_board(16)
+
+    def test_budget(self):
+        self._step(200)
+        self._history.set_budget(self._history.get_size() // 4)
+        first, last = self._history.get_range()
+        self.assertGreater(first, 0)
+        self.assertEqual(last, 200)
+        self.assertLessEqual(self._history.get_size(), self._history.get_budget())
+        self.assert_board(first)
+        self.assert_board(last)
+
+        for generation in (first - 1, last + 1):
+            with self.assertRaises(ValueError):
+                self._history.seek(generation)
+
+        self._history.set_budget(0)
+        self.assertIsNone(self._history.get_range())
+
+
+if __name__ == '__main__':
+    unittest.main()
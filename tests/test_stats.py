@@ -0,0 +1,144 @@
+import unittest
+
+import numpy as np
+
+from gamecore import Board, DenseEngine, GenerationDiff, Statistics, stream_statistics
+from gamecore.stats import EPOCH
+
+
+def recount(engine):
+    """
+    Computes the statistics of a board from scratch
+    :param engine: Engine holding the board
+    :returns: the dictionary returned by Statistics.get_sample, without the births and deaths
+    """
+
+    statistics = Statistics(*engine.get_dimensions())
+    statistics.count(engine.get_alive(), engine.get_ages(), engine.get_generation())
+    sample = statistics.get_sample()
+    del sample['births'], sample['deaths']
+    return sample
+
+
+class TestStatistics(unittest.TestCase):
+    """
+    Checks that the statistics kept up to date from the changes of a board always match a count of the whole board
+    """
+
+    def setUp(self):
+        self._engine = DenseEngine(32, 40)
+        self._statistics = Statistics(32, 40)
+
+    def _update(self, diff):
+        """
+        Updates the statistics with a change of the engine
+        :param diff: GenerationDiff of the change
+        """
+
+        self._statistics.update(diff, self._engine)
+
+    def _step(self):
+        """
+        Advances the engine by a generation and updates the statistics with its changes
+        :returns: the dictionary of the changes returned by the engine
+        """
+
+        changes = self._engine.step()
+        self._update(GenerationDiff.from_changes(changes, self._engine.get_generation()))
+        return changes
+
+    def assert_counted(self):
+        """
+        Checks the statistics against a count of the whole board
+        """
+
+        sample = self._statistics.get_sample()
+        births, deaths = sample.pop('births'), sample.pop('deaths')
+        self.assertEqual(sample, recount(self._engine))
+        return births, deaths
+
+    def test_steps(self):
+        generator = np.random.default_rng(1)
+        self._engine.load(generator.random((32, 40)) < 0.4, generator.integers(0, 300, (32, 40)))
+        self._update(GenerationDiff(0, full=True))
+        self.assert_counted()
+
+        for _ in range(300):
+            changes = self._step()
+            births, deaths = self.assert_counted()
+            self.assertEqual((births, deaths), (len(changes['birth']), len(changes['death'])))
+
+    def test_edits(self):
+        self._engine.load(np.random.default_rng(2).random((32, 40)) < 0.3)
+        self._update(GenerationDiff(0, full=True))
+
+        for _ in range(20):
+            self._step()
+
+        generation = self._engine.get_generation()
+        self._engine.set_value(0, 0, 1)
+        self._update(GenerationDiff(generation, born=np.array([[0, 0]])))
+        self.assert_counted()
+        died = np.argwhere(self._engine.get_alive())[:5]
+
+        for row, col in died:
+            self._engine.set_value(row, col, 0)
+
+        self._update(GenerationDiff(generation, died=died))
+        self.assertEqual(self.assert_counted(), (0, 5))
+        self._step()
+        self.assert_counted()
+
+    def test_unreported_change(self):
+        """
+        A board replaced without telling the statistics reports deaths of cells they do not know, so the board is
+        counted again instead of failing
+        """
+
+        self._update(GenerationDiff(0, full=True))  # Empty
+        self._engine.load(np.random.default_rng(3).random((32, 40)) < 0.4)
+
+        for _ in range(5):
+            self._step()
+            self.assert_counted()
+
+    def test_long_run(self):
+        """
+        Runs past two full counts (every EPOCH generations) a board with a still life born long before and a blinker,
+        whose cells are born and die at every generation
+        """
+
+        self._engine = DenseEngine(8, 10)
+        self._statistics = Statistics(8, 10)
+        alive = np.zeros((8, 10), dtype=bool)
+        alive[1:3, 1:3] = True  # Block
+        alive[5, 5:8] = True  # Blinker
+        ages = np.where(alive, 40000, 0)
+        ages[1, 1] = 65000  # Saturates during the run
+        self._engine.load(alive, ages)
+        self._update(GenerationDiff(0, full=True))
+
+        for generation in range(1, 2 * EPOCH + 100):
+            self._step()
+
+            if generation % 997 == 0 or generation % EPOCH < 3:
+                self.assert_counted()
+
+        self.assert_counted()
+
+    def test_stream(self):
+        board = Board(20, 20)
+        board.load(np.random.default_rng(5).random((20, 20)) < 0.4)
+        reference = Board(20, 20)
+        reference.load(board.get_engine().get_alive())
+
+        for number, sample in enumerate(stream_statistics(board, 50)):
+            self.assertEqual(sample['generation'], number)
+            self.assertEqual(sample['population'], int(reference.get_engine().get_alive().sum()))
+            reference.step()
+
+        self.assertEqual(number, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
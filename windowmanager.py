@@ -1,4 +1,7 @@
+from PyQt5.QtWidgets import QMessageBox
+
 from events import window_event
+from gamecore import CONWAY, find_autosave, remove_autosave
 from mainwindow import MainWindow
 from settingswindow import SettingsWindow
 
@@ -15,8 +18,7 @@ class WindowManager:
         creates a game settings window to be initially shown to the user
         """
 
-        self._state = []
-        self._settings_window = SettingsWindow(self._state)
+        self._settings_window = SettingsWindow(None)
         self._settings_window.observe(self.open_main)  # We set the slot so that a press of the save button in the
         # settings window triggers the opening of the main window
         self._main_window = None
@@ -35,6 +37,33 @@ class WindowManager:
         # the update of the grid
         self._settings_window.show()  # Finally, the settings window is shown
 
+    def recover(self):
+        """
+        Method used when the game starts to look for the checkpoint of a game that did not end cleanly, asking the user
+        whether to restore it: if so, the main window is opened with the restored board
+        :returns: True if the game has been restored, False otherwise
+        """
+
+        saved = find_autosave()
+
+        if saved is None:
+            return False
+
+        answer = QMessageBox.question(None, "Restore game", "The last game did not end cleanly. Restore it from "
+                                                            "generation " + str(saved.get_generation()) + "?")
+
+        if answer != QMessageBox.Yes:
+            remove_autosave()  # The user is not asked again
+            return False
+
+        self._settings_window.set_pattern(saved)  # The board is restored as it was, with its size and rule
+        self._settings_window.set_engine('dense')
+        self._settings_window.set_rule(saved.get_rule() or str(CONWAY))
+        self._settings_window.set_dimensions(*saved.get_dimensions())
+        self._settings_window.set_offset(None)
+        self.open_main()
+        return True
+
     def open_main(self):
         """
         Method used to trigger the opening of the main game window when the Save button is pressed in the game settings
@@ -44,10 +73,12 @@ class WindowManager:
         if self._settings_window.isVisible():
             self._settings_window.close()  # If the settings window is visible, close it
 
-        self._main_window = MainWindow(self._settings_window.get_state())
-        self._settings_window.set_state([])  # Clears the state before opening the window a second time (so that
-        # clicking save without selecting anything, to get an empty state grid, will not load the state selected in the
-        # previous iteration)
+        self._main_window = MainWindow(self._settings_window.get_pattern(), self._settings_window.get_engine(),
+                                       self._settings_window.get_rule(), self._settings_window.get_cycle_action(),
+                                       *self._settings_window.get_dimensions(), self._settings_window.get_offset())
+        self._settings_window.set_pattern(None)  # Clears the pattern before opening the window a second time (so that
+        # clicking save without selecting anything, to get an empty state grid, will not load the pattern selected in
+        # the previous iteration)
         self._main_window.observe(self.open_settings)  # Sets the slot so that a press of the settings button in the
         # game main window triggers the opening of the settings window
         window_event.set()  # The window event is set...